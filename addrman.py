@@ -17,6 +17,9 @@ GOOD = -2
 ERASE = -1
 
 CMD_VOCAB = {"ERASE": 0, "PGM": 1, "READ": 2}
+# Per-block celltypes are stored as uint8 codes into this vocabulary (code 0 = TBD);
+# unknown celltype strings are appended per AddressManager instance on first use.
+CELLTYPE_VOCAB = (TBD, TLC, FWSLC, SLC, AESLC, A0SLC, ACSLC)
 # NOTE: Visualization helpers still consume (plane, block, page) tuples.
 # Sampled address tensors returned by random_* now include die explicitly as (die, block, page).
 ADDR_KEYS = ["plane", "block", "page"]
@@ -57,6 +60,11 @@ def empty_arr():
     return np.array([], dtype=int)
 
 
+def state_dtype(pagesize: int):
+    """Smallest signed dtype holding BAD..pagesize-1 (int16 for all real topologies)."""
+    return np.int16 if int(pagesize) <= np.iinfo(np.int16).max else np.int32
+
+
 def all_subsets(s):
     return list(
         itertools.chain.from_iterable(
@@ -65,20 +73,101 @@ def all_subsets(s):
     )
 
 
+class _Fenwick:
+    """Fenwick (binary indexed) tree over non-negative integer per-block weights."""
+
+    __slots__ = ("n", "vals", "tree", "top")
+
+    def __init__(self, weights: List[int]):
+        n = len(weights)
+        tree = [0] + list(weights)
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self.n = n
+        self.vals = list(weights)
+        self.tree = tree
+        self.top = (1 << (n.bit_length() - 1)) if n else 0
+
+    def set(self, i: int, w: int) -> None:
+        d = w - self.vals[i]
+        if d:
+            self.vals[i] = w
+            i += 1
+            tree, n = self.tree, self.n
+            while i <= n:
+                tree[i] += d
+                i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum of weights [0, i)."""
+        tree, s = self.tree, 0
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+
+def _fenwick_select(trees: List[_Fenwick], rank: int) -> Tuple[int, int]:
+    """Locate unit `rank` (0-based) of the summed weights of same-sized trees.
+
+    Returns (index, offset inside that index's weight); disjoint pools can be
+    ranked as one union without materializing it.
+    """
+    n = trees[0].n
+    pos, step = 0, trees[0].top
+    if len(trees) == 1:
+        tree = trees[0].tree
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= rank:
+                pos = nxt
+                rank -= tree[nxt]
+            step >>= 1
+        return pos, rank
+    while step:
+        nxt = pos + step
+        if nxt <= n:
+            w = 0
+            for t in trees:
+                w += t.tree[nxt]
+            if w <= rank:
+                pos = nxt
+                rank -= w
+        step >>= 1
+    return pos, rank
+
+
+class _CandidatePool:
+    """Weights of one sampling class, indexed over all blocks and per plane."""
+
+    __slots__ = ("all", "planes")
+
+    def __init__(self, weights: np.ndarray, plane_blocks: List[np.ndarray]):
+        self.all = _Fenwick(weights.tolist())
+        self.planes = [_Fenwick(weights[blocks].tolist()) for blocks in plane_blocks]
+
+
 class AddressManager:
     """
     AddressManager class 정의
     num_address : block address 갯수
-    addrstates : address 상태를 저장하는 numpy 배열
-    addrmodes_erase / addr_mode_erase : erase 시 선택된 celltype 을 저장
-    addrmodes_pgm   / addr_mode_pgm   : program/read 시 사용할 celltype 을 저장
+    addrstates : address 상태를 저장하는 numpy 배열 (int16, pagesize 가 크면 int32)
+    addrmodes_erase / addr_mode_erase : erase 시 선택된 celltype (문자열 배열로 decode 된 읽기 전용 복사본)
+    addrmodes_pgm   / addr_mode_pgm   : program/read 시 사용할 celltype (문자열 배열로 decode 된 읽기 전용 복사본)
+    _modes_erase / _modes_pgm : 실제 저장소. CELLTYPE_VOCAB 기반 uint8 celltype code 배열
     pagesize : block 내 page 갯수
     offset : addrReadable 구할 때 last PGM page address 끝에서부터 제외할 page 갯수
     num_dies : die 수
     undo_addrs : 마지막 erase 또는 PGM 했던 address list
     undo_states : 마지막 erase 또는 PGM 했던 address 의 addrstates
-    undo_modes : 마지막 erase 또는 PGM 했던 address 의 addrmodes
+    undo_modes_erase / undo_modes_pgm : 마지막 erase 또는 PGM 했던 address 의 celltype code
     oversample : 전체 가능한 address 갯수보다 더 많은 sample 을 요구했을 떄 True
+    pool_min_blocks : num_blocks 가 이 값 이상이면 single-plane sample_erase/sample_pgm/sample_read
+        가 전체 mask 대신 incremental candidate pool (Fenwick tree) 을 사용
+        (read 는 block 별 readable page 수를 weight 로 하는 page-weighted tree)
+    pool_max_size : 요청 size 가 이 값보다 크면 pool 대신 mask 경로 사용
     """
 
     # adds 배열의 상태 값 정의
@@ -87,6 +176,8 @@ class AddressManager:
     # -1: erased
     # 0 to pagesize-1 : PGM 된 page 수
     set_plane: set = {0, 1, 2, 4, 6}
+    pool_min_blocks: int = 1024
+    pool_max_size: int = 8
 
     def __init__(
         self,
@@ -105,16 +196,17 @@ class AddressManager:
         self.num_dies: int
         self.num_blocks: int
         self.addrstates: np.ndarray
-        self.addrmodes_erase: np.ndarray
-        self.addrmodes_pgm: np.ndarray
-        # Standardized aliases for external docs/specs
-        self.addr_mode_erase: np.ndarray
-        self.addr_mode_pgm: np.ndarray
+        # celltype codes (uint8) and their vocabulary; string views via addrmodes_* properties
+        self._modes_erase: np.ndarray
+        self._modes_pgm: np.ndarray
+        self._celltypes: List[str] = list(CELLTYPE_VOCAB)
+        self._celltype_code: Dict[str, int] = {c: i for i, c in enumerate(self._celltypes)}
         self.pagesize: int
         self.offset: int
         self.undo_addrs: np.ndarray = np.array([], dtype=int)
         self.undo_states: np.ndarray = np.array([], dtype=int)
-        self.undo_modes: np.ndarray = np.array([], dtype=int)
+        self.undo_modes_erase: np.ndarray = np.array([], dtype=np.uint8)
+        self.undo_modes_pgm: np.ndarray = np.array([], dtype=np.uint8)
         self.oversample: bool = False
 
         if num_planes in AddressManager.set_plane:
@@ -151,15 +243,10 @@ class AddressManager:
         # Compute total blocks across dies and allocate arrays
         self.num_blocks = self._blocks_per_die * self.num_dies
         if isinstance(init, int) and (init > BAD or init < pagesize):
-            self.addrstates = np.full(self.num_blocks, init, dtype=int)
-            # Track erase/program modes separately; keep legacy alias addrmodes -> program mode
-            self.addrmodes_erase = np.full(self.num_blocks, TBD, dtype=object)
-            self.addrmodes_pgm = np.full(self.num_blocks, TBD, dtype=object)
-            # Backward-compat alias used by external scripts
-            self.addrmodes = self.addrmodes_pgm
-            # Standardized aliases (PRD v2): addr_mode_*
-            self.addr_mode_erase = self.addrmodes_erase
-            self.addr_mode_pgm = self.addrmodes_pgm
+            self.addrstates = np.full(self.num_blocks, init, dtype=state_dtype(pagesize))
+            # Track erase/program modes separately (TBD = code 0)
+            self._modes_erase = np.zeros(self.num_blocks, dtype=np.uint8)
+            self._modes_pgm = np.zeros(self.num_blocks, dtype=np.uint8)
             bad_idx = self._normalize_badlist(badlist)
             if bad_idx.size:
                 if np.any(bad_idx < 0) or np.any(bad_idx >= self.num_blocks):
@@ -171,12 +258,21 @@ class AddressManager:
             )
 
         # Precomputed helpers for fast filtering/sampling
-        ar = np.arange(self.num_blocks)
+        ar = np.arange(self.num_blocks, dtype=np.int32)
         self._die_index = ar // self._blocks_per_die
         within_die = ar % self._blocks_per_die
-        self._plane_index = within_die % self.num_planes
+        self._plane_index = (within_die % self.num_planes).astype(np.int8)
         self._block_groups = None  # lazily computed (#groups, num_planes) per die
         self._rng = np.random.default_rng()
+        # Incremental candidate pools: key -> _CandidatePool, built lazily per sampling class
+        # and kept current by apply_*/undo_last (set_* drop them)
+        self._pools: Dict[Tuple[Any, ...], _CandidatePool] = {}
+        # Mutation counter: bumped by apply_*/undo_last/set_*/restore (proposal caches key on it)
+        self.version: int = 0
+        self._plane_blocks = [np.flatnonzero(self._plane_index == p) for p in range(self.num_planes)]
+        self._plane_pos = np.zeros(self.num_blocks, dtype=np.int32)
+        for blocks in self._plane_blocks:
+            self._plane_pos[blocks] = np.arange(blocks.size, dtype=np.int32)
 
     def _normalize_badlist(self, badlist) -> np.ndarray:
         """
@@ -212,18 +308,69 @@ class AddressManager:
             raise IndexError("badlist block index out of range for die")
         return dies * self._blocks_per_die + blks
 
+    # ------------------------
+    # Celltype codes
+    # ------------------------
+
+    def celltype_code(self, mode) -> int:
+        """uint8 code of a celltype string, registering unseen celltypes."""
+        key = str(mode)
+        code = self._celltype_code.get(key)
+        if code is None:
+            code = len(self._celltypes)
+            if code > np.iinfo(np.uint8).max:
+                raise ValueError(f"too many distinct celltypes (>{code}): {key!r}")
+            self._celltypes.append(key)
+            self._celltype_code[key] = code
+        return code
+
+    def _mode_mask(self, codes: np.ndarray, mode) -> np.ndarray:
+        """codes == mode without registering mode (unknown celltypes match nothing)."""
+        code = self._celltype_code.get(str(mode))
+        if code is None:
+            return np.zeros(codes.shape, dtype=bool)
+        return codes == code
+
+    def _decode_modes(self, codes: np.ndarray) -> np.ndarray:
+        # decoded copies: mark read-only so stray writes raise instead of vanishing
+        out = np.array(self._celltypes, dtype=object)[codes]
+        out.flags.writeable = False
+        return out
+
+    def mode_erase_of(self, idx: int) -> str:
+        return self._celltypes[int(self._modes_erase[idx])]
+
+    def mode_pgm_of(self, idx: int) -> str:
+        return self._celltypes[int(self._modes_pgm[idx])]
+
+    @property
+    def addrmodes_erase(self) -> np.ndarray:
+        """Erase celltypes as a decoded, read-only object array (writes raise ValueError)."""
+        return self._decode_modes(self._modes_erase)
+
+    @property
+    def addrmodes_pgm(self) -> np.ndarray:
+        """Program celltypes as a decoded, read-only object array (writes raise ValueError)."""
+        return self._decode_modes(self._modes_pgm)
+
+    # Backward-compat alias used by external scripts, and standardized aliases (PRD v2)
+    addrmodes = addrmodes_pgm
+    addr_mode_erase = addrmodes_erase
+    addr_mode_pgm = addrmodes_pgm
+
     def set_range_val(self, add_from: int, add_to: int, val: int, mode=TLC):
         """
         adds 배열에서 add_from 부터 add_to 까지의 index 에 val 값을 할당
         """
+        self.invalidate_pools()
         self.addrstates[add_from : add_to + 1] = val
         if val == ERASE:
             # Setting erase result: update erase mode, reset program mode
-            self.addrmodes_erase[add_from : add_to + 1] = mode
-            self.addrmodes_pgm[add_from : add_to + 1] = TBD
+            self._modes_erase[add_from : add_to + 1] = self.celltype_code(mode)
+            self._modes_pgm[add_from : add_to + 1] = 0
         elif val > ERASE:
             # Setting programmed pages: set program mode (keep existing erase mode)
-            self.addrmodes_pgm[add_from : add_to + 1] = mode
+            self._modes_pgm[add_from : add_to + 1] = self.celltype_code(mode)
 
     def set_n_val(self, add_from: int, n: int, val: int, mode=TLC):
         """
@@ -233,12 +380,13 @@ class AddressManager:
             raise IndexError(
                 f"add_from + n exceeds num_blocks: {add_from} + {n} > {self.num_blocks}"
             )
+        self.invalidate_pools()
         self.addrstates[add_from : add_from + n] = val
         if val == ERASE:
-            self.addrmodes_erase[add_from : add_from + n] = mode
-            self.addrmodes_pgm[add_from : add_from + n] = TBD
+            self._modes_erase[add_from : add_from + n] = self.celltype_code(mode)
+            self._modes_pgm[add_from : add_from + n] = 0
         elif val > ERASE:
-            self.addrmodes_pgm[add_from : add_from + n] = mode
+            self._modes_pgm[add_from : add_from + n] = self.celltype_code(mode)
 
     def set_adds_val(self, adds: np.ndarray, val: int, mode=TLC):
         """
@@ -250,12 +398,13 @@ class AddressManager:
             raise IndexError(
                 f"Some addresses in adds exceed num_blocks: {tmp_adds[tmp_adds >= self.num_blocks]}"
             )
+        self.invalidate_pools()
         self.addrstates[tmp_adds] = val
         if val == ERASE:
-            self.addrmodes_erase[tmp_adds] = mode
-            self.addrmodes_pgm[tmp_adds] = TBD
+            self._modes_erase[tmp_adds] = self.celltype_code(mode)
+            self._modes_pgm[tmp_adds] = 0
         elif val > ERASE:
-            self.addrmodes_pgm[tmp_adds] = mode
+            self._modes_pgm[tmp_adds] = self.celltype_code(mode)
 
     def undo_last(self):
         """
@@ -263,13 +412,10 @@ class AddressManager:
         """
 
         self.addrstates[self.undo_addrs] = self.undo_states
-        # Restore both erase/program modes if available
-        if hasattr(self, "undo_modes_erase") and hasattr(self, "undo_modes_pgm"):
-            self.addrmodes_erase[self.undo_addrs] = self.undo_modes_erase
-            self.addrmodes_pgm[self.undo_addrs] = self.undo_modes_pgm
-        else:
-            # Backward compatibility
-            self.addrmodes[self.undo_addrs] = self.undo_modes
+        # Restore both erase/program mode codes
+        self._modes_erase[self.undo_addrs] = self.undo_modes_erase
+        self._modes_pgm[self.undo_addrs] = self.undo_modes_pgm
+        self._pools_touch(self.undo_addrs)
 
     # Note: Legacy get_*/sample_*/set_* APIs have been removed.
     # Use random_erase/random_pgm/random_read for fast direct sampling.
@@ -282,13 +428,13 @@ class AddressManager:
 
     def get_addrmodes(self) -> np.ndarray:
         """
-        program 모드(addrmodes_pgm) 반환 (호환성 유지)
+        program 모드(addrmodes_pgm) 반환 (호환성 유지, decode 된 복사본)
         """
         return self.addrmodes_pgm
 
     def get_addrmodes_erase(self) -> np.ndarray:
         """
-        erase 모드(addrmodes_erase) 반환
+        erase 모드(addrmodes_erase) 반환 (decode 된 복사본)
         """
         return self.addrmodes_erase
 
@@ -308,7 +454,7 @@ class AddressManager:
             return list(zip(self.addrstates.tolist(), self.addrmodes.tolist()))
         else:
             return list(
-                zip(self.addrstates[adds].tolist(), self.addrmodes[adds].tolist())
+                zip(self.addrstates[adds].tolist(), self._decode_modes(self._modes_pgm[adds]).tolist())
             )
 
     def log(self, adds: np.ndarray = None, file=None):
@@ -337,6 +483,46 @@ class AddressManager:
         """
         return self.num_blocks
 
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        상태 배열(addrstates, mode code, celltype 목록, undo 버퍼)을 복사해 반환
+        pickle 없이 np.savez 로 저장 가능 (RNG 상태는 포함하지 않음)
+        """
+        return {
+            "topology": np.array([self.num_dies, self.num_planes, self._blocks_per_die, self.pagesize], dtype=np.int64),
+            "addrstates": self.addrstates.copy(),
+            "modes_erase": self._modes_erase.copy(),
+            "modes_pgm": self._modes_pgm.copy(),
+            "celltypes": np.array(self._celltypes, dtype=str),
+            "undo_addrs": np.asarray(self.undo_addrs, dtype=np.int64),
+            "undo_states": np.asarray(self.undo_states).copy(),
+            "undo_modes_erase": np.asarray(self.undo_modes_erase, dtype=np.uint8),
+            "undo_modes_pgm": np.asarray(self.undo_modes_pgm, dtype=np.uint8),
+            "oversample": np.array(bool(self.oversample)),
+        }
+
+    def restore(self, snap: Dict[str, np.ndarray]) -> None:
+        """
+        snapshot() 결과로 상태 복원 (topology 가 다르면 ValueError)
+        """
+        topo = [int(x) for x in np.asarray(snap["topology"]).tolist()]
+        if topo != [self.num_dies, self.num_planes, self._blocks_per_die, self.pagesize]:
+            raise ValueError(
+                f"snapshot topology (dies, planes, blocks_per_die, pagesize)={tuple(topo)} does not match "
+                f"{(self.num_dies, self.num_planes, self._blocks_per_die, self.pagesize)}"
+            )
+        self.addrstates = np.asarray(snap["addrstates"]).astype(state_dtype(self.pagesize))
+        self._modes_erase = np.asarray(snap["modes_erase"]).astype(np.uint8)
+        self._modes_pgm = np.asarray(snap["modes_pgm"]).astype(np.uint8)
+        self._celltypes = [str(c) for c in np.asarray(snap["celltypes"]).tolist()]
+        self._celltype_code = {c: i for i, c in enumerate(self._celltypes)}
+        self.undo_addrs = np.asarray(snap["undo_addrs"]).astype(int)
+        self.undo_states = np.asarray(snap["undo_states"]).astype(self.addrstates.dtype)
+        self.undo_modes_erase = np.asarray(snap["undo_modes_erase"]).astype(np.uint8)
+        self.undo_modes_pgm = np.asarray(snap["undo_modes_pgm"]).astype(np.uint8)
+        self.oversample = bool(np.asarray(snap["oversample"]))
+        self.invalidate_pools()
+
     # ------------------------
     # Fast-path helpers
     # ------------------------
@@ -401,6 +587,118 @@ class AddressManager:
         dies = self._die_index[groups]
         return np.dstack((dies, groups, pages))
 
+    # ------------------------
+    # Incremental candidate pools
+    # ------------------------
+    # Single-plane sampling draws the same index from the same (sorted) candidate
+    # set as the mask path, so results and RNG consumption are identical; pools
+    # only replace the O(blocks) mask with O(log blocks) tree queries.
+
+    def _pool_weights(self, key: Tuple[Any, ...], blocks: Optional[np.ndarray] = None) -> np.ndarray:
+        st = self.addrstates if blocks is None else self.addrstates[blocks]
+        kind = key[0]
+        if kind == "erase":
+            w = (st != BAD) & (st != ERASE)
+        elif kind == "fresh":
+            em = self._modes_erase if blocks is None else self._modes_erase[blocks]
+            w = (st == ERASE) & (em == key[1])
+        elif kind == "cont":
+            pm = self._modes_pgm if blocks is None else self._modes_pgm[blocks]
+            w = (st > ERASE) & (st < self.pagesize - 1) & (pm == key[1])
+        elif kind == "read":
+            # page-weighted: readable pages 0..state-offset of blocks programmed with the celltype
+            pm = self._modes_pgm if blocks is None else self._modes_pgm[blocks]
+            _, code, offset = key
+            return np.where((st >= offset) & (pm == code), st.astype(np.int64) - offset + 1, 0)
+        else:
+            raise KeyError(key)
+        return w.astype(np.int64)
+
+    def _pool(self, key: Tuple[Any, ...]) -> _CandidatePool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _CandidatePool(self._pool_weights(key), self._plane_blocks)
+        return pool
+
+    def _pools_touch(self, blocks: np.ndarray) -> None:
+        """Re-derive pool weights of blocks whose state/modes changed."""
+        self.version += 1
+        if not self._pools or len(blocks) == 0:
+            return
+        blocks = np.asarray(blocks, dtype=np.int64).reshape(-1)
+        planes = self._plane_index[blocks].tolist()
+        pos = self._plane_pos[blocks].tolist()
+        bl = blocks.tolist()
+        for key, pool in self._pools.items():
+            for b, p, q, w in zip(bl, planes, pos, self._pool_weights(key, blocks).tolist()):
+                pool.all.set(b, w)
+                pool.planes[p].set(q, w)
+
+    def invalidate_pools(self) -> None:
+        """Drop candidate pools; required after writing addrstates/mode codes directly."""
+        self.version += 1
+        self._pools.clear()
+
+    def _use_pools(self, size: int) -> bool:
+        # each drawn unit is a Python-level tree descent; large requests stay on the vectorized masks
+        return self.num_blocks >= self.pool_min_blocks and size <= self.pool_max_size
+
+    def _pool_ranges(self, sel_plane: Optional[int], sel_die) -> List[Tuple[int, int]]:
+        """Index ranges (in the all-blocks or per-plane tree) covering the selected dies, ascending."""
+        if sel_die is None:
+            n = self.num_blocks if sel_plane is None else int(self._plane_blocks[sel_plane].size)
+            return [(0, n)]
+        dies = [sel_die] if isinstance(sel_die, int) else sorted({int(d) for d in sel_die})
+        out = []
+        for d in dies:
+            if not 0 <= d < self.num_dies:
+                continue
+            lo, hi = d * self._blocks_per_die, (d + 1) * self._blocks_per_die
+            if sel_plane is not None:
+                blocks = self._plane_blocks[sel_plane]
+                lo, hi = int(np.searchsorted(blocks, lo)), int(np.searchsorted(blocks, hi))
+            out.append((lo, hi))
+        return out
+
+    def _pool_sample(
+        self, keys: List[Tuple[Any, ...]], sel_plane: Optional[int], sel_die, size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw min(size, total weight) distinct weight units from the union of pools.
+
+        Returns (blocks, offset of each unit inside its block's weight). With 0/1
+        weights this is a uniform block draw; with page counts (read pools) a
+        uniform page draw. Mirrors rng.choice(total, size=k, replace=False) over
+        the mask path's cumulative counts; sets oversample.
+        """
+        if sel_plane is not None and not 0 <= sel_plane < self.num_planes:
+            self.oversample = (size > 0)
+            return empty_arr(), empty_arr()
+        pools = [self._pool(k) for k in keys]
+        trees = [p.all if sel_plane is None else p.planes[sel_plane] for p in pools]
+        spans = []
+        total = 0
+        for lo, hi in self._pool_ranges(sel_plane, sel_die):
+            base = sum(t.prefix(lo) for t in trees)
+            cnt = sum(t.prefix(hi) for t in trees) - base
+            if cnt > 0:
+                spans.append((total, base, cnt))
+                total += cnt
+        if total == 0:
+            self.oversample = (size > 0)
+            return empty_arr(), empty_arr()
+        k = min(size, total)
+        self.oversample = (size > total)
+        idx = self._rng.choice(total, size=k, replace=False)
+        out = np.empty(k, dtype=np.int64)
+        offs = np.empty(k, dtype=np.int64)
+        for j, r in enumerate(idx.tolist()):
+            for start, base, cnt in spans:
+                if r < start + cnt:
+                    pos, offs[j] = _fenwick_select(trees, base + r - start)
+                    break
+            out[j] = pos if sel_plane is None else self._plane_blocks[sel_plane][pos]
+        return out, offs
+
     # Legacy candidate expansion and sampling APIs were removed to
     # eliminate redundant allocations and complexity. Multi/single‑plane
     # fast paths were provided by random_erase/random_pgm/random_read.
@@ -425,6 +723,10 @@ class AddressManager:
         if isinstance(sel_plane, list) and len(sel_plane) == 1:
             sel_plane = sel_plane[0]
 
+        if (sel_plane is None or isinstance(sel_plane, int)) and self._use_pools(size):
+            sel, _ = self._pool_sample([("erase",)], sel_plane, sel_die, size)
+            return sel if len(sel) == 0 else self._wrap_blocks_as_addrs(sel, pages=0)
+
         if sel_plane is None or isinstance(sel_plane, int):
             mask = (self.addrstates != BAD) & (self.addrstates != ERASE)
             if isinstance(sel_plane, int):
@@ -483,12 +785,29 @@ class AddressManager:
         # Save undo
         self.undo_addrs = uniq
         self.undo_states = self.addrstates[uniq].copy()
-        self.undo_modes_erase = self.addrmodes_erase[uniq].copy()
-        self.undo_modes_pgm = self.addrmodes_pgm[uniq].copy()
+        self.undo_modes_erase = self._modes_erase[uniq].copy()
+        self.undo_modes_pgm = self._modes_pgm[uniq].copy()
         # Apply
         self.addrstates[uniq] = ERASE
-        self.addrmodes_erase[uniq] = mode
-        self.addrmodes_pgm[uniq] = TBD
+        self._modes_erase[uniq] = self.celltype_code(mode)
+        self._modes_pgm[uniq] = 0
+        self._pools_touch(uniq)
+
+    def _fresh_mode_ok(self, erase_codes: np.ndarray, mode) -> np.ndarray:
+        """Erased blocks programmable with mode: same celltype, or A0SLC/ACSLC on an SLC erase."""
+        ok = self._mode_mask(erase_codes, mode)
+        if mode in (A0SLC, ACSLC):
+            ok |= erase_codes == self._celltype_code[SLC]
+        return ok
+
+    def _pgm_pool_keys(self, mode) -> List[Tuple[Any, ...]]:
+        """Disjoint pools whose union is the single-plane program candidate set for mode."""
+        code = self._celltype_code.get(str(mode))
+        keys: List[Tuple[Any, ...]] = [] if code is None else [("fresh", code), ("cont", code)]
+        slc = self._celltype_code[SLC]
+        if mode in (A0SLC, ACSLC) and code != slc:
+            keys.append(("fresh", slc))
+        return keys
 
     def sample_pgm(
         self,
@@ -506,17 +825,21 @@ class AddressManager:
         if isinstance(sel_plane, list) and len(sel_plane) == 1:
             sel_plane = sel_plane[0]
 
+        if (sel_plane is None or isinstance(sel_plane, int)) and not sequential and self._use_pools(size):
+            sel, _ = self._pool_sample(self._pgm_pool_keys(mode), sel_plane, sel_die, size)
+            if len(sel) == 0:
+                return sel
+            pages = (self.addrstates[sel] + 1).astype(int)
+            return self._wrap_blocks_as_addrs(sel, pages=pages)
+
         if sel_plane is None or isinstance(sel_plane, int):
             states = self.addrstates
             mask_base = (states >= ERASE) & (states < self.pagesize - 1)
-            erase_modes = self.addrmodes_erase
-            pgm_modes = self.addrmodes_pgm
             fresh = states == ERASE
             cont = states > ERASE
-            allow_on_slc = (erase_modes == SLC) & np.isin(mode, [A0SLC, ACSLC])
             allowed = np.zeros_like(mask_base, dtype=bool)
-            allowed |= fresh & ((erase_modes == mode) | allow_on_slc)
-            allowed |= cont & (pgm_modes == mode)
+            allowed |= fresh & self._fresh_mode_ok(self._modes_erase, mode)
+            allowed |= cont & self._mode_mask(self._modes_pgm, mode)
             mask = mask_base & allowed
             if isinstance(sel_plane, int):
                 mask &= (self._plane_index == sel_plane)
@@ -538,7 +861,7 @@ class AddressManager:
                 if len(cand2) == 0:
                     self.oversample = (size > 0)
                     return empty_arr()
-                blk = int(self._rng.choice(cand2, size=1, replace=False))
+                blk = int(self._rng.choice(cand2, size=1, replace=False)[0])
                 start = int(self.addrstates[blk] + 1)
                 pages = np.arange(start, start + size, dtype=int)
                 blocks = np.repeat(np.array([blk], dtype=int), size)
@@ -558,13 +881,10 @@ class AddressManager:
         vals = self.addrstates[groups]
         eq = (vals == vals[:, [0]]).all(axis=1)
         rng = ((vals >= ERASE) & (vals < self.pagesize - 1)).all(axis=1)
-        erase_modes_g = self.addrmodes_erase[groups]
-        pgm_modes_g = self.addrmodes_pgm[groups]
         base = vals[:, 0]
         row_fresh = base == ERASE
-        allow_on_slc = (erase_modes_g == SLC) & np.isin(mode, [A0SLC, ACSLC])
-        mm_fresh = ((erase_modes_g == mode) | allow_on_slc).all(axis=1)
-        mm_cont = (pgm_modes_g == mode).all(axis=1)
+        mm_fresh = self._fresh_mode_ok(self._modes_erase[groups], mode).all(axis=1)
+        mm_cont = self._mode_mask(self._modes_pgm[groups], mode).all(axis=1)
         ok = eq & rng & ((row_fresh & mm_fresh) | ((~row_fresh) & mm_cont))
         if sel_die is not None:
             g0 = groups[:, 0]
@@ -586,7 +906,7 @@ class AddressManager:
             if len(rows) == 0:
                 self.oversample = (size > 0)
                 return empty_arr()
-            r = int(self._rng.choice(rows, size=1, replace=False))
+            r = int(self._rng.choice(rows, size=1, replace=False)[0])
             g = groups[r]
             start = int(self.addrstates[g[0]] + 1)
             pages = np.arange(start, start + size, dtype=int)
@@ -619,14 +939,15 @@ class AddressManager:
         # Save undo
         self.undo_addrs = uniq
         self.undo_states = self.addrstates[uniq].copy()
-        self.undo_modes_erase = self.addrmodes_erase[uniq].copy()
-        self.undo_modes_pgm = self.addrmodes_pgm[uniq].copy()
+        self.undo_modes_erase = self._modes_erase[uniq].copy()
+        self.undo_modes_pgm = self._modes_pgm[uniq].copy()
         # Apply increments
         self.addrstates[uniq] += counts
         # If any started from ERASE, set program mode
         started = (self.undo_states == ERASE)
         if np.any(started):
-            self.addrmodes_pgm[uniq[started]] = mode
+            self._modes_pgm[uniq[started]] = self.celltype_code(mode)
+        self._pools_touch(uniq)
 
     def sample_read(
         self,
@@ -646,8 +967,14 @@ class AddressManager:
 
         _offset = self.offset if offset is None else int(offset)
 
+        if (sel_plane is None or isinstance(sel_plane, int)) and not sequential and self._use_pools(size):
+            code = self._celltype_code.get(str(mode))
+            keys = [] if code is None else [("read", code, _offset)]
+            blocks, pages = self._pool_sample(keys, sel_plane, sel_die, size)
+            return blocks if len(blocks) == 0 else self._wrap_blocks_as_addrs(blocks, pages=pages)
+
         if sel_plane is None or isinstance(sel_plane, int):
-            mask = (self.addrstates >= _offset) & (self.addrmodes_pgm == mode)
+            mask = (self.addrstates >= _offset) & self._mode_mask(self._modes_pgm, mode)
             if isinstance(sel_plane, int):
                 mask &= (self._plane_index == sel_plane)
             if sel_die is not None:
@@ -687,7 +1014,7 @@ class AddressManager:
             if total_starts <= 0:
                 self.oversample = (size > 0)
                 return empty_arr()
-            r = int(self._rng.choice(total_starts, size=1, replace=False))
+            r = int(self._rng.choice(total_starts, size=1, replace=False)[0])
             cum = np.cumsum(start_cap)
             i = int(np.searchsorted(cum, r, side="right"))
             prev = int(cum[i - 1]) if i > 0 else 0
@@ -702,8 +1029,8 @@ class AddressManager:
         planes = list(sel_plane)
         groups = self._groups_for_planes(planes)
         st = self.addrstates[groups]
-        md = self.addrmodes_pgm[groups]
-        ok = ((st > ERASE) & (st >= _offset) & (md == mode)).all(axis=1)
+        md = self._modes_pgm[groups]
+        ok = ((st > ERASE) & (st >= _offset) & self._mode_mask(md, mode)).all(axis=1)
         if sel_die is not None:
             g0 = groups[:, 0]
             die_rows = self._die_index[g0]
@@ -742,7 +1069,7 @@ class AddressManager:
         if total_starts <= 0:
             self.oversample = (size > 0)
             return empty_arr()
-        r = int(self._rng.choice(total_starts, size=1, replace=False))
+        r = int(self._rng.choice(total_starts, size=1, replace=False)[0])
         cum = np.cumsum(start_cap)
         i = int(np.searchsorted(cum, r, side="right"))
         prev = int(cum[i - 1]) if i > 0 else 0
@@ -1229,8 +1556,8 @@ def _addrman_check_epr(
         mismatches: List[Tuple[int, int, str, str]] = []
         for (die, block, page) in norm:
             idx = die * self._blocks_per_die + block
-            erase_mode = str(self.addrmodes_erase[idx])
-            pgm_mode = str(self.addrmodes_pgm[idx])
+            erase_mode = self.mode_erase_of(idx)
+            pgm_mode = self.mode_pgm_of(idx)
             # Allowed: ERASE SLC with program A0SLC/ACSLC/SLC; otherwise modes must match
             if erase_mode == SLC:
                 if op_celltype not in {SLC, A0SLC, ACSLC}:
@@ -1326,6 +1653,7 @@ if __name__ == "__main__":
     print(
         f"pre pgm succ rate: {cnt/cnt_tot:.2f}, total blocks: {num_blocks}, attempt:{cnt_tot}, success: {cnt}"
     )
+    modes = addman.get_addrmodes()
     print(
         f"{test_mode} pgmed block rate: {np.sum((states > ERASE) & (modes == test_mode))/num_blocks}"
     )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 class BootstrapController:
@@ -19,6 +19,10 @@ class BootstrapController:
         self._read_blocks: set[tuple[int, int]] = set()
         self._erase_blocks: set[tuple[int, int]] = set()
         self._program_blocks: set[tuple[int, int]] = set()
+        # overlay cfg reused until the stage (or the source cfg) changes
+        self._overlay_key: Optional[tuple[int, int]] = None
+        self._overlay_src: Optional[Dict[str, Any]] = None
+        self._overlay_cfg: Optional[Dict[str, Any]] = None
 
     def active(self) -> bool:
         return self._active
@@ -66,14 +70,36 @@ class BootstrapController:
             "read_coverage": coverage,
         }
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Stage and progress trackers (checkpointing); thresholds come from cfg."""
+        return {
+            "active": self._active,
+            "stage": self._stage,
+            "read_blocks": sorted(self._read_blocks),
+            "erase_blocks": sorted(self._erase_blocks),
+            "program_blocks": sorted(self._program_blocks),
+        }
+
+    def restore(self, snap: Dict[str, Any]) -> None:
+        self._active = bool(snap.get("active", False))
+        self._stage = int(snap.get("stage", 0))
+        self._read_blocks = {(int(d), int(b)) for d, b in snap.get("read_blocks", [])}
+        self._erase_blocks = {(int(d), int(b)) for d, b in snap.get("erase_blocks", [])}
+        self._program_blocks = {(int(d), int(b)) for d, b in snap.get("program_blocks", [])}
+        self._overlay_key = self._overlay_src = self._overlay_cfg = None
+
     def overlay_cfg(self, cfg: Dict[str, Any]) -> Dict[str, Any]:
         if not self._active:
             return cfg
         stage = self._stage
+        key = (stage, id(cfg.get("phase_conditional")))
+        if self._overlay_cfg is not None and self._overlay_src is cfg and self._overlay_key == key:
+            return self._overlay_cfg
         allowed_names = self._allowed_op_names_for_stage(cfg, stage)
         pc = self._build_overlay_phase_conditional(cfg, allowed_names)
         out = dict(cfg)
         out["phase_conditional"] = pc
+        self._overlay_key, self._overlay_src, self._overlay_cfg = key, cfg, out
         return out
 
     def _allowed_op_names_for_stage(self, cfg: Dict[str, Any], stage: int) -> List[str]:
@@ -155,3 +181,122 @@ class BootstrapController:
         except Exception:
             pass
         return out
+
+
+# ------------------------------
+# Preconditioning (bootstrap.mode: precondition)
+# ------------------------------
+PRECONDITION_VERSION = 1
+_PROGRAM_BASES = (
+    "PROGRAM_SLC", "CACHE_PROGRAM_SLC", "ONESHOT_PROGRAM_LSB", "ONESHOT_PROGRAM_CSB", "ONESHOT_PROGRAM_MSB",
+    "ONESHOT_PROGRAM_MSB_23H", "ONESHOT_PROGRAM_EXEC_MSB", "ONESHOT_CACHE_PROGRAM",
+)
+
+
+def _precondition_key(cfg: Dict[str, Any], am: Any, *, seed: Optional[int], badlist: Any) -> str:
+    import hashlib
+    import json
+
+    pairs = sorted((int(d), int(b)) for d, b in (badlist if badlist is not None else []))
+    blob = json.dumps(
+        {
+            "version": PRECONDITION_VERSION,
+            "config": json.dumps(cfg, sort_keys=True, default=str, ensure_ascii=False),
+            "topology": [am.num_dies, am.num_planes, am.num_blocks // am.num_dies, am.pagesize],
+            "badlist": pairs,
+            "seed": seed,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _stage_celltypes(ctl: BootstrapController, cfg: Dict[str, Any], stage: int, bases: Any) -> Dict[str, float]:
+    """Celltype -> summed bootstrap weight of the stage's op names on *bases*."""
+    names = (cfg.get("op_names", {}) or {})
+    weights = ctl._celltype_weights(cfg)
+    out: Dict[str, float] = {}
+    for n in ctl._allowed_op_names_for_stage(cfg, stage):
+        spec = names.get(n, {}) or {}
+        if str(spec.get("base")) not in bases:
+            continue
+        ct = spec.get("celltype")
+        if ct in (None, "None"):
+            continue
+        out[str(ct)] = out.get(str(ct), 0.0) + float(weights.get(str(ct), 1.0))
+    return {k: v for k, v in out.items() if v > 0.0}
+
+
+def _synthesize(cfg: Dict[str, Any], am: Any, *, seed: Optional[int]) -> Dict[str, int]:
+    import numpy as np
+    from addrman import ERASE, GOOD
+
+    ctl = BootstrapController(cfg)
+    rng = np.random.default_rng(seed)
+    good = np.flatnonzero(am.addrstates == GOOD)
+    n_erase = min(good.size, max(ctl._thr_erase, ctl._thr_program, 0))
+    erased = rng.permutation(good)[:n_erase]
+    cts = _stage_celltypes(ctl, cfg, 0, ("ERASE",)) or {"TLC": 1.0}
+    names = sorted(cts)
+    p = np.array([cts[c] for c in names], dtype=float)
+    modes = rng.choice(len(names), size=erased.size, p=p / p.sum())
+    for i, ct in enumerate(names):
+        am.set_adds_val(erased[modes == i], ERASE, mode=ct)
+    # Stage 1 programs distinct erased blocks whose celltype some program op uses
+    pgm_cts = set(_stage_celltypes(ctl, cfg, 1, _PROGRAM_BASES))
+    ok = np.array([not pgm_cts or names[m] in pgm_cts for m in modes], dtype=bool)
+    cand = np.flatnonzero(ok)
+    pick = rng.permutation(cand)[: min(cand.size, max(ctl._thr_program, 0))]
+    programmed, pgm_modes = erased[pick], modes[pick]
+    last_page = rng.integers(0, am.pagesize, size=programmed.size)
+    # A program keeps the celltype the block was erased with
+    for i, ct in enumerate(names):
+        for page in np.unique(last_page[pgm_modes == i]).tolist():
+            am.set_adds_val(programmed[(pgm_modes == i) & (last_page == page)], int(page), mode=ct)
+    return {"erased": int(erased.size), "programmed": int(programmed.size)}
+
+
+def precondition_addrman(
+    cfg: Dict[str, Any],
+    am: Any,
+    *,
+    seed: Optional[int],
+    badlist: Any = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Put *am* straight into a post-bootstrap state instead of simulating the bootstrap run.
+
+    Erases max(erase_volume, program_volume) distinct good blocks (celltypes
+    drawn by bootstrap.celltype_weights over the ERASE op names), then
+    programs program_volume of them with 1..pagesize pages each. Reads leave
+    no block state, so read thresholds need nothing. The ResourceManager
+    stays empty (no op is in flight at time 0).
+
+    With *cache_dir*, the result is stored as an AddressManager snapshot npz
+    keyed by config, topology, badlist and seed, and reused on later calls.
+    Returns {"key", "path", "cached", "erased", "programmed"}.
+    """
+    import json
+    import os
+
+    import numpy as np
+
+    key = _precondition_key(cfg, am, seed=seed, badlist=badlist)
+    path = os.path.join(cache_dir, f"warm_start_{key[:24]}.npz") if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+            if meta.get("key") == key:
+                am.restore({name[3:]: z[name] for name in z.files if name.startswith("am/")})
+                return {"key": key, "path": path, "cached": True, **meta.get("counts", {})}
+    counts = _synthesize(cfg, am, seed=seed)
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)  # type: ignore[arg-type]
+        meta_blob = json.dumps({"key": key, "version": PRECONDITION_VERSION, "counts": counts}).encode("utf-8")
+        arrays = {"meta": np.frombuffer(meta_blob, dtype=np.uint8)}
+        arrays.update({"am/" + name: arr for name, arr in am.snapshot().items()})
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, path)
+    return {"key": key, "path": path, "cached": False, **counts}
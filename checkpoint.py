@@ -0,0 +1,293 @@
+"""Whole-simulation checkpoints (``main.py --checkpoint-every/--resume-from``).
+
+A checkpoint is a pair of files sharing one stem:
+
+- ``<stem>.npz``: bulk state as plain arrays (``np.load(allow_pickle=False)``):
+  AddressManager arrays under ``am/<name>``, the RM state timeline as typed,
+  dictionary-encoded columns ``tl/<column>``, and everything else as one
+  UTF-8 JSON document under ``state`` (Scheduler event queue/backlog/counters,
+  Python and numpy RNG states, RM windows/latches/suspend state).
+- ``<stem>.json``: a small manifest (format, version, run index, simulated
+  time, topology, config digest, npz checksum) read before the npz. It also
+  records how far the cumulative exports (op_event_resume, apply_pgm_log)
+  had been written, as file paths relative to the manifest plus byte or row
+  extents; resuming cuts those files back instead of carrying their rows.
+
+Nothing is pickled. Objects the simulator keeps in its state (Address,
+Scope, proposer op stubs, exclusion windows, latch entries, tuples, sets,
+non-string dict keys) are written as tagged JSON values and rebuilt on load.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from proposer import _OpStub, _StateSeg
+from resourcemgr import Address, ExclWindow, ResourceManager, Scope, _LatchEntry
+
+CHECKPOINT_FORMAT = "nandseqgen-checkpoint"
+CHECKPOINT_VERSION = 1
+
+_TL_COLUMNS = ("die", "plane", "base", "state", "start_us", "end_us")
+
+
+# ------------------------------
+# Tagged JSON codec
+# ------------------------------
+def encode(obj: Any) -> Any:
+    """Return a JSON-ready copy of *obj*; raises TypeError on unsupported objects."""
+    if obj is None or isinstance(obj, (bool, str)):
+        return obj
+    if isinstance(obj, (int, float)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Address):
+        return {"__addr__": [obj.die, obj.plane, obj.block, obj.page]}
+    if isinstance(obj, Scope):
+        return {"__scope__": obj.name}
+    if isinstance(obj, _StateSeg):
+        return {"__seg__": [obj.name, obj.dur_us, obj.bus]}
+    if isinstance(obj, _OpStub):
+        return {
+            "__op__": [obj.name, obj.base, [encode(s) for s in obj.states], obj.total_us, encode(obj.bus_offsets)]
+        }
+    if isinstance(obj, ExclWindow):
+        return {"__excl__": [obj.start, obj.end, obj.scope, obj.die, sorted(obj.tokens)]}
+    if isinstance(obj, _LatchEntry):
+        return {"__latch__": [obj.kind, obj.start_us, obj.end_us]}
+    if isinstance(obj, tuple):
+        return {"__tuple__": [encode(v) for v in obj]}
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": [encode(v) for v in obj]}
+    if isinstance(obj, list) or type(obj).__name__ == "deque":
+        return [encode(v) for v in obj]
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) and not k.startswith("__") for k in obj):
+            return {k: encode(v) for k, v in obj.items()}
+        return {"__items__": [[encode(k), encode(v)] for k, v in obj.items()]}
+    raise TypeError(f"cannot checkpoint object of type {type(obj).__name__}: {obj!r}")
+
+
+def decode(obj: Any) -> Any:
+    """Inverse of encode()."""
+    if isinstance(obj, list):
+        return [decode(v) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if len(obj) == 1:
+        tag, val = next(iter(obj.items()))
+        if tag == "__addr__":
+            return Address(*val)
+        if tag == "__scope__":
+            return Scope[val]
+        if tag == "__seg__":
+            return _StateSeg(name=val[0], dur_us=val[1], bus=val[2])
+        if tag == "__op__":
+            name, base, states, total_us, bus_offsets = val
+            return _OpStub(name=name, base=base, states=tuple(decode(s) for s in states), total_us=total_us, bus_offsets=decode(bus_offsets))
+        if tag == "__excl__":
+            start, end, scope, die, tokens = val
+            return ExclWindow(start, end, scope, die, set(tokens))
+        if tag == "__latch__":
+            return _LatchEntry(kind=val[0], start_us=val[1], end_us=val[2])
+        if tag == "__tuple__":
+            return tuple(decode(v) for v in val)
+        if tag == "__set__":
+            return {decode(v) for v in val}
+        if tag == "__items__":
+            return {decode(k): decode(v) for k, v in val}
+    return {k: decode(v) for k, v in obj.items()}
+
+
+# ------------------------------
+# Helpers
+# ------------------------------
+def config_digest(cfg: Dict[str, Any]) -> str:
+    blob = json.dumps(cfg, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _timeline_columns(rm: ResourceManager) -> Dict[str, np.ndarray]:
+    segs = list(rm.timeline_segments())
+    out: Dict[str, np.ndarray] = {
+        "die": np.array([s[0] for s in segs], dtype=np.int32),
+        "plane": np.array([s[1] for s in segs], dtype=np.int32),
+        "start_us": np.array([s[4] for s in segs], dtype=np.float64),
+        "end_us": np.array([s[5] for s in segs], dtype=np.float64),
+    }
+    for name, pos in (("base", 2), ("state", 3)):
+        cats, codes = np.unique(np.array([str(s[pos]) for s in segs], dtype=str), return_inverse=True)
+        out[name] = codes.astype(np.int32)
+        out[name + "__dict"] = cats
+    return out
+
+
+def _timeline_rows(cols: Dict[str, np.ndarray]) -> List[tuple]:
+    bases = [str(c) for c in cols["base__dict"].tolist()]
+    states = [str(c) for c in cols["state__dict"].tolist()]
+    return [
+        (d, p, bases[b], states[s], s0, s1)
+        for d, p, b, s, s0, s1 in zip(
+            cols["die"].tolist(),
+            cols["plane"].tolist(),
+            cols["base"].tolist(),
+            cols["state"].tolist(),
+            cols["start_us"].tolist(),
+            cols["end_us"].tolist(),
+        )
+    ]
+
+
+# ------------------------------
+# Save / load
+# ------------------------------
+def save_checkpoint(
+    stem: str,
+    *,
+    sched: Any,
+    rm: ResourceManager,
+    am: Any,
+    run_idx: int,
+    t_end: float,
+    cfg: Dict[str, Any],
+    outputs: Optional[Dict[str, Dict[str, Any]]] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Write ``<stem>.npz`` + ``<stem>.json`` for a run paused between ticks; return the manifest path.
+
+    *outputs* maps each cumulative export to its written extent (``file``
+    relative to the manifest directory plus ``size``/``rows``), stored in the
+    manifest so a resumed session can truncate those files back to it.
+    """
+    # Archived (spilled) timeline segments are part of the state; reload them first
+    rm.restore_timeline_archive()
+    rm_snap = rm.snapshot()
+    rm_snap.pop("timeline", None)
+    state: Dict[str, Any] = {
+        "scheduler": sched.snapshot(),
+        "rm": rm_snap,
+        "am_rng": (am._rng.bit_generator.state if hasattr(am, "_rng") else None),
+    }
+    blob = json.dumps(encode(state), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    arrays: Dict[str, np.ndarray] = {"state": np.frombuffer(blob, dtype=np.uint8)}
+    for name, col in _timeline_columns(rm).items():
+        arrays["tl/" + name] = col
+    if hasattr(am, "snapshot"):
+        for name, arr in am.snapshot().items():
+            arrays["am/" + name] = arr
+
+    npz_path = stem + ".npz"
+    manifest_path = stem + ".json"
+    d = os.path.dirname(npz_path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    # np.savez appends .npz when missing; write through a handle to keep the exact path
+    with open(npz_path + ".tmp", "wb") as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(npz_path + ".tmp", npz_path)
+    topo = cfg.get("topology", {}) or {}
+    manifest = {
+        "format": CHECKPOINT_FORMAT,
+        "version": CHECKPOINT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "run_idx": int(run_idx),
+        "now_us": float(sched.now_us),
+        "t_end_us": float(t_end),
+        "topology": {k: topo.get(k) for k in ("dies", "planes", "blocks_per_die", "pages_per_block")},
+        "config_sha256": config_digest(cfg),
+        "npz": os.path.basename(npz_path),
+        "npz_sha256": _file_sha256(npz_path),
+        "outputs": dict(outputs or {}),
+    }
+    if extra:
+        manifest.update(extra)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest_path
+
+
+@dataclass
+class Checkpoint:
+    manifest: Dict[str, Any]
+    state: Dict[str, Any]
+    timeline: List[tuple]
+    am_arrays: Dict[str, np.ndarray]
+    stem: str = ""
+
+    @property
+    def run_idx(self) -> int:
+        return int(self.manifest["run_idx"])
+
+    @property
+    def t_end_us(self) -> float:
+        return float(self.manifest["t_end_us"])
+
+    @property
+    def outputs(self) -> Dict[str, Dict[str, Any]]:
+        """Cumulative export extents from the manifest, each with ``path`` resolved against it."""
+        base = os.path.dirname(self.stem)
+        return {
+            key: dict(mark, path=os.path.normpath(os.path.join(base, str(mark["file"]))))
+            for key, mark in (self.manifest.get("outputs") or {}).items()
+        }
+
+    def restore_rm(self, rm: ResourceManager) -> None:
+        rm.restore(self.state["rm"])
+        rm.load_timeline_segments(self.timeline)
+
+    def restore_am(self, am: Any) -> None:
+        if self.am_arrays and hasattr(am, "restore"):
+            am.restore(self.am_arrays)
+        rng_state = self.state.get("am_rng")
+        if rng_state is not None and hasattr(am, "_rng"):
+            bit_gen = getattr(np.random, str(rng_state["bit_generator"]))()
+            bit_gen.state = rng_state
+            am._rng = np.random.Generator(bit_gen)
+
+    def restore_scheduler(self, sched: Any) -> None:
+        sched.restore(self.state["scheduler"])
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Load a checkpoint from its manifest (``.json``) or data (``.npz``) path.
+
+    Raises ValueError for a foreign format, an unsupported version or a
+    checksum mismatch.
+    """
+    stem = os.path.splitext(path)[0] if path.endswith((".json", ".npz")) else path
+    with open(stem + ".json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"not a checkpoint manifest: {stem}.json")
+    version = int(manifest.get("version", 0))
+    if version > CHECKPOINT_VERSION or version < 1:
+        raise ValueError(f"unsupported checkpoint version {version} (supported: 1..{CHECKPOINT_VERSION})")
+    npz_path = os.path.join(os.path.dirname(stem + ".json"), str(manifest["npz"]))
+    if _file_sha256(npz_path) != manifest.get("npz_sha256"):
+        raise ValueError(f"checkpoint data does not match its manifest checksum: {npz_path}")
+    with np.load(npz_path, allow_pickle=False) as z:
+        state = decode(json.loads(z["state"].tobytes().decode("utf-8")))
+        tl = {name[3:]: z[name] for name in z.files if name.startswith("tl/")}
+        am_arrays = {name[3:]: z[name] for name in z.files if name.startswith("am/")}
+    timeline = _timeline_rows(tl) if tl.get("die") is not None and len(tl["die"]) else []
+    return Checkpoint(manifest=manifest, state=state, timeline=timeline, am_arrays=am_arrays, stem=stem)
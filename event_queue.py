@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple, Optional
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
 
 
 _PRIO = {
@@ -12,14 +13,37 @@ _PRIO = {
     "OP_START": 5,
 }
 
+Event = Tuple[float, int, int, str, Dict[str, Any]]
+# (when, seq, kind, payload) as yielded by lazy sources
+SourceEvent = Tuple[float, int, str, Dict[str, Any]]
+
 
 class EventQueue:
+    """Time-ordered event queue backed by a binary heap.
+
+    Entries are ordered by ``(time, _PRIO, seq)``; ``seq`` is unique so heap
+    comparisons never reach the kind/payload fields. ``remove`` is lazy: the
+    entry is dropped from the live index and skipped (tombstoned) when it
+    surfaces at the top of the heap.
+
+    Lazy sources (``push_source``) keep only their next event in the heap and
+    yield the following one when it is popped, using sequence numbers
+    reserved up front, so pop order matches pushing every event eagerly.
+    """
+
     def __init__(self) -> None:
-        self._q: List[Tuple[float, int, int, str, Dict[str, Any]]] = []
+        self._heap: List[Event] = []
+        # live seq -> kind; entries in the heap but not in this map are tombstones
+        self._live: Dict[int, str] = {}
         self._seq: int = 0
+        # live seq -> source that produced it (pulled again when that event pops)
+        self._sources: Dict[int, Iterator[SourceEvent]] = {}
+
+    def __len__(self) -> int:
+        return len(self._live)
 
     def is_empty(self) -> bool:
-        return not self._q
+        return not self._live
 
     def push(self, when: float, kind: str, payload: Dict[str, Any]) -> int:
         pri = _PRIO.get(kind, 3)
@@ -27,20 +51,94 @@ class EventQueue:
         seq = int(self._seq)
         payload_copy = dict(payload or {})
         payload_copy.setdefault("event_seq", seq)
-        self._q.append((float(when), int(pri), seq, str(kind), payload_copy))
-        self._q.sort(key=lambda x: (x[0], x[1], x[2]))
+        kind_s = str(kind)
+        heapq.heappush(self._heap, (float(when), int(pri), seq, kind_s, payload_copy))
+        self._live[seq] = kind_s
         return seq
 
-    def pop_time_batch(self) -> Tuple[float, List[Tuple[float, int, int, str, Dict[str, Any]]]]:
-        if not self._q:
+    def reserve(self, n: int) -> int:
+        """Reserve *n* consecutive sequence numbers; return the first."""
+        first = self._seq + 1
+        self._seq += max(0, int(n))
+        return first
+
+    def push_source(self, source: Iterator[SourceEvent]) -> None:
+        """Register a lazy event source.
+
+        *source* yields (when, seq, kind, payload) in (when, seq) order with
+        seqs from ``reserve``; removing its pending event drops the rest.
+        """
+        self._pull(source)
+
+    def _pull(self, source: Iterator[SourceEvent]) -> None:
+        nxt = next(source, None)
+        if nxt is None:
+            return
+        when, seq, kind, payload = nxt
+        self._push_entry(when, seq, kind, payload)
+        self._sources[seq] = source
+
+    def _push_entry(self, when: float, seq: int, kind: str, payload: Dict[str, Any]) -> None:
+        payload.setdefault("event_seq", seq)
+        kind_s = str(kind)
+        heapq.heappush(self._heap, (float(when), int(_PRIO.get(kind_s, 3)), int(seq), kind_s, payload))
+        self._live[seq] = kind_s
+
+    def materialize(self) -> int:
+        """Push every pending event of every lazy source; return how many were pushed."""
+        n = 0
+        while self._sources:
+            _seq, source = self._sources.popitem()
+            for when, seq, kind, payload in source:
+                self._push_entry(when, seq, kind, payload)
+                n += 1
+        return n
+
+    def snapshot(self) -> Tuple[int, List[Event]]:
+        """Return (last issued seq, live events in pop order), materializing lazy sources first."""
+        self.materialize()
+        return self._seq, self.entries()
+
+    def restore(self, seq: int, events: Iterable[Event]) -> None:
+        """Replace the queue with *events* (as from ``snapshot``); new pushes continue after *seq*."""
+        self._heap = [(float(w), int(pri), int(sq), str(k), dict(p)) for (w, pri, sq, k, p) in events]
+        heapq.heapify(self._heap)
+        self._live = {e[2]: e[3] for e in self._heap}
+        self._sources = {}
+        self._seq = max([int(seq)] + list(self._live))
+
+    def _prune_top(self) -> None:
+        heap = self._heap
+        live = self._live
+        while heap and heap[0][2] not in live:
+            heapq.heappop(heap)
+
+    def peek_time(self) -> Optional[float]:
+        """Return the time of the earliest live event, or None when empty."""
+        self._prune_top()
+        if not self._heap:
+            return None
+        return self._heap[0][0]
+
+    def pop_time_batch(self) -> Tuple[float, List[Event]]:
+        self._prune_top()
+        if not self._heap:
             return (0.0, [])
-        t0 = self._q[0][0]
-        batch: List[Tuple[float, int, int, str, Dict[str, Any]]] = []
-        i = 0
-        while i < len(self._q) and self._q[i][0] == t0:
-            batch.append(self._q[i])
-            i += 1
-        del self._q[:i]
+        heap = self._heap
+        live = self._live
+        t0 = heap[0][0]
+        batch: List[Event] = []
+        sources = self._sources
+        while heap and heap[0][0] == t0:
+            entry = heapq.heappop(heap)
+            if live.pop(entry[2], None) is None:
+                continue
+            batch.append(entry)
+            if sources:
+                src = sources.pop(entry[2], None)
+                if src is not None:
+                    # the source's next event may share t0; it joins this batch in order
+                    self._pull(src)
         return (t0, batch)
 
     def remove(self, seq_id: int, *, kind: Optional[str] = None) -> bool:
@@ -50,8 +148,43 @@ class EventQueue:
         True when an entry was removed, False otherwise.
         """
 
-        for idx, (_, _, seq, entry_kind, _) in enumerate(self._q):
-            if seq == seq_id and (kind is None or entry_kind == kind):
-                del self._q[idx]
-                return True
-        return False
+        entry_kind = self._live.get(seq_id)
+        if entry_kind is None:
+            return False
+        if kind is not None and entry_kind != kind:
+            return False
+        del self._live[seq_id]
+        self._sources.pop(seq_id, None)
+        # Compact once tombstones dominate so the heap does not grow unbounded
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._live):
+            self._compact()
+        return True
+
+    def entries(self) -> List[Event]:
+        """Return live events in pop order (snapshot; O(n log n)).
+
+        Only each lazy source's next event is included; the rest are not
+        materialized until it pops.
+        """
+        live = self._live
+        return sorted(e for e in self._heap if e[2] in live)
+
+    # Backward-compatible read-only view used by diagnostics/tests
+    @property
+    def _q(self) -> List[Event]:
+        return self.entries()
+
+    def pop_kind(self, kind: str) -> List[Event]:
+        """Remove and return every live event of *kind* in pop order."""
+        out = [e for e in self.entries() if e[3] == kind]
+        for e in out:
+            self._live.pop(e[2], None)
+            self._sources.pop(e[2], None)
+        if out:
+            self._compact()
+        return out
+
+    def _compact(self) -> None:
+        live = self._live
+        self._heap = [e for e in self._heap if e[2] in live]
+        heapq.heapify(self._heap)
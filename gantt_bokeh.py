@@ -26,6 +26,8 @@ from bokeh.models import Slider
 from bokeh.palettes import Category20, Category10, Turbo256
 from bokeh.transform import factor_cmap
 
+import tableio
+
 
 def _normalize_timeline_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -627,9 +629,10 @@ def _make_doc_layout(df_in: pd.DataFrame, df_ops: Optional[pd.DataFrame] = None)
 
 
 def _load_csv(path: Path) -> pd.DataFrame:
+    # Accepts CSV or the columnar (.parquet/.npz) exports
     if not path.exists():
         raise FileNotFoundError(f"CSV not found: {path}")
-    return pd.read_csv(path)
+    return tableio.read_table(str(path))
 
 
 def build():
@@ -2,19 +2,23 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
+import itertools
 import json
 import os
 import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import yaml  # type: ignore
 except Exception:
     yaml = None  # optional
 
+import checkpoint as _checkpoint
 import proposer as _proposer
+import tableio as _tableio
 from scheduler import Scheduler
 from resourcemgr import ResourceManager, Address, SIM_RES_US, quantize
 
@@ -209,9 +213,27 @@ class InstrumentedScheduler(Scheduler):
                 )
             )
 
-    def timeline_rows(self) -> List[Dict[str, Any]]:
+    def timeline_rows(self, copy: bool = True) -> List[Dict[str, Any]]:
+        """Return one dict per op-target row.
+
+        copy=False hands out the rows' own __dict__ (no per-row copy); callers
+        must treat them as read-only. Exporters use this.
+        """
+        if not copy:
+            return [r.__dict__ for r in self._rows]
         return [r.__dict__.copy() for r in self._rows]
 
+    def snapshot(self) -> Dict[str, Any]:  # type: ignore[override]
+        snap = super().snapshot()
+        snap["rows"] = self.timeline_rows(copy=False)
+        snap["next_uid"] = self._next_uid
+        return snap
+
+    def restore(self, snap: Dict[str, Any]) -> None:  # type: ignore[override]
+        super().restore(snap)
+        self._rows = [_OpRow(**r) for r in snap.get("rows", [])]
+        self._next_uid = int(snap.get("next_uid", len(self._rows) + 1))
+
 
 
 # ------------------------------
@@ -233,7 +255,7 @@ def _ensure_dir(p: str) -> None:
         os.makedirs(d, exist_ok=True)
 
 
-def _csv_write(path: str, rows: List[Dict[str, Any]], fieldnames: List[str]) -> None:
+def _csv_write(path: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> None:
     _ensure_dir(path)
     with open(path, "w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_MINIMAL)
@@ -242,67 +264,248 @@ def _csv_write(path: str, rows: List[Dict[str, Any]], fieldnames: List[str]) ->
             w.writerow(r)
 
 
-def _write_op_event_resume_csv(rows: List[Dict[str, Any]], *, out_dir: str) -> str:
-    fname = "op_event_resume.csv"
-    path = os.path.join(out_dir, fname)
-    fieldnames = [
-        "op_name",
-        "op_id",
-        "op_uid",
-        "die",
-        "plane",
-        "block",
-        "page",
-        "is_resumed",
-        "event",
-        "triggered_us",
-    ]
-    ordered = sorted(
-        rows,
-        key=lambda r: (
-            float(r.get("triggered_us", 0.0)),
-            int(r.get("op_uid", 0)),
-            int(r.get("die", 0)),
-            int(r.get("plane", 0)),
-            int(r.get("block", 0)),
-            int(r.get("page", 0)),
-            str(r.get("event", "")),
-        ),
+def _table_write(path: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str], fmt: str = "csv") -> None:
+    # Timeline-scale exports honor --export-format; small summaries stay CSV via _csv_write
+    if fmt == "csv":
+        _csv_write(path, rows, fieldnames)
+    else:
+        _tableio.write_table(path, rows, fieldnames, fmt)
+
+
+OP_EVENT_RESUME_FIELDS = [
+    "op_name",
+    "op_id",
+    "op_uid",
+    "die",
+    "plane",
+    "block",
+    "page",
+    "is_resumed",
+    "event",
+    "triggered_us",
+]
+
+APPLY_PGM_LOG_FIELDS = [
+    "triggered_us",
+    "op_uid",
+    "op_name",
+    "base",
+    "celltype",
+    "die",
+    "plane",
+    "block",
+    "page",
+    "resume",
+    "call_seq",
+]
+
+
+def _op_event_sort_key(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        float(r.get("triggered_us", 0.0)),
+        int(r.get("op_uid", 0)),
+        int(r.get("die", 0)),
+        int(r.get("plane", 0)),
+        int(r.get("block", 0)),
+        int(r.get("page", 0)),
+        str(r.get("event", "")),
     )
-    _csv_write(path, ordered, fieldnames)
-    return path
 
 
-def _write_apply_pgm_log_csv(rows: List[Dict[str, Any]], *, out_dir: str) -> str:
-    fname = "apply_pgm_log.csv"
-    path = os.path.join(out_dir, fname)
-    fieldnames = [
-        "triggered_us",
-        "op_uid",
-        "op_name",
-        "base",
-        "celltype",
-        "die",
-        "plane",
-        "block",
-        "page",
-        "resume",
-        "call_seq",
-    ]
-    ordered = sorted(
-        rows,
-        key=lambda r: (
-            float(r.get("triggered_us", 0.0)),
-            int(r.get("op_uid", 0)),
-            int(r.get("call_seq", 0)),
-            int(r.get("die", 0)),
-            int(r.get("plane", 0)),
-            int(r.get("block", 0)),
-            int(r.get("page", 0)),
-        ),
+def _apply_pgm_sort_key(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        float(r.get("triggered_us", 0.0)),
+        int(r.get("op_uid", 0)),
+        int(r.get("call_seq", 0)),
+        int(r.get("die", 0)),
+        int(r.get("plane", 0)),
+        int(r.get("block", 0)),
+        int(r.get("page", 0)),
     )
-    _csv_write(path, ordered, fieldnames)
-    return path
+
+
+class _CumulativeCsv:
+    """CSV that accumulates rows over runs, kept sorted by sort_key (triggered_us first).
+
+    The file stays open across runs and append() writes only the new rows.
+    Rows at the latest triggered_us are kept (and rewritten in place) so the
+    next run's rows at that instant still merge in order; a row older than
+    that instant, which sequential runs do not produce, falls back to a full
+    rewrite.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], sort_key: Callable[[Dict[str, Any]], Tuple[Any, ...]]) -> None:
+        self.path = path
+        self.fieldnames = fieldnames
+        self.sort_key = sort_key
+        self._fh: Optional[Any] = None
+        self._writer: Optional[csv.DictWriter] = None
+        self._tail: List[Dict[str, Any]] = []
+        self._tail_pos: int = 0
+        self._tail_t: Optional[float] = None
+
+    def _open(self) -> None:
+        _ensure_dir(self.path)
+        self._fh = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._fh, fieldnames=self.fieldnames, quoting=csv.QUOTE_MINIMAL)
+        self._writer.writeheader()
+        self._tail, self._tail_pos, self._tail_t = [], self._fh.tell(), None
+
+    def _write_sorted(self, pool: List[Dict[str, Any]]) -> None:
+        assert self._fh is not None and self._writer is not None
+        self._fh.seek(self._tail_pos)
+        self._fh.truncate()
+        if not pool:
+            self._tail, self._tail_t = [], None
+            return
+        t_last = float(pool[-1].get("triggered_us", 0.0))
+        split = len(pool)
+        while split > 0 and float(pool[split - 1].get("triggered_us", 0.0)) == t_last:
+            split -= 1
+        self._writer.writerows(pool[:split])
+        self._tail_pos = self._fh.tell()
+        self._writer.writerows(pool[split:])
+        self._tail, self._tail_t = pool[split:], t_last
+
+    def append(self, rows: Iterable[Dict[str, Any]]) -> str:
+        new_rows = list(rows)
+        if self._fh is None:
+            self._open()
+        if self._tail_t is not None and any(float(r.get("triggered_us", 0.0)) < self._tail_t for r in new_rows):
+            self.close()
+            with open(self.path, "r", newline="", encoding="utf-8") as f:
+                written = list(csv.DictReader(f))
+            self._open()
+            self._write_sorted(sorted(written + new_rows, key=self.sort_key))
+        else:
+            self._write_sorted(sorted(self._tail + new_rows, key=self.sort_key))
+        assert self._fh is not None
+        self._fh.flush()
+        return self.path
+
+    def mark(self, rel_to: str) -> Dict[str, Any]:
+        """Checkpoint extent: the file (relative to rel_to), its settled byte prefix and the open tail rows.
+
+        Bytes past the prefix are rewritten whenever the next append lands at
+        the tail instant, so the (few) tail rows are recorded instead.
+        """
+        settled = self._tail_pos if self._fh is not None else 0
+        return {
+            "file": os.path.relpath(self.path, rel_to),
+            "size": settled,
+            "tail": [dict(r) for r in self._tail],
+            "tail_t": self._tail_t,
+        }
+
+    def resume(self, mark: Dict[str, Any], src: str) -> None:
+        """Continue from a mark() of src: keep its settled prefix, drop anything after and rewrite the tail.
+
+        src may be this writer's own file (truncated in place) or the file of
+        another output directory (its prefix is copied).
+        """
+        self.close()
+        size = int(mark.get("size", 0) or 0)
+        if size <= 0:
+            return
+        if not os.path.exists(src) or os.path.getsize(src) < size:
+            raise ValueError(f"{src} is shorter than the checkpointed {size} bytes")
+        _ensure_dir(self.path)
+        if not (os.path.exists(self.path) and os.path.samefile(src, self.path)):
+            with open(src, "rb") as fin, open(self.path, "wb") as fout:
+                fout.write(fin.read(size))
+        self._fh = open(self.path, "r+", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._fh, fieldnames=self.fieldnames, quoting=csv.QUOTE_MINIMAL)
+        self._tail_pos = size
+        tail_t = mark.get("tail_t")
+        self._tail, self._tail_t = list(mark.get("tail") or []), (None if tail_t is None else float(tail_t))
+        self._fh.seek(size)
+        self._fh.truncate()
+        self._writer.writerows(self._tail)
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._writer = None
+
+
+class _CumulativeTable:
+    """Columnar counterpart of _CumulativeCsv (parquet/npz), with the same settled-prefix/tail split.
+
+    Rows before the latest triggered_us are written once as a new Parquet
+    row group or npz part file (tableio.TableAppender); only the rows at that
+    instant are held back, since the next run's rows may still sort among
+    them. They are flushed by close(). A row older than the held-back instant
+    falls back to a full rewrite.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], sort_key: Callable[[Dict[str, Any]], Tuple[Any, ...]], fmt: str) -> None:
+        self.path = path
+        self.fieldnames = fieldnames
+        self.sort_key = sort_key
+        self.fmt = fmt
+        self._out = _tableio.TableAppender(path, fieldnames, fmt)
+        self._tail: List[Dict[str, Any]] = []
+        self._tail_t: Optional[float] = None
+
+    def _write_sorted(self, pool: List[Dict[str, Any]]) -> None:
+        if not pool:
+            self._tail, self._tail_t = [], None
+            return
+        t_last = float(pool[-1].get("triggered_us", 0.0))
+        split = len(pool)
+        while split > 0 and float(pool[split - 1].get("triggered_us", 0.0)) == t_last:
+            split -= 1
+        self._out.append(pool[:split])
+        self._tail, self._tail_t = pool[split:], t_last
+
+    def append(self, rows: Iterable[Dict[str, Any]]) -> str:
+        new_rows = list(rows)
+        if self._tail_t is not None and any(float(r.get("triggered_us", 0.0)) < self._tail_t for r in new_rows):
+            written: List[Dict[str, Any]] = []
+            if self._out.parts:
+                self._out.close()
+                written = _tableio.read_rows(self.path)
+            self._out = _tableio.TableAppender(self.path, self.fieldnames, self.fmt)
+            self._write_sorted(sorted(written + self._tail + new_rows, key=self.sort_key))
+        else:
+            self._write_sorted(sorted(self._tail + new_rows, key=self.sort_key))
+        return self.path
+
+    def mark(self, rel_to: str) -> Dict[str, Any]:
+        """Checkpoint extent: the file (relative to rel_to), its row groups/parts, their column kinds and the tail rows."""
+        return {
+            "file": os.path.relpath(self.path, rel_to),
+            "parts": self._out.parts,
+            "rows": self._out.rows,
+            "kinds": self._out.kinds,
+            "tail": [dict(r) for r in self._tail],
+            "tail_t": self._tail_t,
+        }
+
+    def resume(self, mark: Dict[str, Any], src: str) -> None:
+        """Continue from a mark() of src: keep its first row groups/parts, drop later ones and hold the tail again."""
+        self._out = _tableio.TableAppender(self.path, self.fieldnames, self.fmt)
+        self._out.resume(src, int(mark.get("parts", 0) or 0), int(mark.get("rows", 0) or 0), mark.get("kinds"))
+        tail_t = mark.get("tail_t")
+        self._tail, self._tail_t = list(mark.get("tail") or []), (None if tail_t is None else float(tail_t))
+
+    def close(self) -> None:
+        self._out.append(self._tail)
+        self._tail, self._tail_t = [], None
+        self._out.close()
+
+
+def _op_event_resume_writer(out_dir: str, fmt: str = "csv") -> Any:
+    path = os.path.join(out_dir, "op_event_resume" + _tableio.table_suffix(fmt))
+    if fmt == "csv":
+        return _CumulativeCsv(path, OP_EVENT_RESUME_FIELDS, _op_event_sort_key)
+    return _CumulativeTable(path, OP_EVENT_RESUME_FIELDS, _op_event_sort_key, fmt)
+
+
+def _apply_pgm_log_writer(out_dir: str) -> _CumulativeCsv:
+    return _CumulativeCsv(os.path.join(out_dir, "apply_pgm_log.csv"), APPLY_PGM_LOG_FIELDS, _apply_pgm_sort_key)
 
 
 def _is_program_family(base: str) -> bool:
@@ -315,7 +518,7 @@ def _is_effective_target_base(base: str) -> bool:
     return (b == "ERASE") or _is_program_family(b)
 
 
-def _build_timeline_index(timeline: List[List[Any]]) -> Dict[Tuple[int, int], List[Tuple[str, str, float, float]]]:
+def _build_timeline_index(timeline: Iterable[Any]) -> Dict[Tuple[int, int], List[Tuple[str, str, float, float]]]:
     idx: Dict[Tuple[int, int], List[Tuple[str, str, float, float]]] = {}
     for ent in timeline:
         try:
@@ -365,9 +568,7 @@ def _effective_windows_for_row(row: Dict[str, Any], tl_idx: Dict[Tuple[int, int]
 
 
 def _build_effective_rows(rows: List[Dict[str, Any]], rm: ResourceManager) -> List[Dict[str, Any]]:
-    snap = rm.snapshot()
-    tl = snap.get("timeline", []) or []
-    tl_idx = _build_timeline_index(tl)
+    tl_idx = _build_timeline_index(rm.timeline_segments())
     # next uid starts after max seen
     try:
         next_uid = max(int(r.get("op_uid", 0)) for r in rows) + 1
@@ -397,7 +598,22 @@ def _build_effective_rows(rows: List[Dict[str, Any]], rm: ResourceManager) -> Li
     return eff
 
 
-def export_operation_timeline(rows: List[Dict[str, Any]], rm: ResourceManager, *, out_dir: str, run_idx: int) -> str:
+def _virtual_phase_ctx(rows: List[Dict[str, Any]]) -> Tuple[List[int], List[int], List[float]]:
+    """Per-row (die, plane, time) for phase_key_virtual: proposal-time context with row fallbacks."""
+    dies: List[int] = []
+    planes: List[int] = []
+    times: List[float] = []
+    for r in rows:
+        d_ctx = r.get("phase_hook_die")
+        p_ctx = r.get("phase_hook_plane")
+        t_ctx = r.get("phase_key_time")
+        dies.append(int(d_ctx) if d_ctx not in (None, "None") else int(r["die"]))
+        planes.append(int(p_ctx) if p_ctx not in (None, "None") else int(r["plane"]))
+        times.append(float(t_ctx) if t_ctx not in (None, "None") else float(r["start_us"]))
+    return dies, planes, times
+
+
+def export_operation_timeline(rows: List[Dict[str, Any]], rm: ResourceManager, *, out_dir: str, run_idx: int, fmt: str = "csv") -> str:
     # PRD 3.3 fields: start,end,die,plane,block,page,op_name,op_base,source,op_uid,op_state
     # Extended: phase_key_used, phase_key_virtual (proposal-time used and virtual keys)
     # Option C: when enabled, build an effective row-set for ERASE/PROGRAM families using state timeline cuts
@@ -407,34 +623,49 @@ def export_operation_timeline(rows: List[Dict[str, Any]], rm: ResourceManager, *
     except Exception:
         effective = False
     rows_used = _build_effective_rows(rows, rm) if effective else rows
-    out_rows: List[Dict[str, Any]] = []
-    for r in rows_used:
-        die = int(r["die"])  # type: ignore[index]
-        plane = int(r["plane"])  # type: ignore[index]
-        start = float(r["start_us"])  # type: ignore[index]
-        # Derive op_state at operation start (state key for this (die,plane) at start time)
-        # Prefer RM virtual key to get consistent boundary handling (END on exact boundary)
-        state_at_start = rm.phase_key_at(die, plane, start)
-        if not state_at_start or str(state_at_start).strip() == "":
-            state_at_start = "DEFAULT"
-        # Used: prefer the exact phase_key used by proposer; fallback to start-time state
-        used_fk = r.get("phase_key")
-        if used_fk is None or str(used_fk).strip() == "":
-            phase_key_used = str(state_at_start)
-        else:
-            phase_key_used = str(used_fk)
-        # Virtual: derive proposal-time virtual key using preserved context when available
-        d_ctx = r.get("phase_hook_die")
-        p_ctx = r.get("phase_hook_plane")
-        t_ctx = r.get("phase_key_time")
-        vd = int(d_ctx) if d_ctx not in (None, "None") else die
-        vp = int(p_ctx) if p_ctx not in (None, "None") else plane
-        vt = float(t_ctx) if t_ctx not in (None, "None") else start
-        phase_key_virtual = rm.phase_key_at(int(vd), int(vp), float(vt))
-        if not phase_key_virtual or str(phase_key_virtual).strip() == "":
-            phase_key_virtual = "DEFAULT"
-        out_rows.append(
-            {
+
+    # Sort primarily by op_uid for consumer friendliness; sort row indices and
+    # stream the formatted rows instead of materializing them
+    order = sorted(
+        range(len(rows_used)),
+        key=lambda i: (
+            int(rows_used[i]["op_uid"]),
+            float(rows_used[i]["start_us"]),
+            int(rows_used[i]["die"]),
+            int(rows_used[i]["plane"]),
+            int(rows_used[i]["block"]),
+        ),
+    )
+
+    # Phase keys for all rows in two batched RM lookups (start-time and proposal-time)
+    start_keys = rm.phase_keys_at(
+        [int(r["die"]) for r in rows_used],
+        [int(r["plane"]) for r in rows_used],
+        [float(r["start_us"]) for r in rows_used],
+    )
+    virt_keys = rm.phase_keys_at(*_virtual_phase_ctx(rows_used))
+
+    def _out_rows() -> Iterator[Dict[str, Any]]:
+        for i in order:
+            r = rows_used[i]
+            die = int(r["die"])  # type: ignore[index]
+            plane = int(r["plane"])  # type: ignore[index]
+            # Derive op_state at operation start (state key for this (die,plane) at start time)
+            # Prefer RM virtual key to get consistent boundary handling (END on exact boundary)
+            state_at_start = start_keys[i]
+            if not state_at_start or str(state_at_start).strip() == "":
+                state_at_start = "DEFAULT"
+            # Used: prefer the exact phase_key used by proposer; fallback to start-time state
+            used_fk = r.get("phase_key")
+            if used_fk is None or str(used_fk).strip() == "":
+                phase_key_used = str(state_at_start)
+            else:
+                phase_key_used = str(used_fk)
+            # Virtual: derive proposal-time virtual key using preserved context when available
+            phase_key_virtual = virt_keys[i]
+            if not phase_key_virtual or str(phase_key_virtual).strip() == "":
+                phase_key_virtual = "DEFAULT"
+            yield {
                 "start": float(r["start_us"]),
                 "end": float(r["end_us"]),
                 "die": die,
@@ -449,22 +680,26 @@ def export_operation_timeline(rows: List[Dict[str, Any]], rm: ResourceManager, *
                 "phase_key_used": str(phase_key_used),
                 "phase_key_virtual": str(phase_key_virtual),
             }
-        )
-    # Sort primarily by op_uid for consumer friendliness
-    out_rows.sort(key=lambda x: (int(x.get("op_uid", 0)), x["start"], x["die"], x["plane"], x["block"]))
-    fname = f"operation_timeline_{_date_stamp()}_{_run_id_str(run_idx+1)}.csv"
+
+    fname = f"operation_timeline_{_date_stamp()}_{_run_id_str(run_idx+1)}{_tableio.table_suffix(fmt)}"
     path = os.path.join(out_dir, fname)
-    _csv_write(path, out_rows, [
+    _table_write(path, _out_rows(), [
         "start", "end", "die", "plane", "block", "page", "op_name", "op_base", "source", "op_uid", "op_state",
         "phase_key_used", "phase_key_virtual",
-    ])
+    ], fmt)
     return path
 
 
-def export_op_state_timeline(rm: ResourceManager, rows: Optional[List[Dict[str, Any]]] = None, *, out_dir: str, run_idx: int) -> str:
-    # From RM snapshot timeline: (die, plane, op_base, state, start_us, end_us)
-    snap = rm.snapshot()
-    segs = snap.get("timeline", []) or []
+def export_op_state_timeline(
+    rm: ResourceManager,
+    rows: Optional[List[Dict[str, Any]]] = None,
+    *,
+    out_dir: str,
+    run_idx: int,
+    fmt: str = "csv",
+) -> str:
+    # From RM state timeline: one start-ordered stream of (die, plane, op_base, state, start_us, end_us) per plane
+    streams: List[Iterable[Tuple[Any, ...]]] = [it for _key, it in sorted(rm.timeline_plane_streams(), key=lambda kv: kv[0])]
     # Optional per-run scoping: when enabled, restrict to segments overlapping this run's time window
     try:
         feats = (rm.cfg.get("features", {}) or {})  # type: ignore[attr-defined]
@@ -476,25 +711,13 @@ def export_op_state_timeline(rm: ResourceManager, rows: Optional[List[Dict[str,
             tmin = min(float(r["start_us"]) for r in rows)
             tmax = max(float(r["end_us"]) for r in rows)
             tol = float(SIM_RES_US)
-            segs = [s for s in segs if not (float(s[5]) <= (tmin - tol) or (tmax + tol) <= float(s[4]))]
+            streams = [
+                (s for s in it if not (float(s[5]) <= (tmin - tol) or (tmax + tol) <= float(s[4])))
+                for it in streams
+            ]
         except Exception:
             pass
-    out_rows: List[Dict[str, Any]] = []
-    for (die, plane, base, state, s0, s1) in segs:
-        dur = float(s1) - float(s0)
-        out_rows.append(
-            {
-                "start": float(s0),
-                "end": float(s1),
-                "die": int(die),
-                "plane": int(plane),
-                "op_state": f"{str(base)}.{str(state)}",
-                "lane": f"d{int(die)}-p{int(plane)}",
-                "op_name": str(base),
-                "duration": dur,
-            }
-        )
-    # If operation rows are provided, derive a stable op_uid per segment for sorting
+    # If operation rows are provided, derive a stable op_uid per segment for ordering
     if rows is not None:
         idx: Dict[Tuple[int, int, str], List[Tuple[float, float, int]]] = {}
         idx_die_base: Dict[Tuple[int, str], List[Tuple[float, float, int]]] = {}
@@ -512,11 +735,11 @@ def export_op_state_timeline(rm: ResourceManager, rows: Optional[List[Dict[str,
         for k in idx_die_base:
             idx_die_base[k].sort(key=lambda t: (t[0], t[1]))
 
-        def _uid_for(seg: Dict[str, Any]) -> int:
-            die = int(seg["die"])
-            plane = int(seg["plane"])
-            base = str(seg.get("op_name", ""))  # op_name here is base per exporter
-            s0 = float(seg["start"]) 
+        def _uid_for(seg: Tuple[Any, ...]) -> int:
+            die = int(seg[0])
+            plane = int(seg[1])
+            base = str(seg[2])
+            s0 = float(seg[4])
             cand = idx.get((die, plane, base))
             if not cand:
                 cand = idx_die_base.get((die, base))
@@ -538,25 +761,47 @@ def export_op_state_timeline(rm: ResourceManager, rows: Optional[List[Dict[str,
                     return uid
             # fallback: first overlapping
             for (st, en, uid) in cand:
-                if st < seg["end"] and s0 < en:
+                if st < float(seg[5]) and s0 < en:
                     return uid
             return 0
 
-        out_rows.sort(
-            key=lambda x: (
-                float(x["start"]),
-                int(x["die"]),
-                int(x["plane"]),
-                _uid_for(x),
-            )
+        def _keyed(it: Iterable[Tuple[Any, ...]]) -> Iterator[Tuple[Tuple[Any, ...], Tuple[Any, ...]]]:
+            # A plane is start-ordered; only segments sharing a start need reordering by op_uid
+            tie: List[Tuple[Tuple[Any, ...], Tuple[Any, ...]]] = []
+            for seg in it:
+                key = (float(seg[4]), int(seg[0]), int(seg[1]), _uid_for(seg))
+                if tie and key[0] != tie[0][0][0]:
+                    yield from sorted(tie, key=lambda x: x[0][3]) if len(tie) > 1 else tie
+                    tie = []
+                tie.append((key, seg))
+            yield from sorted(tie, key=lambda x: x[0][3]) if len(tie) > 1 else tie
+
+        # (start, die, plane, op_uid) order: k-way merge of the per-plane streams
+        ordered: Iterable[Tuple[Any, ...]] = (
+            seg for _key, seg in heapq.merge(*(_keyed(it) for it in streams), key=lambda x: x[0])
         )
     else:
-        out_rows.sort(key=lambda x: (x["die"], x["plane"], x["start"]))
-    fname = f"op_state_timeline_{_date_stamp()}_{_run_id_str(run_idx+1)}.csv"
+        # (die, plane, start) order: planes back to back
+        ordered = itertools.chain.from_iterable(streams)
+
+    def _out_rows() -> Iterator[Dict[str, Any]]:
+        for (die, plane, base, state, s0, s1) in ordered:
+            yield {
+                "start": float(s0),
+                "end": float(s1),
+                "die": int(die),
+                "plane": int(plane),
+                "op_state": f"{str(base)}.{str(state)}",
+                "lane": f"d{int(die)}-p{int(plane)}",
+                "op_name": str(base),
+                "duration": float(s1) - float(s0),
+            }
+
+    fname = f"op_state_timeline_{_date_stamp()}_{_run_id_str(run_idx+1)}{_tableio.table_suffix(fmt)}"
     path = os.path.join(out_dir, fname)
-    _csv_write(path, out_rows, [
+    _table_write(path, _out_rows(), [
         "start", "end", "die", "plane", "op_state", "lane", "op_name", "duration",
-    ])
+    ], fmt)
     return path
 
 
@@ -597,7 +842,7 @@ def export_address_touch_count(rows: List[Dict[str, Any]], cfg: Dict[str, Any],
         cell_s = str(cell) if cell not in (None, "None") else "NONE"
         key = (cbase, cell_s, int(r["die"]), int(r["block"]), int(r["page"]))
         counts[key] = counts.get(key, 0) + 1
-    out_rows = [
+    out_rows = (
         {
             "op_base": k[0],
             "cell_type": k[1],
@@ -607,7 +852,7 @@ def export_address_touch_count(rows: List[Dict[str, Any]], cfg: Dict[str, Any],
             "count": v,
         }
         for k, v in sorted(counts.items(), key=lambda kv: (kv[0][2], kv[0][3], kv[0][4], kv[0][0], kv[0][1]))
-    ]
+    )
     fname = f"address_touch_count_{_date_stamp()}_{_run_id_str(run_idx+1)}.csv"
     path = os.path.join(out_dir, fname)
     _csv_write(path, out_rows, ["op_base", "cell_type", "die", "block", "page", "count"])
@@ -619,11 +864,9 @@ def export_op_state_name_input_time_count(rows: List[Dict[str, Any]], rm: Resour
     # Extended: phase_key_used, phase_key_virtual (used in grouping for consistency)
     # input_time = (t - state_start) / (state_end - state_start) in [0,1]
     # Build an index for quick lookup of state segment covering t
-    snap = rm.snapshot()
-    segs = snap.get("timeline", []) or []
     # Index by (die, plane)
     idx: Dict[Tuple[int, int], List[Tuple[float, float, str, str]]] = {}
-    for (die, plane, base, state, s0, s1) in segs:
+    for (die, plane, base, state, s0, s1) in rm.timeline_segments():
         idx.setdefault((int(die), int(plane)), []).append((float(s0), float(s1), str(base), str(state)))
     for k in idx.keys():
         idx[k].sort(key=lambda x: x[0])
@@ -651,7 +894,8 @@ def export_op_state_name_input_time_count(rows: List[Dict[str, Any]], rm: Resour
 
     # Grouping key: (phase_key_used, phase_key_virtual, op_name, input_time)
     cnt: Dict[Tuple[str, str, str, float], int] = {}
-    for r in rows:
+    virt_keys = rm.phase_keys_at(*_virtual_phase_ctx(rows))
+    for i, r in enumerate(rows):
         d = int(r["die"])  # type: ignore[index]
         p = int(r["plane"])  # type: ignore[index]
         t = float(r["start_us"])  # type: ignore[index]
@@ -667,18 +911,12 @@ def export_op_state_name_input_time_count(rows: List[Dict[str, Any]], rm: Resour
             used = f"{base}.{state}"
         else:
             used = str(used_fk)
-        # phase_key_virtual: derive via RM.phase_key_at using proposal-time context when available
-        d_ctx = r.get("phase_hook_die")
-        p_ctx = r.get("phase_hook_plane")
-        t_ctx = r.get("phase_key_time")
-        vd = int(d_ctx) if d_ctx not in (None, "None") else d
-        vp = int(p_ctx) if p_ctx not in (None, "None") else p
-        vt = float(t_ctx) if t_ctx not in (None, "None") else t
-        virt = rm.phase_key_at(int(vd), int(vp), float(vt))
+        # phase_key_virtual: RM.phase_key_at at the proposal-time context (batched above)
+        virt = str(virt_keys[i])
         key = (used, virt, str(r["op_name"]), it)
         cnt[key] = cnt.get(key, 0) + 1
 
-    out_rows = [
+    out_rows = (
         {
             "op_state": k[0],  # preserve legacy column (equals phase_key_used)
             "phase_key_used": k[0],
@@ -688,7 +926,7 @@ def export_op_state_name_input_time_count(rows: List[Dict[str, Any]], rm: Resour
             "count": v,
         }
         for k, v in sorted(cnt.items(), key=lambda kv: (kv[0][2], kv[0][0], kv[0][1], kv[0][3]))
-    ]
+    )
     fname = f"op_state_name_input_time_count_{_date_stamp()}_{_run_id_str(run_idx+1)}.csv"
     path = os.path.join(out_dir, fname)
     _csv_write(path, out_rows, ["op_state", "phase_key_used", "phase_key_virtual", "op_name", "input_time", "count"])
@@ -788,122 +1026,116 @@ def export_operation_sequence(rows: List[Dict[str, Any]], cfg: Dict[str, Any], r
     topo = cfg.get("topology", {}) or {}
     num_planes = int(topo.get("planes", 1))
 
-    def _die_status(die: int, t: float) -> str:
-        busy = False
-        has_io = False
-        for p in range(num_planes):
-            try:
-                st = rm.op_state(int(die), int(p), float(t))
-            except Exception:
-                st = None
-            if not st:
-                continue
-            try:
-                _, state = str(st).split(".", 1)
-            except ValueError:
-                state = str(st)
-            if state == "CORE_BUSY":
-                busy = True
-                break
-            if state in ("DATA_OUT", "DATA_IN"):
-                has_io = True
-        if busy:
-            return "busy"
-        return "extrdy" if has_io else "ready"
-
     _PLANE_PREF_NAMES = {"Read_Status_Enhanced_72h", "Read_Status_Enhanced_7Ch"}
     _READ_BASES = {"PLANE_READ", "PLANE_READ4K", "PLANE_CACHE_READ"}
 
-    def _expected_value_for_sr(op_name: str, die: int, plane: int, t: float) -> str:
-        if str(op_name) in _PLANE_PREF_NAMES:
+    def _sr_expected_values() -> Dict[int, str]:
+        """exp_val for every SR/SR_ADD row (keyed by id(row)), evaluated in batch.
+
+        Die status is busy/extrdy/ready over all planes; the plane-preferring
+        status reads report busy while their own plane is in a read CORE_BUSY.
+        """
+        sr_rows = [r for r in rows if str(r.get("op_base")) in ("SR", "SR_ADD")]
+        if rm is None or not sr_rows:
+            return {}
+        dies: List[int] = []
+        planes: List[int] = []
+        times: List[float] = []
+        for r in sr_rows:
             try:
-                st = rm.op_state(int(die), int(plane), float(t))
+                t_ctx = r.get("phase_key_time")
+                t_eval = float(t_ctx) if t_ctx not in (None, "None") else float(r["start_us"])  # type: ignore[index]
+                t_eval = quantize(t_eval)
             except Exception:
-                st = None
-            if st:
+                t_eval = quantize(float(r.get("start_us", 0.0)))
+            dies.append(int(r["die"]))
+            planes.append(int(r["plane"]))
+            times.append(float(t_eval))
+        status = rm.die_status_at(dies, times, planes=num_planes)
+        plane_states = rm.op_states_at(dies, planes, times)
+        out: Dict[int, str] = {}
+        for k, r in enumerate(sr_rows):
+            ev = str(status[k])
+            st = plane_states[k]
+            if str(by_uid[int(r["op_uid"])][0]["op_name"]) in _PLANE_PREF_NAMES and st:
                 try:
                     base, state = str(st).split(".", 1)
                 except ValueError:
                     base, state = str(st), ""
                 if state == "CORE_BUSY" and base in _READ_BASES:
-                    return "busy"
-        return _die_status(int(die), float(t))
+                    ev = "busy"
+            out[id(r)] = ev
+        return out
 
-    out: List[Dict[str, Any]] = []
     pef = (cfg.get("payload_by_op_base", {}) or {})
     opcode_map: Dict[str, int] = (cfg.get("pattern_export", {}) or {}).get("opcode_map", {}) or {}
     tscale = float(((cfg.get("pattern_export", {}) or {}).get("time", {}) or {}).get("scale", 1.0))
     rdec = int(((cfg.get("pattern_export", {}) or {}).get("time", {}) or {}).get("round_decimals", 3))
 
-    for uid, grp in sorted(by_uid.items(), key=lambda kv: (min(float(r["start_us"]) for r in kv[1]), kv[0])):
-        t0 = min(float(r["start_us"]) for r in grp)
-        name = str(grp[0]["op_name"]) if grp else "NOP"
-        base = str(grp[0]["op_base"]) if grp else "NOP"
-        # Determine payload fields for base (use 'plane' not 'pl')
-        fields = [str(x) for x in pef.get(base, ["die", "plane", "block", "page"])]
-        needs_cell = ("celltype" in fields)
-        # Determine default celltype from current op_name spec
-        def_cell = None
-        try:
-            def_cell = ((cfg.get("op_names", {}) or {}).get(name, {}) or {}).get("celltype")
-        except Exception:
+    def _out_rows() -> Iterator[Dict[str, Any]]:
+        sr_vals = _sr_expected_values()
+        seq = 0
+        for uid, grp in sorted(by_uid.items(), key=lambda kv: (min(float(r["start_us"]) for r in kv[1]), kv[0])):
+            t0 = min(float(r["start_us"]) for r in grp)
+            name = str(grp[0]["op_name"]) if grp else "NOP"
+            base = str(grp[0]["op_base"]) if grp else "NOP"
+            # Determine payload fields for base (use 'plane' not 'pl')
+            fields = [str(x) for x in pef.get(base, ["die", "plane", "block", "page"])]
+            needs_cell = ("celltype" in fields)
+            # Determine default celltype from current op_name spec
             def_cell = None
-        # Compose targets sorted by plane, block, page
-        grp2 = sorted(grp, key=lambda r: (int(r["plane"]), int(r["block"]), int(r["page"])) )
-        payload_list: List[Dict[str, Any]] = []
-        for r in grp2:
-            item = {"die": int(r["die"]), "plane": int(r["plane"]), "block": int(r["block"]), "page": int(r["page"]) }
-            cell_val = def_cell
-            if needs_cell:
-                # 1) Prefer proposer-propagated hint when present
-                try:
-                    hint = r.get("celltype_hint")
-                    if hint not in (None, "None", "NONE"):
-                        cell_val = str(hint)
-                except Exception:
-                    pass
-                # 2) If no hint and no explicit cell on op_name, try backref to nearest eligible previous op
-                if cell_val in (None, "None", "NONE"):
-                    prev = _prev_with_inherit(int(r["die"]), int(r["plane"]), float(r["start_us"]), base)
-                    if prev is not None:
-                        prev_base, prev_name = prev
-                        inh_map = _inherit_map_for(prev_base)
-                        conds = inh_map.get(base) or []
-                        if any(str(x) == "same_celltype" for x in conds):
-                            try:
-                                cell_val = ((cfg.get("op_names", {}) or {}).get(prev_name, {}) or {}).get("celltype")
-                            except Exception:
-                                pass
-            if needs_cell:
-                item["celltype"] = (None if cell_val in (None, "None") else str(cell_val))
-            # Inject exp_val for SR/SR_ADD per PRD §3.1 (only when RM is provided)
-            if (rm is not None) and (str(base) in ("SR", "SR_ADD")):
-                try:
-                    t_ctx = r.get("phase_key_time")
-                    t_eval = float(t_ctx) if t_ctx not in (None, "None") else float(r["start_us"])  # type: ignore[index]
-                    t_eval = quantize(t_eval)
-                except Exception:
-                    t_eval = quantize(float(r.get("start_us", 0.0)))
-                ev = _expected_value_for_sr(name, int(r["die"]), int(r["plane"]), float(t_eval))
-                item["exp_val"] = ev
-            # filter by requested fields order (no extra fields)
-            ordered = {k: item.get(k) for k in fields if k in item}
-            payload_list.append(ordered)
-        payload_json = json.dumps(payload_list, ensure_ascii=False, separators=(",", ":"))
-        out.append(
-            {
-                "seq": len(out) + 1,
+            try:
+                def_cell = ((cfg.get("op_names", {}) or {}).get(name, {}) or {}).get("celltype")
+            except Exception:
+                def_cell = None
+            # Compose targets sorted by plane, block, page
+            grp2 = sorted(grp, key=lambda r: (int(r["plane"]), int(r["block"]), int(r["page"])) )
+            payload_list: List[Dict[str, Any]] = []
+            for r in grp2:
+                item = {"die": int(r["die"]), "plane": int(r["plane"]), "block": int(r["block"]), "page": int(r["page"]) }
+                cell_val = def_cell
+                if needs_cell:
+                    # 1) Prefer proposer-propagated hint when present
+                    try:
+                        hint = r.get("celltype_hint")
+                        if hint not in (None, "None", "NONE"):
+                            cell_val = str(hint)
+                    except Exception:
+                        pass
+                    # 2) If no hint and no explicit cell on op_name, try backref to nearest eligible previous op
+                    if cell_val in (None, "None", "NONE"):
+                        prev = _prev_with_inherit(int(r["die"]), int(r["plane"]), float(r["start_us"]), base)
+                        if prev is not None:
+                            prev_base, prev_name = prev
+                            inh_map = _inherit_map_for(prev_base)
+                            conds = inh_map.get(base) or []
+                            if any(str(x) == "same_celltype" for x in conds):
+                                try:
+                                    cell_val = ((cfg.get("op_names", {}) or {}).get(prev_name, {}) or {}).get("celltype")
+                                except Exception:
+                                    pass
+                if needs_cell:
+                    item["celltype"] = (None if cell_val in (None, "None") else str(cell_val))
+                # Inject exp_val for SR/SR_ADD per PRD §3.1 (only when RM is provided)
+                if (rm is not None) and (str(base) in ("SR", "SR_ADD")):
+                    item["exp_val"] = sr_vals[id(r)]
+                # filter by requested fields order (no extra fields)
+                ordered = {k: item.get(k) for k in fields if k in item}
+                payload_list.append(ordered)
+            payload_json = json.dumps(payload_list, ensure_ascii=False, separators=(",", ":"))
+            seq += 1
+            yield {
+                "seq": seq,
                 "time": round(t0 * tscale, rdec),
                 "op_id": int(opcode_map.get(name, 0)),
                 "op_name": name,
                 "op_uid": uid,
                 "payload": payload_json,
             }
-        )
 
     fname = f"operation_sequence_{_date_stamp()}_{_run_id_str(run_idx+1)}.csv"
     path = os.path.join(out_dir, fname)
-    _csv_write(path, out, ["seq", "time", "op_id", "op_name", "op_uid", "payload"])
+    _csv_write(path, _out_rows(), ["seq", "time", "op_id", "op_name", "op_uid", "payload"])
     return path
 
 
@@ -920,8 +1152,8 @@ def export_phase_proposal_counts(rows: List[Dict[str, Any]], rm: ResourceManager
 
     agg: Dict[_T[str, str, int, int, str], Dict[str, Any]] = {}
 
+    ctx: List[Tuple[int, int, float]] = []
     for r in rows:
-        used = str(r.get("phase_key") or "DEFAULT")
         # proposal-time context
         d = r.get("phase_hook_die")
         p = r.get("phase_hook_plane")
@@ -936,8 +1168,11 @@ def export_phase_proposal_counts(rows: List[Dict[str, Any]], rm: ResourceManager
             t = float(r["start_us"])  # type: ignore[index]
         else:
             t = float(t)
-        t = quantize(t)
-        virt = rm.phase_key_at(int(d), int(p), float(t))
+        ctx.append((d, p, quantize(t)))
+    virt_keys = rm.phase_keys_at([c[0] for c in ctx], [c[1] for c in ctx], [c[2] for c in ctx])
+
+    for r, (d, p, t), virt in zip(rows, ctx, virt_keys):
+        used = str(r.get("phase_key") or "DEFAULT")
         key = (str(used), str(virt), int(d), int(p), str(r["op_name"]))
         cur = agg.get(key)
         if cur is None:
@@ -947,19 +1182,18 @@ def export_phase_proposal_counts(rows: List[Dict[str, Any]], rm: ResourceManager
             # keep earliest proposal time as representative
             cur["propose_time"] = min(float(cur.get("propose_time", float(t))), float(t))
 
-    out_rows: List[Dict[str, Any]] = []
-    for (used, virt, d, p, name), info in sorted(agg.items(), key=lambda kv: (kv[0][2], kv[0][3], kv[0][4], kv[0][0], kv[0][1])):
-        out_rows.append(
-            {
-                "phase_key_used": used,
-                "phase_key_virtual": virt,
-                "die": int(d),
-                "plane": int(p),
-                "propose_time": float(info.get("propose_time", 0.0)),
-                "op_name": name,
-                "count": int(info.get("count", 0)),
-            }
-        )
+    out_rows = (
+        {
+            "phase_key_used": used,
+            "phase_key_virtual": virt,
+            "die": int(d),
+            "plane": int(p),
+            "propose_time": float(info.get("propose_time", 0.0)),
+            "op_name": name,
+            "count": int(info.get("count", 0)),
+        }
+        for (used, virt, d, p, name), info in sorted(agg.items(), key=lambda kv: (kv[0][2], kv[0][3], kv[0][4], kv[0][0], kv[0][1]))
+    )
 
     fname = f"phase_proposal_counts_{_date_stamp()}_{_run_id_str(run_idx+1)}.csv"
     path = os.path.join(out_dir, fname)
@@ -1149,13 +1383,55 @@ def _apply_overrides(
     return c
 
 
-def run_once(cfg: Dict[str, Any], rm: ResourceManager, am: Any, *, run_until_us: float, rng_seed: Optional[int]) -> Tuple[InstrumentedScheduler, Dict[str, Any]]:
+def _configure_timeline_archive(rm: ResourceManager, cfg: Dict[str, Any], out_dir: str) -> None:
+    # Opt-in: let RM.compact() spill retired state-timeline segments to disk during runs
+    feats = (cfg.get("features", {}) or {})
+    if not bool(feats.get("state_timeline_archive", False)):
+        return
+    os.makedirs(out_dir, exist_ok=True)
+    rm.set_timeline_archive(os.path.join(out_dir, "state_timeline_archive.csv"))
+
+
+def _maybe_precondition(
+    cfg: Dict[str, Any], am: Any, *, seed: Optional[int], badlist: Any, out_dir: str
+) -> bool:
+    """Opt-in (bootstrap.mode: precondition): synthesize the post-bootstrap AM state instead of simulating it.
+
+    Returns True when the simulated bootstrap run should be skipped.
+    """
+    b = (cfg.get("bootstrap", {}) or {})
+    if str(b.get("mode", "simulate")).lower() != "precondition" or not hasattr(am, "snapshot"):
+        return False
+    from bootstrap import precondition_addrman
+
+    cache_dir = b.get("cache_dir")
+    if cache_dir is None:
+        cache_dir = os.path.join(out_dir, "bootstrap_cache")
+    info = precondition_addrman(cfg, am, seed=seed, badlist=badlist, cache_dir=(str(cache_dir) or None))
+    print(
+        f"  bootstrap precondition: erased={info.get('erased')} programmed={info.get('programmed')}"
+        f" ({'cache hit' if info['cached'] else 'synthesized'})"
+    )
+    return True
+
+
+def run_once(
+    cfg: Dict[str, Any],
+    rm: ResourceManager,
+    am: Any,
+    *,
+    run_until_us: float,
+    rng_seed: Optional[int],
+    checkpoint_every_us: Optional[float] = None,
+    on_checkpoint: Optional[Callable[[InstrumentedScheduler, float], None]] = None,
+    resume: Optional["_checkpoint.Checkpoint"] = None,
+) -> Tuple[InstrumentedScheduler, Dict[str, Any]]:
+    """Run one scheduler pass; with *resume*, continue the checkpointed run (RM/AM already restored)."""
     import random
     rng = random.Random(int(rng_seed) if rng_seed is not None else 42)
     # Align new run start to RM's current global time (max avail across planes)
-    snap = rm.snapshot()
     try:
-        avail_vals = list((snap.get("avail", {}) or {}).values())
+        avail_vals = list((getattr(rm, "_avail", {}) or {}).values())
         t0 = max(avail_vals) if avail_vals else 0.0
     except Exception:
         t0 = 0.0
@@ -1170,21 +1446,262 @@ def run_once(cfg: Dict[str, Any], rm: ResourceManager, am: Any, *, run_until_us:
     feats = (cfg.get("features", {}) or {})
     drain_enabled = _flag(feats.get("drain_op_end_on_exit", False))
     sched = InstrumentedScheduler(cfg=cfg, rm=rm, addrman=am, rng=rng, start_at_us=t0, drain_on_exit=drain_enabled)
-    res = sched.run(run_until_us=t_end)
+    if resume is not None:
+        resume.restore_scheduler(sched)
+        t_end = resume.t_end_us
+    ckpt_cb = None
+    if on_checkpoint is not None:
+        def ckpt_cb(s: Any) -> None:
+            on_checkpoint(s, t_end)
+    res = sched.run(run_until_us=t_end, checkpoint_every_us=checkpoint_every_us, on_checkpoint=ckpt_cb)
     return sched, res
 
 
+def _coerce_flag(val: Any) -> Optional[bool]:
+    if val is None:
+        return None
+    if isinstance(val, bool):
+        return val
+    if isinstance(val, str):
+        lowered = val.strip().lower()
+        if lowered in ("", "0", "false", "no", "off"):
+            return False
+        return True
+    return bool(val)
+
+
+def _apply_drain_feature(cfg_in: Dict[str, Any], *, drain_override: Any, num_runs: int) -> Dict[str, Any]:
+    cfg_copy = dict(cfg_in or {})
+    feats = dict(cfg_copy.get("features", {}) or {})
+    # Resolve precedence: CLI override > cfg value > default (multi-run only)
+    chosen = _coerce_flag(drain_override)
+    if chosen is None:
+        chosen = _coerce_flag(feats.get("drain_op_end_on_exit"))
+    if chosen is None:
+        chosen = num_runs > 1
+    feats["drain_op_end_on_exit"] = bool(chosen)
+    cfg_copy["features"] = feats
+    return cfg_copy
+
+
+def _run_site(
+    args: argparse.Namespace,
+    cfg: Dict[str, Any],
+    offset: int,
+    *,
+    dies: int,
+    planes: int,
+    badlist_rows: Any,
+) -> Dict[str, Any]:
+    """Run every run of one multi-site batch entry and return a picklable summary.
+
+    Used directly (--jobs 1) or as a process-pool worker; all outputs go to the
+    site's own directory, so workers never share files.
+    """
+    _proposer.set_log_level(args.proposer_log)
+    try:
+        return _run_site_runs(args, cfg, offset, dies=dies, planes=planes, badlist_rows=badlist_rows)
+    finally:
+        # Pool workers exit without atexit hooks; flush the last proposer log here
+        _proposer.close_file_log()
+
+
+def _run_site_runs(
+    args: argparse.Namespace,
+    cfg: Dict[str, Any],
+    offset: int,
+    *,
+    dies: int,
+    planes: int,
+    badlist_rows: Any,
+) -> Dict[str, Any]:
+    site_id = int(args.site_start) + int(offset)
+    out_dir_site = os.path.join(args.out_dir, str(args.site_dir_pattern).format(site_id=site_id))
+    runs: List[Dict[str, Any]] = []
+
+    # Site-local state (independent across sites)
+    rm = ResourceManager(cfg=cfg, dies=dies, planes=planes)
+    _configure_timeline_archive(rm, cfg, out_dir_site)
+    am = _mk_addrman(cfg, badlist=badlist_rows)
+    try:
+        if hasattr(rm, "register_addr_policy") and hasattr(am, "check_epr"):
+            rm.register_addr_policy(am.check_epr)  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+    op_event_writer = _op_event_resume_writer(out_dir_site, args.export_format)
+    apply_pgm_writer = _apply_pgm_log_writer(out_dir_site)
+
+    # Per run within the site (continuity preserved via shared RM)
+    for i in range(args.num_runs):
+        enable_boot = bool(args.bootstrap) and (i == 0) and (args.num_runs > 1)
+        if enable_boot:
+            seed_0 = (int(args.seed) + offset) if args.seed is not None else None
+            if _maybe_precondition(cfg, am, seed=seed_0, badlist=badlist_rows, out_dir=args.out_dir):
+                enable_boot = False
+        cfg_run_base = _apply_overrides(
+            cfg,
+            admission_window=args.admission_window,
+            bootstrap_enabled=enable_boot,
+            validate_pc=bool(args.validate_pc),
+        )
+        cfg_run = _apply_drain_feature(cfg_run_base, drain_override=args.drain_op_end, num_runs=args.num_runs)
+
+        # Optional phase_conditional demo override
+        if args.pc_demo is not None:
+            pc = dict(cfg_run.get("phase_conditional", {}) or {})
+            if args.pc_demo == "erase-only":
+                pc["DEFAULT"] = {"Block_Erase_SLC": 1.0}
+            elif args.pc_demo == "mix":
+                pc["DEFAULT"] = {
+                    "Block_Erase_SLC": 0.5,
+                    "All_WL_Dummy_Program": 0.25,
+                    "4KB_Page_Read_confirm_LSB": 0.25,
+                }
+            elif args.pc_demo == "pgm-read":
+                pc["DEFAULT"] = {
+                    "All_WL_Dummy_Program": 0.6,
+                    "4KB_Page_Read_confirm_LSB": 0.4,
+                }
+            cfg_run["phase_conditional"] = pc
+
+        # Enable proposer file logging per run (site-local dir)
+        try:
+            if args.proposer_log == "off":
+                _proposer.close_file_log()
+            else:
+                os.makedirs(out_dir_site, exist_ok=True)
+                log_path = os.path.join(out_dir_site, f"proposer_debug_{_date_stamp()}_{_run_id_str(i+1)}.log")
+                _proposer.enable_file_log(log_path)
+        except Exception:
+            pass
+
+        # Optional: validate phase_conditional keys and distributions
+        if args.validate_pc:
+            try:
+                _proposer.validate_phase_conditional(cfg_run)
+            except Exception:
+                pass
+
+        # Seed per site/run for proposer RNG and AddressManager RNG
+        seed_i = (int(args.seed) + offset + i) if args.seed is not None else None
+        # Re-seed AM RNG if available
+        if seed_i is not None:
+            try:
+                import numpy as _np  # type: ignore
+                if hasattr(am, "_rng"):
+                    am._rng = _np.random.default_rng(int(seed_i))  # type: ignore[attr-defined]
+            except Exception:
+                pass
+
+        sched, res = run_once(cfg_run, rm, am, run_until_us=float(args.run_until), rng_seed=seed_i)
+
+        # Collect timeline rows
+        rows = sched.timeline_rows(copy=False)
+        op_event_resume_path = op_event_writer.append(sched.drain_op_event_rows())
+        apply_pgm_log_path = apply_pgm_writer.append(sched.drain_apply_pgm_rows())
+
+        # Exports (PRD §3)
+        os.makedirs(out_dir_site, exist_ok=True)
+        rm.restore_timeline_archive()
+        op_timeline = export_operation_timeline(rows, rm, out_dir=out_dir_site, run_idx=i, fmt=args.export_format)
+        opstate_timeline = export_op_state_timeline(rm, rows=rows, out_dir=out_dir_site, run_idx=i, fmt=args.export_format)
+        touch_cnt = export_address_touch_count(rows, cfg, out_dir=out_dir_site, run_idx=i)
+        opstate_name_input_time = export_op_state_name_input_time_count(rows, rm, out_dir=out_dir_site, run_idx=i)
+        op_sequence = export_operation_sequence(rows, cfg, rm, out_dir=out_dir_site, run_idx=i)
+        phase_counts = export_phase_proposal_counts(rows, rm, out_dir=out_dir_site, run_idx=i)
+        snap_path = save_snapshot(rm, out_dir=out_dir_site, run_idx=i)
+
+        # Brief run summary (printed by the parent in site order)
+        metrics = res.get("metrics", {}) or {}
+        runs.append(
+            {
+                "run": i + 1,
+                "hooks": res.get("hooks_executed"),
+                "ops_committed": res.get("ops_committed"),
+                "committed_by_base": dict(metrics.get("committed_by_base", {}) or {}),
+                "chained_stubs": metrics.get("chained_stubs"),
+                "chained_stub_total_us": metrics.get("chained_stub_total_us"),
+                "files": [
+                    op_sequence,
+                    touch_cnt,
+                    op_timeline,
+                    opstate_timeline,
+                    opstate_name_input_time,
+                    phase_counts,
+                    snap_path,
+                    apply_pgm_log_path,
+                    op_event_resume_path,
+                ],
+            }
+        )
+    op_event_writer.close()
+    apply_pgm_writer.close()
+    return {"site_id": site_id, "runs": runs}
+
+
+def _print_site_summary(summary: Dict[str, Any]) -> None:
+    site_id = summary.get("site_id")
+    for run in summary.get("runs", []):
+        print(f"Site {site_id} — Run {run['run']} results:")
+        print("  hooks=", run.get("hooks"), "ops_committed=", run.get("ops_committed"))
+        cmb = run.get("committed_by_base") or {}
+        if cmb:
+            print("  committed_by_base:")
+            for k in sorted(cmb.keys()):
+                print(f"    - {k}: {cmb[k]}")
+        # Optional chaining diagnostics
+        try:
+            cs = run.get("chained_stubs")
+            csum = run.get("chained_stub_total_us")
+            if cs not in (None, 0):
+                print(f"  chained_stubs= {int(cs)}  total_us= {float(csum):.3f}")
+        except Exception:
+            pass
+        print("  files:")
+        for pth in run.get("files", []):
+            print("   -", pth)
+
+
+def _write_site_summary(summaries: List[Dict[str, Any]], *, out_dir: str) -> Tuple[str, Dict[str, int]]:
+    # Aggregate per-site/run totals in site order (independent of worker completion order)
+    rows: List[Dict[str, Any]] = []
+    totals: Dict[str, int] = {}
+    for summary in summaries:
+        for run in summary.get("runs", []):
+            rows.append(
+                {
+                    "site_id": summary.get("site_id"),
+                    "run": run.get("run"),
+                    "hooks": run.get("hooks"),
+                    "ops_committed": run.get("ops_committed"),
+                }
+            )
+            for base, cnt in (run.get("committed_by_base") or {}).items():
+                totals[str(base)] = totals.get(str(base), 0) + int(cnt)
+    path = os.path.join(out_dir, "site_summary.csv")
+    _csv_write(path, rows, ["site_id", "run", "hooks", "ops_committed"])
+    return path, totals
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     p = argparse.ArgumentParser(description="Run NAND scheduler and export PRD outputs")
     p.add_argument("--config", default="config.yaml", help="Path to YAML config")
     p.add_argument("--run-until", "-t", type=float, default=100000.0, help="Simulation time per run (us)")
     p.add_argument("--num-runs", "-n", type=int, default=1, help="Number of runs")
+    p.add_argument("--proposer-log", choices=["off", "summary", "debug"], default="debug", help="Proposer log verbosity (off skips the per-run proposer_debug log file)")
     p.add_argument("--bootstrap", dest="bootstrap", action="store_true", help="Enable bootstrap (first run only if num_runs>1)")
     p.add_argument("--no-bootstrap", dest="bootstrap", action="store_false", help="Disable bootstrap")
     p.set_defaults(bootstrap=False)
     p.add_argument("--admission-window", type=float, default=None, help="Override policies.admission_window (us)")
     p.add_argument("--seed", type=int, default=42, help="Base RNG seed")
     p.add_argument("--out-dir", default="out", help="Output directory root")
+    p.add_argument(
+        "--export-format",
+        choices=list(_tableio.EXPORT_FORMATS),
+        default="csv",
+        help="File format for operation/op_state timelines and op_event_resume (parquet/npz are typed, dictionary-encoded columns)",
+    )
     p.add_argument(
         "--badlist",
         default="badlist.csv",
@@ -1204,6 +1721,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     # Multi-site batch options (disabled by default)
     p.add_argument("--site-count", type=int, default=0, help="Number of sites to batch (0 to disable)")
     p.add_argument("--site-start", type=int, default=1, help="Starting site id (inclusive)")
+    p.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for multi-site batches (default: 1, sequential)")
     p.add_argument(
         "--site-dir-pattern",
         default="site_{site_id:02d}",
@@ -1224,7 +1742,23 @@ def main(argv: Optional[List[str]] = None) -> int:
         help="Disable draining of pending OP_END events on run exit",
     )
     p.set_defaults(drain_op_end=None)
+    p.add_argument(
+        "--checkpoint-every",
+        type=float,
+        default=None,
+        help="Write a resumable checkpoint to <out-dir>/checkpoints every N simulated us (single-site runs)",
+    )
+    p.add_argument(
+        "--resume-from",
+        default=None,
+        help="Resume from a checkpoint manifest (.json); pass the same --num-runs/--seed/--run-until to reproduce the original session. The checkpointed out-dir must still hold its op_event_resume/apply_pgm_log files (they are cut back to the checkpoint, or copied when --out-dir differs)",
+    )
     args = p.parse_args(argv)
+    if args.export_format == "parquet" and not _tableio.parquet_available():
+        p.error("--export-format parquet requires pandas with pyarrow or fastparquet installed (pip install pyarrow)")
+    if int(getattr(args, "site_count", 0) or 0) > 0 and (args.checkpoint_every or args.resume_from):
+        p.error("--checkpoint-every/--resume-from are not supported with --site-count")
+    _proposer.set_log_level(args.proposer_log)
 
     cfg = _load_cfg(args.config)
     cfg = _ensure_min_cfg(cfg)
@@ -1257,161 +1791,44 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Failed to load badlist CSV '{args.badlist}': {exc}", file=sys.stderr)
         return 2
 
-    def _coerce_flag(val: Any) -> Optional[bool]:
-        if val is None:
-            return None
-        if isinstance(val, bool):
-            return val
-        if isinstance(val, str):
-            lowered = val.strip().lower()
-            if lowered in ("", "0", "false", "no", "off"):
-                return False
-            return True
-        return bool(val)
-
-    def _apply_drain_feature(cfg_in: Dict[str, Any], *, num_runs: int) -> Dict[str, Any]:
-        cfg_copy = dict(cfg_in or {})
-        feats = dict(cfg_copy.get("features", {}) or {})
-        # Resolve precedence: CLI override > cfg value > default (multi-run only)
-        chosen = _coerce_flag(args.drain_op_end)
-        if chosen is None:
-            chosen = _coerce_flag(feats.get("drain_op_end_on_exit"))
-        if chosen is None:
-            chosen = num_runs > 1
-        feats["drain_op_end_on_exit"] = bool(chosen)
-        cfg_copy["features"] = feats
-        return cfg_copy
-
     # Multi-site batch mode
     if int(getattr(args, "site_count", 0) or 0) > 0:
         site_count = int(args.site_count)
-        site_start = int(args.site_start)
-        pattern = str(args.site_dir_pattern)
-
-        for offset in range(site_count):
-            site_id = site_start + offset
-            out_dir_site = os.path.join(args.out_dir, pattern.format(site_id=site_id))
-
-            # Site-local state (independent across sites)
-            rm = ResourceManager(cfg=cfg, dies=dies, planes=planes)
-            am = _mk_addrman(cfg, badlist=badlist_rows)
-            try:
-                if hasattr(rm, "register_addr_policy") and hasattr(am, "check_epr"):
-                    rm.register_addr_policy(am.check_epr)  # type: ignore[attr-defined]
-            except Exception:
-                pass
-
-            site_op_event_rows: List[Dict[str, Any]] = []
-            site_apply_pgm_rows: List[Dict[str, Any]] = []
-
-            # Per run within the site (continuity preserved via shared RM)
-            for i in range(args.num_runs):
-                enable_boot = bool(args.bootstrap) and (i == 0) and (args.num_runs > 1)
-                cfg_run_base = _apply_overrides(
-                    cfg,
-                    admission_window=args.admission_window,
-                    bootstrap_enabled=enable_boot,
-                    validate_pc=bool(args.validate_pc),
-                )
-                cfg_run = _apply_drain_feature(cfg_run_base, num_runs=args.num_runs)
-
-                # Optional phase_conditional demo override
-                if args.pc_demo is not None:
-                    pc = dict(cfg_run.get("phase_conditional", {}) or {})
-                    if args.pc_demo == "erase-only":
-                        pc["DEFAULT"] = {"Block_Erase_SLC": 1.0}
-                    elif args.pc_demo == "mix":
-                        pc["DEFAULT"] = {
-                            "Block_Erase_SLC": 0.5,
-                            "All_WL_Dummy_Program": 0.25,
-                            "4KB_Page_Read_confirm_LSB": 0.25,
-                        }
-                    elif args.pc_demo == "pgm-read":
-                        pc["DEFAULT"] = {
-                            "All_WL_Dummy_Program": 0.6,
-                            "4KB_Page_Read_confirm_LSB": 0.4,
-                        }
-                    cfg_run["phase_conditional"] = pc
-
-                # Enable proposer file logging per run (site-local dir)
-                try:
-                    os.makedirs(out_dir_site, exist_ok=True)
-                    log_path = os.path.join(out_dir_site, f"proposer_debug_{_date_stamp()}_{_run_id_str(i+1)}.log")
-                    _proposer.enable_file_log(log_path)
-                except Exception:
-                    pass
-
-                # Optional: validate phase_conditional keys and distributions
-                if args.validate_pc:
-                    try:
-                        _proposer.validate_phase_conditional(cfg_run)
-                    except Exception:
-                        pass
-
-                # Seed per site/run for proposer RNG and AddressManager RNG
-                seed_i = (int(args.seed) + offset + i) if args.seed is not None else None
-                # Re-seed AM RNG if available
-                if seed_i is not None:
-                    try:
-                        import numpy as _np  # type: ignore
-                        if hasattr(am, "_rng"):
-                            am._rng = _np.random.default_rng(int(seed_i))  # type: ignore[attr-defined]
-                    except Exception:
-                        pass
-
-                sched, res = run_once(cfg_run, rm, am, run_until_us=float(args.run_until), rng_seed=seed_i)
-
-                # Collect timeline rows
-                rows = sched.timeline_rows()
-                site_op_event_rows.extend(sched.drain_op_event_rows())
-                site_apply_pgm_rows.extend(sched.drain_apply_pgm_rows())
-                op_event_resume_path = _write_op_event_resume_csv(site_op_event_rows, out_dir=out_dir_site)
-                apply_pgm_log_path = _write_apply_pgm_log_csv(site_apply_pgm_rows, out_dir=out_dir_site)
-
-                # Exports (PRD §3)
-                os.makedirs(out_dir_site, exist_ok=True)
-                op_timeline = export_operation_timeline(rows, rm, out_dir=out_dir_site, run_idx=i)
-                opstate_timeline = export_op_state_timeline(rm, rows=rows, out_dir=out_dir_site, run_idx=i)
-                touch_cnt = export_address_touch_count(rows, cfg, out_dir=out_dir_site, run_idx=i)
-                opstate_name_input_time = export_op_state_name_input_time_count(rows, rm, out_dir=out_dir_site, run_idx=i)
-                op_sequence = export_operation_sequence(rows, cfg, rm, out_dir=out_dir_site, run_idx=i)
-                phase_counts = export_phase_proposal_counts(rows, rm, out_dir=out_dir_site, run_idx=i)
-                snap_path = save_snapshot(rm, out_dir=out_dir_site, run_idx=i)
-
-                # Brief run summary (site-aware)
-                print(f"Site {site_id} — Run {i + 1} results:")
-                print("  hooks=", res.get("hooks_executed"), "ops_committed=", res.get("ops_committed"))
-                cmb = (res.get("metrics", {}) or {}).get("committed_by_base", {})
-                if cmb:
-                    print("  committed_by_base:")
-                    for k in sorted(cmb.keys()):
-                        print(f"    - {k}: {cmb[k]}")
-                # Optional chaining diagnostics
-                try:
-                    cs = res.get("metrics", {}).get("chained_stubs")
-                    csum = res.get("metrics", {}).get("chained_stub_total_us")
-                    if cs not in (None, 0):
-                        print(f"  chained_stubs= {int(cs)}  total_us= {float(csum):.3f}")
-                except Exception:
-                    pass
-                print("  files:")
-                for pth in (
-                    op_sequence,
-                    touch_cnt,
-                    op_timeline,
-                    opstate_timeline,
-                    opstate_name_input_time,
-                    phase_counts,
-                    snap_path,
-                    apply_pgm_log_path,
-                    op_event_resume_path,
-                ):
-                    print("   -", pth)
+        jobs = max(1, min(int(args.jobs or 1), site_count))
+        site_kwargs = {"dies": dies, "planes": planes, "badlist_rows": badlist_rows}
+        summaries: List[Dict[str, Any]] = []
+        if jobs == 1:
+            for offset in range(site_count):
+                summary = _run_site(args, cfg, offset, **site_kwargs)
+                _print_site_summary(summary)
+                summaries.append(summary)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            from functools import partial
+
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                # map() yields in submission order, so stdout is deterministic
+                for summary in pool.map(partial(_run_site, args, cfg, **site_kwargs), range(site_count)):
+                    _print_site_summary(summary)
+                    summaries.append(summary)
+        os.makedirs(args.out_dir, exist_ok=True)
+        summary_path, totals = _write_site_summary(summaries, out_dir=args.out_dir)
+        print(f"All sites ({site_count}) results:")
+        print(
+            "  hooks=", sum(int(r.get("hooks") or 0) for sm in summaries for r in sm["runs"]),
+            "ops_committed=", sum(int(r.get("ops_committed") or 0) for sm in summaries for r in sm["runs"]),
+        )
+        if totals:
+            print("  committed_by_base:")
+            for k in sorted(totals.keys()):
+                print(f"    - {k}: {totals[k]}")
+        print("  summary:", summary_path)
         return 0
 
     # Default single-site path (backward-compatible)
     # Shared state across runs for continuity
     rm = ResourceManager(cfg=cfg, dies=dies, planes=planes)
+    _configure_timeline_archive(rm, cfg, args.out_dir)
     am = _mk_addrman(cfg, badlist=badlist_rows)
     # Register address-dependent policy (EPR) when available
     try:
@@ -1420,18 +1837,52 @@ def main(argv: Optional[List[str]] = None) -> int:
     except Exception:
         pass
     
-    op_event_rows: List[Dict[str, Any]] = []
-    apply_pgm_rows: List[Dict[str, Any]] = []
+    op_event_writer = _op_event_resume_writer(args.out_dir, args.export_format)
+    apply_pgm_writer = _apply_pgm_log_writer(args.out_dir)
+    # Checkpoint/resume: each checkpoint records how much of op_event_resume/apply_pgm_log
+    # earlier runs had written; a resumed session cuts (or copies) the files back to that
+    ckpt_every = float(args.checkpoint_every or 0.0)
+    cumulative = {"op_event_resume": op_event_writer, "apply_pgm_log": apply_pgm_writer}
+    resume = None
+    start_run = 0
+    if args.resume_from:
+        try:
+            resume = _checkpoint.load_checkpoint(args.resume_from)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Failed to load checkpoint '{args.resume_from}': {exc}", file=sys.stderr)
+            return 2
+        ck_topo = resume.manifest.get("topology", {}) or {}
+        cur_topo = {k: topo.get(k) for k in ck_topo}
+        if ck_topo != cur_topo:
+            print(f"Checkpoint topology {ck_topo} does not match config {cur_topo}", file=sys.stderr)
+            return 2
+        if resume.manifest.get("config_sha256") != _checkpoint.config_digest(cfg):
+            print("Note: config differs from the checkpointed run; continuing with the current config", file=sys.stderr)
+        resume.restore_rm(rm)
+        resume.restore_am(am)
+        start_run = resume.run_idx
+        try:
+            for key, mark in resume.outputs.items():
+                if key in cumulative:
+                    cumulative[key].resume(mark, mark["path"])
+        except (OSError, ValueError) as exc:
+            print(f"Cannot restore cumulative outputs from checkpoint: {exc}", file=sys.stderr)
+            return 2
     # Per run
-    for i in range(args.num_runs):
+    for i in range(start_run, args.num_runs):
+        resume_i = resume if (resume is not None and i == start_run) else None
         enable_boot = bool(args.bootstrap) and (i == 0) and (args.num_runs > 1)
+        if enable_boot and resume_i is None:
+            seed_0 = int(args.seed) if args.seed is not None else None
+            if _maybe_precondition(cfg, am, seed=seed_0, badlist=badlist_rows, out_dir=args.out_dir):
+                enable_boot = False
         cfg_run_base = _apply_overrides(
             cfg,
             admission_window=args.admission_window,
             bootstrap_enabled=enable_boot,
             validate_pc=bool(args.validate_pc),
         )
-        cfg_run = _apply_drain_feature(cfg_run_base, num_runs=args.num_runs)
+        cfg_run = _apply_drain_feature(cfg_run_base, drain_override=args.drain_op_end, num_runs=args.num_runs)
         # Optional phase_conditional demo override
         if args.pc_demo is not None:
             pc = dict(cfg_run.get("phase_conditional", {}) or {})
@@ -1451,9 +1902,12 @@ def main(argv: Optional[List[str]] = None) -> int:
             cfg_run["phase_conditional"] = pc
         # Enable proposer file logging per run
         try:
-            os.makedirs(args.out_dir, exist_ok=True)
-            log_path = os.path.join(args.out_dir, f"proposer_debug_{_date_stamp()}_{_run_id_str(i+1)}.log")
-            _proposer.enable_file_log(log_path)
+            if args.proposer_log == "off":
+                _proposer.close_file_log()
+            else:
+                os.makedirs(args.out_dir, exist_ok=True)
+                log_path = os.path.join(args.out_dir, f"proposer_debug_{_date_stamp()}_{_run_id_str(i+1)}.log")
+                _proposer.enable_file_log(log_path)
         except Exception:
             pass
 
@@ -1465,8 +1919,8 @@ def main(argv: Optional[List[str]] = None) -> int:
                 pass
 
         seed_i = (int(args.seed) + i) if args.seed is not None else None
-        # Re-seed AM RNG if available for determinism
-        if seed_i is not None:
+        # Re-seed AM RNG if available for determinism (a resumed run keeps its checkpointed RNG)
+        if seed_i is not None and resume_i is None:
             try:
                 import numpy as _np  # type: ignore
                 if hasattr(am, "_rng"):
@@ -1474,19 +1928,35 @@ def main(argv: Optional[List[str]] = None) -> int:
             except Exception:
                 pass
 
-        sched, res = run_once(cfg_run, rm, am, run_until_us=float(args.run_until), rng_seed=seed_i)
+        on_ckpt = None
+        if ckpt_every > 0.0:
+            def on_ckpt(s: InstrumentedScheduler, t_end: float, i: int = i) -> None:
+                stem = os.path.join(args.out_dir, "checkpoints", f"checkpoint_{_run_id_str(i+1)}_t{s.now_us:.2f}")
+                ck_dir = os.path.dirname(stem)
+                path = _checkpoint.save_checkpoint(
+                    stem, sched=s, rm=rm, am=am, run_idx=i, t_end=t_end, cfg=cfg,
+                    outputs={key: w.mark(ck_dir) for key, w in cumulative.items()},
+                    extra={"seed": args.seed, "num_runs": args.num_runs, "run_until_us": float(args.run_until)},
+                )
+                print("  checkpoint:", path)
+
+        sched, res = run_once(
+            cfg_run, rm, am, run_until_us=float(args.run_until), rng_seed=seed_i,
+            checkpoint_every_us=ckpt_every, on_checkpoint=on_ckpt, resume=resume_i,
+        )
 
         # Collect timeline rows
-        rows = sched.timeline_rows()
-        op_event_rows.extend(sched.drain_op_event_rows())
-        apply_pgm_rows.extend(sched.drain_apply_pgm_rows())
-        op_event_resume_path = _write_op_event_resume_csv(op_event_rows, out_dir=args.out_dir)
-        apply_pgm_log_path = _write_apply_pgm_log_csv(apply_pgm_rows, out_dir=args.out_dir)
+        rows = sched.timeline_rows(copy=False)
+        op_event_rows = sched.drain_op_event_rows()
+        apply_pgm_rows = sched.drain_apply_pgm_rows()
+        op_event_resume_path = op_event_writer.append(op_event_rows)
+        apply_pgm_log_path = apply_pgm_writer.append(apply_pgm_rows)
 
         # Exports (PRD §3)
         os.makedirs(args.out_dir, exist_ok=True)
-        op_timeline = export_operation_timeline(rows, rm, out_dir=args.out_dir, run_idx=i)
-        opstate_timeline = export_op_state_timeline(rm, rows=rows, out_dir=args.out_dir, run_idx=i)
+        rm.restore_timeline_archive()
+        op_timeline = export_operation_timeline(rows, rm, out_dir=args.out_dir, run_idx=i, fmt=args.export_format)
+        opstate_timeline = export_op_state_timeline(rm, rows=rows, out_dir=args.out_dir, run_idx=i, fmt=args.export_format)
         touch_cnt = export_address_touch_count(rows, cfg, out_dir=args.out_dir, run_idx=i)
         opstate_name_input_time = export_op_state_name_input_time_count(rows, rm, out_dir=args.out_dir, run_idx=i)
         op_sequence = export_operation_sequence(rows, cfg, rm, out_dir=args.out_dir, run_idx=i)
@@ -1523,6 +1993,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         ):
             print("   -", pth)
 
+    op_event_writer.close()
+    apply_pgm_writer.close()
     return 0
 
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
+import atexit
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # Ports: use narrow types from ResourceManager for Address/Scope
-from resourcemgr import Address, Scope  # runtime types shared across modules
+from resourcemgr import Address, Scope, exclusion_matrix  # runtime types shared across modules
 
 
 # ------------------------------
@@ -118,7 +119,10 @@ class _StateSeg:
 class _OpStub:
     name: str
     base: str  # e.g., ERASE, PROGRAM_SLC, READ, READ4K, ...
-    states: List[_StateSeg]
+    states: Tuple[_StateSeg, ...]
+    # Precompiled from OpSpec; ResourceManager uses them when present
+    total_us: Optional[float] = None
+    bus_offsets: Optional[Tuple[Tuple[float, float], ...]] = None
 
 
 # ------------------------------
@@ -128,7 +132,7 @@ class ResourceView:
     def op_state(self, die: int, plane: int, at_us: float) -> Optional[str]:
         raise NotImplementedError
 
-    def feasible_at(self, op: Any, targets: List[Address], start_hint: float, scope: Scope = Scope.PLANE_SET) -> Optional[float]:
+    def feasible_at(self, op: Any, targets: List[Address], start_hint: float, scope: Scope = Scope.PLANE_SET, horizon_us: Optional[float] = None) -> Optional[float]:
         raise NotImplementedError
     # Optional method provided by ResourceManager; used opportunistically when present
     # def phase_key_at(self, die: int, plane: int, t: float, default: str = "DEFAULT", derive_end: bool = True, prefer_end_on_boundary: bool = True, exclude_issue: bool = True) -> str: ...
@@ -150,33 +154,82 @@ class AddressSampler:
 
 # ------------------------------
 # Helpers
-# --- lightweight file logger for proposer debug ---
+# --- buffered, level-gated logger for proposer debug ---
+LOG_OFF = 0
+LOG_SUMMARY = 1
+LOG_DEBUG = 2
+_LOG_LEVELS = {"off": LOG_OFF, "summary": LOG_SUMMARY, "debug": LOG_DEBUG}
+_LOG_LEVEL: int = LOG_DEBUG
 _LOG_PATH: Optional[str] = None
+_LOG_FH: Optional[Any] = None
+
+
+def set_log_level(level: Any) -> None:
+    """Set proposer log verbosity: 'off' | 'summary' | 'debug' (or LOG_* ints).
+
+    'summary' keeps selected-op, warning and validation summary lines; 'debug'
+    adds per-candidate traces.
+    """
+    global _LOG_LEVEL
+    if isinstance(level, str):
+        if level.strip().lower() not in _LOG_LEVELS:
+            raise ValueError(f"unknown proposer log level: {level!r}")
+        _LOG_LEVEL = _LOG_LEVELS[level.strip().lower()]
+    else:
+        _LOG_LEVEL = max(LOG_OFF, min(LOG_DEBUG, int(level)))
+
+
+def log_enabled(level: int = LOG_DEBUG) -> bool:
+    return _LOG_LEVEL >= level
+
+
+def close_file_log() -> None:
+    """Flush and close the current log file (stdout logging resumes)."""
+    global _LOG_FH, _LOG_PATH
+    fh, _LOG_FH, _LOG_PATH = _LOG_FH, None, None
+    if fh is not None:
+        try:
+            fh.close()
+        except Exception:
+            pass
 
 
 def enable_file_log(path: str) -> None:
     """Enable proposer debug logs to be written to a file.
 
-    If not enabled, logs are printed to stdout.
+    The handle stays open (buffered) until the next enable_file_log/close_file_log
+    call or interpreter exit. If not enabled, logs are printed to stdout.
     """
-    global _LOG_PATH
-    _LOG_PATH = str(path)
+    global _LOG_PATH, _LOG_FH
+    close_file_log()
     try:
-        # Touch file and write a header
-        with open(_LOG_PATH, "w", encoding="utf-8") as f:
-            f.write("# proposer debug log\n")
+        # Truncate file and write a header
+        _LOG_FH = open(str(path), "w", encoding="utf-8", buffering=1 << 16)
+        _LOG_FH.write("# proposer debug log\n")
+        _LOG_PATH = str(path)
     except Exception:
         # Fallback to disabled on failure
+        _LOG_FH = None
         _LOG_PATH = None
 
 
-def _log(msg: str) -> None:
+atexit.register(close_file_log)
+
+
+def _log(msg: Any, level: int = LOG_DEBUG) -> None:
+    """Write one log line when *level* is enabled.
+
+    *msg* may be a zero-arg callable so hot paths skip formatting when the
+    level is disabled.
+    """
+    if _LOG_LEVEL < level:
+        return
     try:
-        if _LOG_PATH:
-            with open(_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(str(msg) + "\n")
+        text = msg() if callable(msg) else msg
+        if _LOG_FH is not None:
+            _LOG_FH.write(str(text) + "\n")
         else:
-            print(str(msg))
+            print(str(text))
     except Exception:
         # Best-effort; ignore logging failures
         pass
@@ -201,10 +254,29 @@ def _pol_epsilon(cfg: Dict[str, Any]) -> float:
         return 0.0
 
 
+def _pol_candidate_sampler(cfg: Dict[str, Any]) -> str:
+    mode = str(_cfg_policies(cfg).get("candidate_sampler", "legacy") or "legacy").strip().lower()
+    return mode if mode in CandidateSampler.MODES else "legacy"
+
+
 def _pol_window(cfg: Dict[str, Any]) -> float:
     return float(_cfg_policies(cfg).get("admission_window", 0.5))
 
 
+def _pol_gap_search(cfg: Dict[str, Any]) -> bool:
+    try:
+        return bool(_cfg_policies(cfg).get("feasible_gap_search", False))
+    except Exception:
+        return False
+
+
+def _feasible_first(res_view: "ResourceView", cfg: Dict[str, Any], op: Any, targets: List[Address], now: float, scope: Scope) -> Optional[float]:
+    """feasible_at() for a batch's first op; searches up to the admission window when gap search is on."""
+    if _pol_gap_search(cfg):
+        return res_view.feasible_at(op, targets, start_hint=float(now), scope=scope, horizon_us=float(now) + _pol_window(cfg))
+    return res_view.feasible_at(op, targets, start_hint=float(now), scope=scope)
+
+
 def _pol_maxtry(cfg: Dict[str, Any]) -> int:
     return int(_cfg_policies(cfg).get("maxtry_candidate", 4))
 
@@ -221,6 +293,14 @@ def _pol_split_dout_per_plane(cfg: Dict[str, Any]) -> bool:
 
 
 def _base_scope(cfg: Dict[str, Any], base: str) -> Scope:
+    return op_spec_table(cfg).base_scope(base)
+
+
+def _base_instant(cfg: Dict[str, Any], base: str) -> bool:
+    return op_spec_table(cfg).base_instant(base)
+
+
+def _base_scope_uncached(cfg: Dict[str, Any], base: str) -> Scope:
     # Map cfg string scope -> Scope enum
     sc = ((cfg.get("op_bases", {}) or {}).get(base, {}) or {}).get("scope", "PLANE_SET")
     sc = str(sc).upper()
@@ -231,7 +311,7 @@ def _base_scope(cfg: Dict[str, Any], base: str) -> Scope:
     return Scope.PLANE_SET
 
 
-def _base_instant(cfg: Dict[str, Any], base: str) -> bool:
+def _base_instant_uncached(cfg: Dict[str, Any], base: str) -> bool:
     return bool(((cfg.get("op_bases", {}) or {}).get(base, {}) or {}).get("instant_resv", False))
 
 
@@ -244,27 +324,8 @@ def _pol_hook_targets_enabled(cfg: Dict[str, Any]) -> bool:
         return True
 
 
-def _exclusion_groups(cfg: Dict[str, Any]) -> Dict[str, List[str]]:
-    eg = cfg.get("exclusion_groups", {}) or {}
-    out: Dict[str, List[str]] = {}
-    try:
-        for g, lst in eg.items():
-            out[str(g)] = [str(b) for b in (lst or [])]
-    except Exception:
-        pass
-    return out
-
-
 def _blocking_groups(cfg: Dict[str, Any], base: str, groups: Iterable[str]) -> Tuple[str, ...]:
-    eg = _exclusion_groups(cfg)
-    matched: List[str] = []
-    base_str = str(base)
-    for g in groups or []:
-        g_str = str(g)
-        members = set(eg.get(g_str, []) or [])
-        if base_str in members:
-            matched.append(g_str)
-    return tuple(matched)
+    return exclusion_matrix(cfg).blocking_groups(base, groups)
 
 
 def _blocked_by_groups(cfg: Dict[str, Any], base: str, groups: List[str]) -> bool:
@@ -281,20 +342,7 @@ def _pol_validate_pc(cfg: Dict[str, Any]) -> bool:
 
 def _excluded_bases_for_op_state_key(cfg: Dict[str, Any], key: str) -> List[str]:
     try:
-        by_state = (cfg.get("exclusions_by_op_state", {}) or {})
-        groups = list(by_state.get(str(key), []) or [])
-        eg = _exclusion_groups(cfg)
-        out: List[str] = []
-        for g in groups:
-            out.extend([str(x) for x in (eg.get(str(g), []) or [])])
-        # dedup keep order
-        seen = set()
-        uniq: List[str] = []
-        for b in out:
-            if b not in seen:
-                uniq.append(b)
-                seen.add(b)
-        return uniq
+        return list(exclusion_matrix(cfg).excluded_bases("op_state", key))
     except Exception:
         return []
 
@@ -320,13 +368,14 @@ def _apply_phase_overrides(cfg: Dict[str, Any], key: str, dist: Dict[str, float]
         for n in lst:
             base_of[str(n)] = str(b)
 
-    # Allowed check via exclusions_by_op_state
-    excl = set(_excluded_bases_for_op_state_key(cfg, str(key)))
+    # Allowed check via exclusions_by_op_state (one AND against the key's blocked-base mask)
+    em = exclusion_matrix(cfg)
+    excl_mask = em.state_mask("op_state", key)
     def _allowed_name(n: str) -> bool:
         b = base_of.get(str(n))
         if b is None:
             return False
-        return str(b) not in excl
+        return not (em.base_bit(b) & excl_mask)
 
     # Start candidates from existing dist keys
     cand: Dict[str, float] = {str(n): float(v) for n, v in (dist or {}).items()}
@@ -442,7 +491,7 @@ def _apply_phase_overrides(cfg: Dict[str, Any], key: str, dist: Dict[str, float]
             s_before = sum(max(0.0, float(v)) for v in (dist or {}).values())
             s_after = sum(out.values()) if out else 0.0
             _log(
-                f"[proposer][pc-rt] {str(key)}: before_sum={s_before:.6f} top=[{_top3(dist)}]; "
+                lambda: f"[proposer][pc-rt] {str(key)}: before_sum={s_before:.6f} top=[{_top3(dist)}]; "
                 f"ovr_sum={sum_fixed:.6f} top=[{_top3({k:v for k,v in fixed.items() if v>0})}]; "
                 f"after_sum={s_after:.6f} top=[{_top3(out)}]"
             )
@@ -459,23 +508,26 @@ def _candidate_blocked_by_states(
     hook: Dict[str, Any],
 ) -> Tuple[bool, Optional[StateBlockInfo]]:
     # derive base context
-    base = str(((cfg.get("op_names", {}) or {}).get(op_name, {}) or {}).get("base"))
+    base = _op_base_of(cfg, op_name)
     die = int(hook.get("die", 0))
     plane = int(hook.get("plane", 0))
+    em = exclusion_matrix(cfg)
+    bit = em.base_bit(base)
+    if not bit:
+        # base belongs to no exclusion group: no state can block it
+        return False, None
 
     def _make_info(
         axis: str,
+        family: str,
         state: Optional[str],
-        groups: Iterable[str],
         *,
         die_hint: Optional[int] = None,
         plane_hint: Optional[int] = None,
     ) -> Optional[StateBlockInfo]:
-        if not state:
-            return None
-        matched = _blocking_groups(cfg, base, groups)
-        if not matched:
+        if not state or not (em.state_mask(family, state) & bit):
             return None
+        matched = em.blocking_groups(base, em.state_groups(family, state))
         return StateBlockInfo(
             axis=str(axis),
             state=str(state),
@@ -491,14 +543,12 @@ def _candidate_blocked_by_states(
     except Exception:
         odt = None
     if odt:
-        groups = list((cfg.get("exclusions_by_odt_state", {}) or {}).get(str(odt), []) or [])
-        info = _make_info("ODT", str(odt), groups, die_hint=die)
+        info = _make_info("ODT", "odt", str(odt), die_hint=die)
         if info:
             return True, info
 
     # Suspend (die-level) — evaluate both axes when available
     axis_states: List[Tuple[str, str]] = []
-    by_state_suspend: Dict[str, List[str]] = (cfg.get("exclusions_by_suspend_state", {}) or {})
     suspend_axes_supported = False
     try:
         es = getattr(res_view, "erase_suspend_state")(die, at_us=float(now))  # type: ignore[attr-defined]
@@ -515,8 +565,7 @@ def _candidate_blocked_by_states(
     except Exception:
         pass
     for axis, state_val in axis_states:
-        groups = list(by_state_suspend.get(str(state_val), []) or [])
-        info = _make_info(axis, state_val, groups, die_hint=die)
+        info = _make_info(axis, "suspend", state_val, die_hint=die)
         if info:
             return True, info
     if not suspend_axes_supported:
@@ -526,8 +575,7 @@ def _candidate_blocked_by_states(
         except Exception:
             susp = None
         if susp:
-            groups = list(by_state_suspend.get(str(susp), []) or [])
-            info = _make_info("SUSPEND", susp, groups, die_hint=die)
+            info = _make_info("SUSPEND", "suspend", susp, die_hint=die)
             if info:
                 return True, info
 
@@ -537,9 +585,8 @@ def _candidate_blocked_by_states(
     except Exception:
         cst = None
     if cst:
-        groups = list((cfg.get("exclusions_by_cache_state", {}) or {}).get(str(cst), []) or [])
         plane_hint = plane if "READ" in str(cst).upper() else None
-        info = _make_info("CACHE", str(cst), groups, die_hint=die, plane_hint=plane_hint)
+        info = _make_info("CACHE", "cache", str(cst), die_hint=die, plane_hint=plane_hint)
         if info:
             return True, info
 
@@ -600,23 +647,156 @@ def _build_states_from_cfg(cfg: Dict[str, Any], op_name: str, base: str) -> List
     return out
 
 
+# ------------------------------
+# Compiled op specs (built once per op_bases/op_names pair)
+# ------------------------------
+@dataclass(frozen=True)
+class OpSpec:
+    name: str
+    base: str
+    states: Tuple[_StateSeg, ...]
+    total_us: float
+    # (start, end) offsets of bus-holding states relative to op start
+    bus_offsets: Tuple[Tuple[float, float], ...]
+    scope: Scope
+    instant: bool
+    celltype: Optional[str]
+    multi: bool
+    stub: _OpStub
+
+
+class OpSpecTable:
+    """Immutable per-op_name specs compiled from cfg.op_bases/op_names.
+
+    Hot paths (`propose`, `_preflight_schedule`, Scheduler reservation) look up
+    specs by name instead of re-walking the nested YAML on every call.
+    """
+
+    def __init__(self, cfg: Dict[str, Any]) -> None:
+        # Keep references to the source mappings; identity is the cache key
+        self.op_bases_src = cfg.get("op_bases")
+        self.op_names_src = cfg.get("op_names")
+        bases = self.op_bases_src or {}
+        names = self.op_names_src or {}
+        self._base_scope: Dict[str, Scope] = {}
+        self._base_instant: Dict[str, bool] = {}
+        for b in bases.keys():
+            self._base_scope[str(b)] = _base_scope_uncached(cfg, str(b))
+            self._base_instant[str(b)] = _base_instant_uncached(cfg, str(b))
+        self._specs: Dict[str, OpSpec] = {}
+        self._errors: Dict[str, Exception] = {}
+        by_base: Dict[str, List[str]] = {}
+        for name, op_def in names.items():
+            by_base.setdefault(str((op_def or {}).get("base")), []).append(name)
+            if not op_def:
+                continue
+            base = str(op_def.get("base"))
+            try:
+                states = tuple(_build_states_from_cfg(cfg, name, base))
+            except Exception as exc:
+                # Malformed entry: surface the error when this op is actually built
+                self._errors[name] = exc
+                continue
+            total = 0.0
+            bus: List[Tuple[float, float]] = []
+            for st in states:
+                if st.bus:
+                    bus.append((total, total + st.dur_us))
+                total += st.dur_us
+            ct = op_def.get("celltype")
+            stub = _OpStub(name=name, base=base, states=states, total_us=total, bus_offsets=tuple(bus))
+            self._specs[name] = OpSpec(
+                name=name,
+                base=base,
+                states=states,
+                total_us=total,
+                bus_offsets=tuple(bus),
+                scope=self.base_scope(base),
+                instant=self.base_instant(base),
+                celltype=(None if ct in (None, "NONE") else str(ct)),
+                multi=bool(op_def.get("multi", False)),
+                stub=stub,
+            )
+        self._names_by_base: Dict[str, Tuple[str, ...]] = {b: tuple(v) for b, v in by_base.items()}
+
+    def matches(self, cfg: Dict[str, Any]) -> bool:
+        return cfg.get("op_bases") is self.op_bases_src and cfg.get("op_names") is self.op_names_src
+
+    def spec(self, op_name: str) -> Optional[OpSpec]:
+        return self._specs.get(op_name)
+
+    def build_error(self, op_name: str) -> Optional[Exception]:
+        return self._errors.get(op_name)
+
+    def names_for_base(self, base: str) -> Tuple[str, ...]:
+        return self._names_by_base.get(str(base), ())
+
+    def names_by_base(self) -> Dict[str, List[str]]:
+        return {b: list(v) for b, v in self._names_by_base.items()}
+
+    def base_scope(self, base: str) -> Scope:
+        sc = self._base_scope.get(base)
+        return Scope.PLANE_SET if sc is None else sc
+
+    def base_instant(self, base: str) -> bool:
+        return self._base_instant.get(base, False)
+
+
+_OP_SPEC_TABLES: Dict[Tuple[int, int], OpSpecTable] = {}
+_OP_SPEC_TABLES_MAX = 8
+
+
+def op_spec_table(cfg: Dict[str, Any]) -> OpSpecTable:
+    """Return the compiled OpSpecTable for cfg, building it on first use.
+
+    Shallow cfg copies (per-run overrides, bootstrap overlays) share the same
+    op_bases/op_names objects and therefore the same table. Callers that mutate
+    those mappings in place must call `invalidate_op_spec_cache()`.
+    """
+    key = (id(cfg.get("op_bases")), id(cfg.get("op_names")))
+    table = _OP_SPEC_TABLES.get(key)
+    if table is not None and table.matches(cfg):
+        return table
+    if len(_OP_SPEC_TABLES) >= _OP_SPEC_TABLES_MAX:
+        _OP_SPEC_TABLES.clear()
+    table = OpSpecTable(cfg)
+    _OP_SPEC_TABLES[key] = table
+    return table
+
+
+def invalidate_op_spec_cache() -> None:
+    _OP_SPEC_TABLES.clear()
+
+
 def _build_op(cfg: Dict[str, Any], op_name: str, targets: List[Address]) -> _OpStub:
-    op_def = (cfg.get("op_names", {}) or {}).get(op_name)
-    if not op_def:
+    table = op_spec_table(cfg)
+    spec = table.spec(op_name)
+    if spec is None:
+        err = table.build_error(op_name)
+        if err is not None:
+            raise err
         raise KeyError(f"op_name not found in cfg.op_names: {op_name}")
-    base = str(op_def.get("base"))
-    states = _build_states_from_cfg(cfg, op_name, base)
-    return _OpStub(name=op_name, base=base, states=states)
+    return spec.stub
 
 
 def _op_celltype(cfg: Dict[str, Any], op_name: str) -> Optional[str]:
     try:
+        spec = op_spec_table(cfg).spec(op_name)
+        if spec is not None:
+            return spec.celltype
         ct = (cfg.get("op_names", {}) or {}).get(op_name, {}).get("celltype")
         return None if ct in (None, "NONE") else str(ct)
     except Exception:
         return None
 
 
+def _op_base_of(cfg: Dict[str, Any], op_name: str) -> str:
+    spec = op_spec_table(cfg).spec(op_name)
+    if spec is not None:
+        return spec.base
+    return str(((cfg.get("op_names", {}) or {}).get(op_name, {}) or {}).get("base"))
+
+
 def _to_targets(addrs_nd: Any) -> List[Address]:
     """
     Accepts nested sequences or numpy arrays with shape (#, k, 3) or (#, 1, 3).
@@ -673,9 +853,13 @@ def _guess_plane_from_block(block: int, planes: int) -> int:
 
 
 def _sample_targets_for_op(cfg: Dict[str, Any], addr: AddressSampler, op_name: str, sel_die: Optional[int], planes_hint: Optional[List[int]] = None) -> List[Address]:
-    op_def = (cfg.get("op_names", {}) or {}).get(op_name) or {}
-    base = str(op_def.get("base"))
-    multi = bool(op_def.get("multi", False))
+    spec = op_spec_table(cfg).spec(op_name)
+    if spec is not None:
+        base, multi = spec.base, spec.multi
+    else:
+        op_def = (cfg.get("op_names", {}) or {}).get(op_name) or {}
+        base = str(op_def.get("base"))
+        multi = bool(op_def.get("multi", False))
     cell = _op_celltype(cfg, op_name) or "TLC"
 
     dies, planes = _cfg_topology(cfg)
@@ -792,17 +976,13 @@ def _targets_from_hook(hook: Dict[str, Any]) -> List[Address]:
 
 
 def _op_names_by_base(cfg: Dict[str, Any]) -> Dict[str, List[str]]:
-    out: Dict[str, List[str]] = {}
-    for name, spec in (cfg.get("op_names", {}) or {}).items():
-        base = str((spec or {}).get("base"))
-        out.setdefault(base, []).append(name)
-    return out
+    return op_spec_table(cfg).names_by_base()
 
 
 def _choose_op_name_for_base(
     cfg: Dict[str, Any], base: str, multi: Optional[bool] = None, celltype: Optional[str] = None
 ) -> Optional[str]:
-    names = _op_names_by_base(cfg).get(str(base), [])
+    names = list(op_spec_table(cfg).names_for_base(str(base)))
     if not names:
         return None
     def ok(n: str) -> bool:
@@ -840,7 +1020,7 @@ def _choose_op_name_for_base_uniform(
     - Otherwise, samples uniformly among filtered candidates.
     - Uses provided `rng.random()` when available; falls back to `random.random()`.
     """
-    names = _op_names_by_base(cfg).get(str(base), [])
+    names = list(op_spec_table(cfg).names_for_base(str(base)))
     if not names:
         return None
 
@@ -1017,13 +1197,16 @@ def _targets_with_inherit(rules: List[str], targets: List[Address]) -> List[Addr
 
 
 def _op_total_duration(op: _OpStub) -> float:
+    total = getattr(op, "total_us", None)
+    if total is not None:
+        return float(total)
     return sum(s.dur_us for s in (op.states or []))
 
 
 def _expand_sequence_once(
     cfg: Dict[str, Any], first_name: str, first_targets: List[Address], rng: Any
 ) -> Optional[Tuple[str, List[Address]]]:
-    base1 = str(((cfg.get("op_names", {}) or {}).get(first_name, {}) or {}).get("base"))
+    base1 = _op_base_of(cfg, first_name)
     seq = _seq_spec(cfg, base1)
     if not seq:
         return None
@@ -1190,7 +1373,7 @@ def _expand_sequence_chain(
     - If sequence picks a non-.SEQ symbol: append one step using op_bases[base].sequence.inherit
     - If sequence picks *.SEQ: expand using generate_seq_rules[choice].sequences
     """
-    base1 = str(((cfg.get("op_names", {}) or {}).get(first_name, {}) or {}).get("base"))
+    base1 = _op_base_of(cfg, first_name)
     seq = _seq_spec(cfg, base1)
     if not seq:
         return [(first_name, first_targets, None)]
@@ -1289,7 +1472,7 @@ def _preflight_schedule(
                 if len(ops2) != len(ops):
                     ops = ops2
                     try:
-                        _log(f"[proposer] split_dout_per_plane applied planes={planes_order} total_ops={len(ops)}")
+                        _log(lambda: f"[proposer] split_dout_per_plane applied planes={planes_order} total_ops={len(ops)}")
                     except Exception:
                         pass
     except Exception:
@@ -1299,7 +1482,7 @@ def _preflight_schedule(
     name0, targets0, _meta0 = ops[0]
     op0 = _build_op(cfg, name0, targets0)
     scope0 = _base_scope(cfg, op0.base)
-    t0 = res_view.feasible_at(op0, targets0, start_hint=float(now), scope=scope0)
+    t0 = _feasible_first(res_view, cfg, op0, targets0, now, scope0)
     if t0 is None:
         return None
     planned.append(ProposedOp(op_name=name0, base=op0.base, targets=list(targets0), scope=scope0, start_us=float(t0), meta=None))
@@ -1350,47 +1533,75 @@ def _parse_label_to_key(lbl: str) -> Optional[str]:
     return None
 
 
-def _phase_key(cfg: Optional[Dict[str, Any]], hook: Dict[str, Any], res: ResourceView, now_us: float) -> str:
+def _derive_phase_key(
+    cfg: Optional[Dict[str, Any]], hook: Dict[str, Any], res: ResourceView, now_us: float
+) -> Tuple[str, Optional[str], bool]:
+    """Return (key, rm_state, used_rm_fallback) without logging."""
     # Hook may include die/plane and a label; prefer RM state at now
     die = int(hook.get("die", 0))
     plane = int(hook.get("plane", 0))
     st = res.op_state(die, plane, now_us)
-    key: str
     if st:
-        key = str(st)
-    else:
-        # 1) Fallback to hook label if formatted as BASE.STATE
-        key = _parse_label_to_key(hook.get("label", "")) or "DEFAULT"
-        # 2) If still DEFAULT and feature enabled, use RM virtual phase key
-        if key == "DEFAULT" and _feature_enabled(cfg, "phase_key_rm_fallback", True):
-            # Use RM's virtual END derivation when op_state is None
-            rm_key: Optional[str] = None
-            try:
-                # mypy/runtime: ResourceManager provides this method; duck-typed here
-                rm_key = getattr(res, "phase_key_at")(die, plane, float(now_us), default="DEFAULT", derive_end=True, prefer_end_on_boundary=True, exclude_issue=True)  # type: ignore[attr-defined]
-            except Exception:
-                rm_key = None
-            if isinstance(rm_key, str) and rm_key.strip():
-                key = rm_key
-                try:
-                    _log(
-                        f"[proposer] phase_key_fallback die={die} plane={plane} now={float(now_us):.3f} chosen_key={key} reason=op_state_none"
-                    )
-                except Exception:
-                    pass
+        return str(st), st, False
+    # 1) Fallback to hook label if formatted as BASE.STATE
+    key = _parse_label_to_key(hook.get("label", "")) or "DEFAULT"
+    # 2) If still DEFAULT and feature enabled, use RM virtual phase key
+    if key == "DEFAULT" and _feature_enabled(cfg, "phase_key_rm_fallback", True):
+        # Use RM's virtual END derivation when op_state is None
+        rm_key: Optional[str] = None
+        try:
+            # mypy/runtime: ResourceManager provides this method; duck-typed here
+            rm_key = getattr(res, "phase_key_at")(die, plane, float(now_us), default="DEFAULT", derive_end=True, prefer_end_on_boundary=True, exclude_issue=True)  # type: ignore[attr-defined]
+        except Exception:
+            rm_key = None
+        if isinstance(rm_key, str) and rm_key.strip():
+            return rm_key, st, True
+    return key, st, False
+
+
+def _phase_key(
+    cfg: Optional[Dict[str, Any]],
+    hook: Dict[str, Any],
+    res: ResourceView,
+    now_us: float,
+    derived: Optional[Tuple[str, Optional[str], bool]] = None,
+) -> str:
+    die = int(hook.get("die", 0))
+    plane = int(hook.get("plane", 0))
+    key, st, fell_back = derived if derived is not None else _derive_phase_key(cfg, hook, res, now_us)
+    if fell_back:
+        try:
+            _log(
+                lambda: f"[proposer] phase_key_fallback die={die} plane={plane} now={float(now_us):.3f} chosen_key={key} reason=op_state_none"
+            )
+        except Exception:
+            pass
     try:
         # Debug: trace how phase key is derived
         _log(
-            f"[proposer] phase_key: now={float(now_us):.3f} die={die} plane={plane} rm_state={str(st)} hook_label={str(hook.get('label'))} -> key={key}"
+            lambda: f"[proposer] phase_key: now={float(now_us):.3f} die={die} plane={plane} rm_state={str(st)} hook_label={str(hook.get('label'))} -> key={key}"
         )
         if key.endswith(".ISSUE"):
-            _log("[proposer][warn] phase_key ends with .ISSUE — check PHASE_HOOK timing and state mapping")
+            _log("[proposer][warn] phase_key ends with .ISSUE — check PHASE_HOOK timing and state mapping", level=LOG_SUMMARY)
     except Exception:
         pass
     return key
 
 
-def _phase_dist(cfg: Dict[str, Any], key: str) -> Dict[str, float]:
+def phase_may_admit_instant(cfg: Dict[str, Any], hook: Dict[str, Any], res: ResourceView, now_us: float) -> bool:
+    """True when a proposal for *hook* at *now_us* could draw an instant-reservation op.
+
+    Quiet (no logging, no RNG); used by the scheduler's idle refill mode to
+    prove a tick futile while every plane is busy. Conservative under
+    validate_pc, where distributions are not cached.
+    """
+    if _pol_validate_pc(cfg):
+        return True
+    key = _derive_phase_key(cfg, hook, res, now_us)[0]
+    return phase_dist_table(cfg).admits_instant(key)
+
+
+def _phase_dist_uncached(cfg: Dict[str, Any], key: str) -> Dict[str, float]:
     pc = cfg.get("phase_conditional", {}) or {}
     # Semantics (Option A):
     # - If key is missing: fall back to DEFAULT
@@ -1417,6 +1628,219 @@ def _phase_dist(cfg: Dict[str, Any], key: str) -> Dict[str, float]:
     return out
 
 
+def _rand01(rng: Any) -> float:
+    try:
+        return rng.random() if hasattr(rng, "random") else __import__("random").random()
+    except Exception:
+        from random import random as _r
+        return _r()
+
+
+class CandidateSampler:
+    """Weighted top-N sampler without replacement, built once per distribution.
+
+    Holds the positive entries of a distribution in dist order with their
+    running sums. Two modes, both deterministic for a given `rng` state:
+
+    - "legacy": iterative draws that zero each pick and recompute the total;
+      reproduces the historical candidate sequence bit-for-bit.
+    - "rejection": bisect the prebuilt cumulative array and redraw on an
+      already-picked name; the array is rebuilt over the remaining names only
+      once picked mass exceeds half the total. Same distribution as legacy,
+      O(log n) per draw, but a different random stream (re-baseline goldens).
+    """
+
+    MODES = ("legacy", "rejection")
+
+    __slots__ = ("names", "weights", "cum", "total")
+
+    def __init__(self, names: Iterable[str], weights: Iterable[float]) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self.weights: Tuple[float, ...] = tuple(weights)
+        cum: List[float] = []
+        acc = 0.0
+        for w in self.weights:
+            acc += w
+            cum.append(acc)
+        self.cum: Tuple[float, ...] = tuple(cum)
+        self.total: float = sum(self.weights)
+
+    @classmethod
+    def from_dist(cls, dist: Dict[str, float]) -> "CandidateSampler":
+        names: List[str] = []
+        weights: List[float] = []
+        for n, p in dist.items():
+            try:
+                w = float(p)
+            except Exception:
+                w = 0.0
+            if w > 0.0:
+                names.append(str(n))
+                weights.append(w)
+        return cls(names, weights)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def sample(self, k: int, rng: Any, mode: str = "legacy") -> List[Tuple[str, float]]:
+        """Return up to k (name, weight) picks without replacement."""
+        k = max(0, min(int(k), len(self.names)))
+        if k == 0:
+            return []
+        if mode == "rejection":
+            return self._sample_rejection(k, rng)
+        return self._sample_legacy(k, rng)
+
+    def _sample_legacy(self, k: int, rng: Any) -> List[Tuple[str, float]]:
+        import bisect as _b
+        weights = list(self.weights)
+        out: List[Tuple[str, float]] = []
+        for draw in range(k):
+            tot = self.total if draw == 0 else sum(weights)
+            if tot <= 0.0:
+                break
+            r = _rand01(rng) * tot
+            idx = len(weights) - 1
+            if draw == 0:
+                idx = min(_b.bisect_left(self.cum, r), idx)
+            else:
+                acc = 0.0
+                for i, w in enumerate(weights):
+                    acc += w
+                    if r <= acc:
+                        idx = i
+                        break
+            out.append((self.names[idx], self.weights[idx]))
+            # Zero out to avoid reselection
+            weights[idx] = 0.0
+        return out
+
+    def _sample_rejection(self, k: int, rng: Any) -> List[Tuple[str, float]]:
+        import bisect as _b
+        idxs: Tuple[int, ...] = tuple(range(len(self.names)))
+        cum, total = self.cum, self.total
+        picked: set = set()
+        picked_mass = 0.0
+        out: List[Tuple[str, float]] = []
+        while len(out) < k:
+            if picked_mass > 0.5 * total:
+                # Too many rejections ahead: rebuild over the remaining names
+                idxs = tuple(i for i in idxs if i not in picked)
+                acc = 0.0
+                rebuilt: List[float] = []
+                for i in idxs:
+                    acc += self.weights[i]
+                    rebuilt.append(acc)
+                cum, total = tuple(rebuilt), acc
+                picked_mass = 0.0
+            if total <= 0.0 or not idxs:
+                break
+            j = min(_b.bisect_left(cum, _rand01(rng) * total), len(idxs) - 1)
+            i = idxs[j]
+            if i in picked:
+                continue
+            picked.add(i)
+            picked_mass += self.weights[i]
+            out.append((self.names[i], self.weights[i]))
+        return out
+
+
+@dataclass(frozen=True)
+class PhaseDist:
+    """Final (override-applied) distribution for one phase key.
+
+    Treat `dist` as read-only; it is shared across proposals. `sampler` is
+    the prebuilt CandidateSampler over its positive entries.
+    """
+
+    dist: Dict[str, float]
+    sampler: CandidateSampler
+
+    @classmethod
+    def build(cls, dist: Dict[str, float]) -> "PhaseDist":
+        return cls(dist=dist, sampler=CandidateSampler.from_dist(dist))
+
+
+class PhaseDistTable:
+    """Per-key PhaseDist cache for one phase_conditional mapping.
+
+    Entries are computed on first use. phase_conditional and its overrides are
+    static within a run; a bootstrap stage change installs a new
+    phase_conditional object, which selects a fresh table.
+    """
+
+    def __init__(self, cfg: Dict[str, Any]) -> None:
+        self.cfg = cfg
+        self.pc_src = cfg.get("phase_conditional")
+        self.overrides_src = cfg.get("phase_conditional_overrides")
+        self.excl_src = cfg.get("exclusions_by_op_state")
+        self.groups_src = cfg.get("exclusion_groups")
+        self.op_table = op_spec_table(cfg)
+        self._entries: Dict[str, PhaseDist] = {}
+        self._admits_instant: Dict[str, bool] = {}
+
+    def matches(self, cfg: Dict[str, Any]) -> bool:
+        return (
+            cfg.get("phase_conditional") is self.pc_src
+            and cfg.get("phase_conditional_overrides") is self.overrides_src
+            and cfg.get("exclusions_by_op_state") is self.excl_src
+            and cfg.get("exclusion_groups") is self.groups_src
+            and op_spec_table(cfg) is self.op_table
+        )
+
+    def get(self, key: str) -> PhaseDist:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = PhaseDist.build(_phase_dist_uncached(self.cfg, key))
+            self._entries[key] = entry
+        return entry
+
+    def admits_instant(self, key: str) -> bool:
+        """Whether any positive-mass candidate under *key* is instant-reservable."""
+        hit = self._admits_instant.get(key)
+        if hit is None:
+            hit = False
+            for name, p in self.get(key).dist.items():
+                spec = self.op_table.spec(name) if float(p) > 0.0 else None
+                if spec is not None and spec.instant:
+                    hit = True
+                    break
+            self._admits_instant[key] = hit
+        return hit
+
+
+_PHASE_DIST_TABLES: Dict[int, PhaseDistTable] = {}
+_PHASE_DIST_TABLES_MAX = 8
+
+
+def phase_dist_table(cfg: Dict[str, Any]) -> PhaseDistTable:
+    """Return the PhaseDistTable for cfg's phase_conditional, building it on first use."""
+    key = id(cfg.get("phase_conditional"))
+    table = _PHASE_DIST_TABLES.get(key)
+    if table is not None and table.matches(cfg):
+        return table
+    if len(_PHASE_DIST_TABLES) >= _PHASE_DIST_TABLES_MAX:
+        _PHASE_DIST_TABLES.clear()
+    table = PhaseDistTable(cfg)
+    _PHASE_DIST_TABLES[key] = table
+    return table
+
+
+def invalidate_phase_dist_cache() -> None:
+    _PHASE_DIST_TABLES.clear()
+
+
+def _phase_dist_entry(cfg: Dict[str, Any], key: str) -> PhaseDist:
+    # validate_pc logs the override merge per call; keep that path uncached
+    if _pol_validate_pc(cfg):
+        return PhaseDist.build(_phase_dist_uncached(cfg, key))
+    return phase_dist_table(cfg).get(key)
+
+
+def _phase_dist(cfg: Dict[str, Any], key: str) -> Dict[str, float]:
+    return _phase_dist_entry(cfg, key).dist
+
+
 def _sorted_candidates(dist: Dict[str, float], eps: float) -> List[Tuple[str, float]]:
     items = [(n, p) for n, p in dist.items() if float(p) > 0.0]
     items.sort(key=lambda x: -x[1])
@@ -1424,54 +1848,23 @@ def _sorted_candidates(dist: Dict[str, float], eps: float) -> List[Tuple[str, fl
     return items
 
 
-def _weighted_sample_candidates(dist: Dict[str, float], k: int, rng: Any) -> List[Tuple[str, float]]:
+def _weighted_sample_candidates(
+    dist: Dict[str, float],
+    k: int,
+    rng: Any,
+    prepared: Optional[PhaseDist] = None,
+    mode: str = "legacy",
+) -> List[Tuple[str, float]]:
     """Sample up to k unique candidates from dist by weight.
 
     - Interprets values in `dist` as non‑negative weights (no need to be normalized)
-    - Samples without replacement; each selected key's weight is zeroed before next draw
+    - Samples without replacement (see CandidateSampler for `mode`)
     - Uses `rng.random()` if available; otherwise falls back to `random.random()`
+    - `prepared` (from `_phase_dist_entry`) reuses its prebuilt sampler
     Returns list of (name, original_weight) preserving the original weights for logging/tie‑breaks.
     """
-    # Filter positive weights and keep original mapping
-    keys: List[str] = []
-    weights: List[float] = []
-    for n, p in dist.items():
-        try:
-            w = float(p)
-        except Exception:
-            w = 0.0
-        if w > 0.0:
-            keys.append(str(n))
-            weights.append(w)
-    if not keys:
-        return []
-    k = max(0, min(int(k), len(keys)))
-    if k == 0:
-        return []
-    # Iterative weighted draws without replacement
-    out: List[Tuple[str, float]] = []
-    for _ in range(k):
-        tot = sum(weights)
-        if tot <= 0.0:
-            break
-        try:
-            r = (rng.random() if hasattr(rng, "random") else __import__("random").random()) * tot
-        except Exception:
-            from random import random as _r
-            r = _r() * tot
-        acc = 0.0
-        idx = len(keys) - 1
-        for i, w in enumerate(weights):
-            acc += w
-            if r <= acc:
-                idx = i
-                break
-        name = keys[idx]
-        # Record original weight from dist
-        out.append((name, float(dist.get(name, 0.0))))
-        # Zero out to avoid reselection
-        weights[idx] = 0.0
-    return out
+    sampler = prepared.sampler if prepared is not None else CandidateSampler.from_dist(dist)
+    return sampler.sample(k, rng, mode=mode)
 
 
 def validate_phase_conditional(cfg: Dict[str, Any]) -> Dict[str, Any]:
@@ -1511,16 +1904,16 @@ def validate_phase_conditional(cfg: Dict[str, Any]) -> Dict[str, Any]:
         return len(vals), pos, s, top, bad_names, nonpos
 
     if not pc:
-        _log("[proposer][pc] EMPTY (no keys)")
+        _log("[proposer][pc] EMPTY (no keys)", level=LOG_SUMMARY)
         return out
 
-    _log(f"[proposer][pc] keys={len(pc)}")
+    _log(lambda: f"[proposer][pc] keys={len(pc)}")
     for k in sorted(pc.keys()):
         v = pc.get(k)
         if not isinstance(v, dict):
             out["keys"] += 1
             out["empty"] += 1
-            _log(f"[proposer][pc] {k}: invalid type={type(v).__name__}")
+            _log(lambda: f"[proposer][pc] {k}: invalid type={type(v).__name__}")
             continue
         cnt, pos, s, top, bad, nonpos = _summ(v)
         out["keys"] += 1
@@ -1532,23 +1925,35 @@ def validate_phase_conditional(cfg: Dict[str, Any]) -> Dict[str, Any]:
             out["not_normalized"] += 1
         top_s = ", ".join([f"{n}:{p:.4f}" for (n, p) in top])
         _log(
-            f"[proposer][pc] {k}: cnt={cnt} pos={pos} sum={s:.6f}"
+            lambda: f"[proposer][pc] {k}: cnt={cnt} pos={pos} sum={s:.6f}"
             + (f" top=[{top_s}]" if top else "")
         )
 
     _log(
-        f"[proposer][pc] summary: keys={out['keys']} empty={out['empty']} invalid_names={out['invalid_names']} nonpos={out['nonpos']} not_normalized={out['not_normalized']}"
+        lambda: f"[proposer][pc] summary: keys={out['keys']} empty={out['empty']} invalid_names={out['invalid_names']} nonpos={out['nonpos']} not_normalized={out['not_normalized']}",
+        level=LOG_SUMMARY,
     )
     return out
 
 
-def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: ResourceView, addr_sampler: AddressSampler, rng: Any) -> ProposeResult:
+def propose(
+    now: float,
+    hook: Dict[str, Any],
+    cfg: Dict[str, Any],
+    res_view: ResourceView,
+    addr_sampler: AddressSampler,
+    rng: Any,
+    phase_key: Optional[Tuple[str, Optional[str], bool]] = None,
+) -> ProposeResult:
     """
     Top‑N greedy proposer (single-op batch, pure):
       - Reads phase-conditional distribution
       - Filters/samples targets and checks earliest feasible start within window
       - Picks earliest start among evaluated candidates with tie-break on prob
 
+    phase_key is an optional _derive_phase_key() result the caller already
+    computed for (hook, now).
+
     Returns a ProposeResult that includes the selected batch (if any) and
     structured diagnostics for evaluated candidates.
     """
@@ -1563,8 +1968,9 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
         return ProposeResult(batch=batch, diagnostics=diagnostics)
 
     # Phase distribution
-    key = _phase_key(cfg, hook, res_view, now)
-    dist = _phase_dist(cfg, key)
+    key = _phase_key(cfg, hook, res_view, now, phase_key)
+    pdist = _phase_dist_entry(cfg, key)
+    dist = pdist.dist
     if not dist:
         return _build_result(None)
 
@@ -1576,13 +1982,13 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
     try:
         # Debug: show distribution used for this phase key
         _log(
-            f"[proposer] dist for key={key}: { {k: float(v) for k, v in dist.items()} }"
+            lambda: f"[proposer] dist for key={key}: { {k: float(v) for k, v in dist.items()} }"
         )
     except Exception:
         pass
 
     # Candidate selection: weighted sampling by phase_conditional values
-    cands = _weighted_sample_candidates(dist, topN, rng)
+    cands = _weighted_sample_candidates(dist, topN, rng, prepared=pdist, mode=_pol_candidate_sampler(cfg))
     # Fallback to deterministic topN if sampling yields none
     if not cands:
         cands = _sorted_candidates(dist, eps)[:topN]
@@ -1592,8 +1998,8 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
     best: Optional[Tuple[float, ProposedOp, float, List[ProposedOp]]] = None  # (t0, first_op, prob, full_plan)
     tried = 0
     try:
-        _log(f"[proposer] candidates (topN={topN}): {[(n, round(p, 6)) for (n,p) in cands]}")
-        _log(f"[proposer] window_us={W} maxtry={maxtry} epsilon_greedy={eps}")
+        _log(lambda: f"[proposer] candidates (topN={topN}): {[(n, round(p, 6)) for (n,p) in cands]}")
+        _log(lambda: f"[proposer] window_us={W} maxtry={maxtry} epsilon_greedy={eps}")
     except Exception:
         pass
     for name, prob in cands:
@@ -1615,7 +2021,7 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
                 AttemptRecord(name=name, prob=prob_val, reason="state_block", details=details)
             )
             try:
-                if blocked_info:
+                if blocked_info and log_enabled(LOG_DEBUG):
                     groups_str = ",".join(blocked_info.groups)
                     extra = []
                     if blocked_info.die is not None:
@@ -1624,16 +2030,16 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
                         extra.append(f"plane={blocked_info.plane}")
                     extra_payload = f" {' '.join(extra)}" if extra else ""
                     _log(
-                        f"[proposer] try name={name} p={prob:.6f} -> state_block axis={blocked_info.axis} state={blocked_info.state} base={blocked_info.base} groups={groups_str}{extra_payload}"
+                        lambda: f"[proposer] try name={name} p={prob:.6f} -> state_block axis={blocked_info.axis} state={blocked_info.state} base={blocked_info.base} groups={groups_str}{extra_payload}"
                     )
                 else:
-                    _log(f"[proposer] try name={name} p={prob:.6f} -> state_block")
+                    _log(lambda: f"[proposer] try name={name} p={prob:.6f} -> state_block")
             except Exception:
                 pass
             continue
         # Decide target source: (E/P/R) AddressManager sampling vs hook-provided targets for non-E/P/R
         sel_die = hook.get("die")
-        base = str(((cfg.get("op_names", {}) or {}).get(name, {}) or {}).get("base"))
+        base = _op_base_of(cfg, name)
         targets: List[Address] = []
         used_hook_ctx = False
         if _is_addr_sampling_base(base):
@@ -1652,7 +2058,7 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
                     AttemptRecord(name=name, prob=prob_val, reason="sample_none")
                 )
                 try:
-                    _log(f"[proposer] try name={name} p={prob:.6f} -> sample_none")
+                    _log(lambda: f"[proposer] try name={name} p={prob:.6f} -> sample_none")
                 except Exception:
                     pass
                 continue
@@ -1684,20 +2090,20 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
                     plane = max(0, min(plane, planes - 1))
                 targets = [Address(die=die, plane=plane, block=0, page=None)]
                 try:
-                    _log(f"[proposer] non‑EPR fallback targets -> [(die={die}, plane={plane}, block=0, page=None)] for base={base}")
+                    _log(lambda: f"[proposer] non‑EPR fallback targets -> [(die={die}, plane={plane}, block=0, page=None)] for base={base}")
                 except Exception:
                     pass
             used_hook_ctx = True
         # Build operation and evaluate earliest feasible start
         op_stub = _build_op(cfg, name, targets)
         scope = _base_scope(cfg, op_stub.base)
-        t0 = res_view.feasible_at(op_stub, targets, start_hint=float(now), scope=scope)
+        t0 = _feasible_first(res_view, cfg, op_stub, targets, now, scope)
         if t0 is None:
             attempt_records.append(
                 AttemptRecord(name=name, prob=prob_val, reason="feasible_none")
             )
             try:
-                _log(f"[proposer] try name={name} p={prob:.6f} -> feasible_none")
+                _log(lambda: f"[proposer] try name={name} p={prob:.6f} -> feasible_none")
             except Exception:
                 pass
             continue
@@ -1713,7 +2119,7 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
                 )
             )
             try:
-                _log(f"[proposer] try name={name} p={prob:.6f} -> window_exceed(t0={float(t0):.3f}, now={float(now):.3f}, W={W})")
+                _log(lambda: f"[proposer] try name={name} p={prob:.6f} -> window_exceed(t0={float(t0):.3f}, now={float(now):.3f}, W={W})")
             except Exception:
                 pass
             continue
@@ -1730,7 +2136,7 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
                 )
             )
             try:
-                _log(f"[proposer] try name={name} p={prob:.6f} -> preflight_fail")
+                _log(lambda: f"[proposer] try name={name} p={prob:.6f} -> preflight_fail")
             except Exception:
                 pass
             continue
@@ -1757,7 +2163,7 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
             AttemptRecord(name=name, prob=prob_val, reason="ok", details=rec_details)
         )
         try:
-            _log(f"[proposer] try name={name} p={prob:.6f} -> ok(t0={float(p_first.start_us):.3f})")
+            _log(lambda: f"[proposer] try name={name} p={prob:.6f} -> ok(t0={float(p_first.start_us):.3f})")
         except Exception:
             pass
 
@@ -1781,7 +2187,8 @@ def propose(now: float, hook: Dict[str, Any], cfg: Dict[str, Any], res_view: Res
     try:
         sel = metrics["selected"]
         _log(
-            f"[proposer] selected op={sel['op_name']} base={sel['base']} start_us={float(sel['start_us']):.3f} len_batch={int(sel['len_batch'])}"
+            lambda: f"[proposer] selected op={sel['op_name']} base={sel['base']} start_us={float(sel['start_us']):.3f} len_batch={int(sel['len_batch'])}",
+            level=LOG_SUMMARY,
         )
     except Exception:
         pass
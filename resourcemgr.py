@@ -2,7 +2,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 import os
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Set, Callable
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 SIM_RES_US = 0.01
 def quantize(t: float) -> float: return round(t / SIM_RES_US) * SIM_RES_US
 class Scope(Enum): NONE=0; PLANE_SET=1; DIE_WIDE=2
@@ -30,71 +31,587 @@ PROGRAM_LATCH_KINDS = {
 }
 @dataclass
 class _StateInterval: die:int; plane:int; op_base:str; state:str; start_us:float; end_us:float
+class _PlaneSegs:
+    """Columnar state segments of one (die, plane), sorted by start.
+
+    start/end are float64, base/state are int32 ids into the owning
+    _StateTimeline's intern table. Arrays grow geometrically; only the first
+    n rows are live.
+    """
+
+    __slots__ = ("start", "end", "base", "state", "n")
+
+    def __init__(self, cap: int = 16) -> None:
+        import numpy as np
+        self.start = np.empty(cap, dtype=np.float64)
+        self.end = np.empty(cap, dtype=np.float64)
+        self.base = np.empty(cap, dtype=np.int32)
+        self.state = np.empty(cap, dtype=np.int32)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _grow(self, need: int) -> None:
+        import numpy as np
+        cap = max(16, len(self.start))
+        while cap < need:
+            cap *= 2
+        if cap == len(self.start):
+            return
+        for name in self.__slots__[:4]:
+            old = getattr(self, name)
+            arr = np.empty(cap, dtype=old.dtype)
+            arr[: self.n] = old[: self.n]
+            setattr(self, name, arr)
+
+    def insert(self, i: int, s0: float, s1: float, base: int, state: int) -> None:
+        n = self.n
+        if n == len(self.start):
+            self._grow(n + 1)
+        if i < n:
+            for arr in (self.start, self.end, self.base, self.state):
+                arr[i + 1 : n + 1] = arr[i:n]
+        self.start[i], self.end[i], self.base[i], self.state[i] = s0, s1, base, state
+        self.n = n + 1
+
+    def keep(self, mask: Any) -> None:
+        """Drop live rows where mask is False (order preserved)."""
+        m = int(mask.sum())
+        for arr in (self.start, self.end, self.base, self.state):
+            arr[:m] = arr[: self.n][mask]
+        self.n = m
+
+    def drop_prefix(self, k: int) -> None:
+        n = self.n
+        for arr in (self.start, self.end, self.base, self.state):
+            arr[: n - k] = arr[k:n]
+        self.n = n - k
+
+    @property
+    def starts(self) -> Any:
+        return self.start[: self.n]
+
+    @property
+    def ends(self) -> Any:
+        return self.end[: self.n]
+
+
+class _ByPlaneView(Mapping):
+    """Read-only {(die, plane): [_StateInterval, ...]} view over the columnar timeline."""
+
+    def __init__(self, st: "_StateTimeline") -> None:
+        self._st = st
+
+    def __getitem__(self, key: Tuple[int, int]) -> List[_StateInterval]:
+        segs = self._st._planes[key]
+        return [self._st._interval(key, segs, i) for i in range(segs.n)]
+
+    def __iter__(self):
+        return iter(self._st._planes)
+
+    def __len__(self) -> int:
+        return len(self._st._planes)
+
+
 class _StateTimeline:
-    def __init__(self): self.by_plane:Dict[Tuple[int,int],List[_StateInterval]]={}; self._starts_by_plane:Dict[Tuple[int,int],List[float]]={}
-    def _insert_plane(self,key:Tuple[int,int],seg:_StateInterval):
-        lst=self.by_plane.setdefault(key,[]); starts=self._starts_by_plane.setdefault(key,[s.start_us for s in lst]); import bisect as b
-        if len(starts)!=len(lst): starts[:]=[s.start_us for s in lst]
-        i=b.bisect_left(starts,seg.start_us); lst.insert(i,seg); starts.insert(i,seg.start_us)
-    def reserve_op(self,die:int,plane:int,op_base:str,states:List[Tuple[str,float]],start_us:float):
-        t=start_us
-        for (st,dur) in states: self._insert_plane((die,plane),_StateInterval(die,plane,op_base,st,t,t+float(dur))); t+=float(dur)
-    def state_at(self,die:int,plane:int,t:float)->Optional[str]:
-        key=(die,plane); lst=self.by_plane.get(key,[]); 
-        if not lst: return None
-        starts=self._starts_by_plane.get(key); 
-        if starts is None or len(starts)!=len(lst): starts=[s.start_us for s in lst]; self._starts_by_plane[key]=starts
-        import bisect as b; i=b.bisect_right(starts,t)-1
-        if 0<=i<len(lst): s=lst[i]; 
-        else: return None
-        return f"{s.op_base}.{s.state}" if (s.start_us<=t<s.end_us) else None
-    def overlaps_plane(self,die:int,plane:int,start:float,end:float,pred=None)->bool:
-        key=(die,plane); lst=self.by_plane.get(key,[]); 
-        if not lst: return False
-        starts=self._starts_by_plane.get(key); 
-        if starts is None or len(starts)!=len(lst): starts=[s.start_us for s in lst]; self._starts_by_plane[key]=starts
-        import bisect as b; idx=b.bisect_left(starts,end); i=max(0,idx-1)
-        while i<len(lst) and lst[i].start_us<end:
-            seg=lst[i]
-            if seg.start_us<end and start<seg.end_us and (pred is None or pred(seg)): return True
-            i+=1
-        return False
-    def truncate_after(self, die:int, plane:int, at_us:float, pred=None) -> None:
+    """Per-(die, plane) op-state segments in growable NumPy columns.
+
+    Base/state names are interned once per timeline; lookups are
+    searchsorted over the start column. by_plane is a read-only
+    _StateInterval view for callers that want objects.
+    """
+
+    def __init__(self) -> None:
+        self._planes: Dict[Tuple[int, int], _PlaneSegs] = {}
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._names_arr: Any = None
+
+    @property
+    def by_plane(self) -> _ByPlaneView:
+        return _ByPlaneView(self)
+
+    def _intern(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._names_arr = None
+        return i
+
+    def names(self) -> Any:
+        """Intern table as an object array (index with base/state ids)."""
+        if self._names_arr is None or len(self._names_arr) != len(self._names):
+            import numpy as np
+            self._names_arr = np.array(self._names, dtype=object)
+        return self._names_arr
+
+    def plane(self, key: Tuple[int, int]) -> Optional[_PlaneSegs]:
+        segs = self._planes.get(key)
+        return segs if segs is not None and segs.n else None
+
+    def labels(self, segs: _PlaneSegs, suffix: Optional[str] = None) -> Any:
+        """Object array of "BASE.STATE" (or "BASE.<suffix>") per live segment."""
+        names = self.names()
+        bases = names[segs.base[: segs.n]]
+        if suffix is not None:
+            return bases + ("." + suffix)
+        return bases + "." + names[segs.state[: segs.n]]
+
+    def _interval(self, key: Tuple[int, int], segs: _PlaneSegs, i: int) -> _StateInterval:
+        return _StateInterval(
+            key[0], key[1], self._names[int(segs.base[i])], self._names[int(segs.state[i])],
+            float(segs.start[i]), float(segs.end[i]),
+        )
+
+    def _insert_plane(self, key: Tuple[int, int], seg: _StateInterval) -> None:
+        import numpy as np
+        segs = self._planes.get(key)
+        if segs is None:
+            segs = self._planes[key] = _PlaneSegs()
+        s0 = float(seg.start_us)
+        n = segs.n
+        # Appends (the common case) skip the search; ties go before equal starts
+        i = n if (n == 0 or segs.start[n - 1] < s0) else int(np.searchsorted(segs.starts, s0, side="left"))
+        segs.insert(i, s0, float(seg.end_us), self._intern(seg.op_base), self._intern(seg.state))
+
+    def append_plane(self, key: Tuple[int, int], op_base: str, state: str, s0: float, s1: float) -> None:
+        """Append without re-sorting (loading segments already in timeline order)."""
+        segs = self._planes.get(key)
+        if segs is None:
+            segs = self._planes[key] = _PlaneSegs()
+        segs.insert(segs.n, float(s0), float(s1), self._intern(op_base), self._intern(state))
+
+    def reserve_op(self, die: int, plane: int, op_base: str, states: List[Tuple[str, float]], start_us: float):
+        t = start_us
+        for (st, dur) in states:
+            self._insert_plane((die, plane), _StateInterval(die, plane, op_base, st, t, t + float(dur)))
+            t += float(dur)
+
+    def index_at(self, segs: _PlaneSegs, t: float) -> int:
+        """Index of the last segment starting at/before t (-1 when none)."""
+        import numpy as np
+        return int(np.searchsorted(segs.starts, t, side="right")) - 1
+
+    def state_at(self, die: int, plane: int, t: float) -> Optional[str]:
+        segs = self.plane((die, plane))
+        if segs is None:
+            return None
+        i = self.index_at(segs, t)
+        if i < 0:
+            return None
+        if segs.start[i] <= t < segs.end[i]:
+            return f"{self._names[segs.base[i]]}.{self._names[segs.state[i]]}"
+        return None
+
+    def next_boundary_after(self, t: float, die: Optional[int] = None) -> Optional[float]:
+        """Earliest segment start/end strictly after t across all planes (of die, if given; None when none)."""
+        import numpy as np
+        out: Optional[float] = None
+        for key, segs in self._planes.items():
+            n = segs.n
+            if die is not None and key[0] != die:
+                continue
+            if not n:
+                continue
+            i = int(np.searchsorted(segs.starts, t, side="right"))
+            nxt = float(segs.start[i]) if i < n else None
+            if i > 0:
+                e = float(segs.end[i - 1])
+                if e > t and (nxt is None or e < nxt):
+                    nxt = e
+            if nxt is not None and (out is None or nxt < out):
+                out = nxt
+        return out
+
+    def overlaps_plane(self, die: int, plane: int, start: float, end: float, pred=None) -> bool:
+        key = (die, plane)
+        segs = self.plane(key)
+        if segs is None:
+            return False
+        import numpy as np
+        # Starts are sorted, so the only segment starting before `end` that
+        # the scan examines is the last one
+        i = int(np.searchsorted(segs.starts, end, side="left")) - 1
+        if i < 0 or not (start < segs.end[i]):
+            return False
+        return pred is None or bool(pred(self._interval(key, segs, i)))
+
+    def truncate_after(self, die: int, plane: int, at_us: float, pred=None) -> None:
         """Truncate or remove segments at/after at_us that match pred.
 
         - If a matching segment straddles at_us, set its end_us to at_us.
         - Remove any subsequent matching segments with start_us >= at_us.
         - Non‑matching segments are left untouched.
         """
-        key=(die,plane); lst=self.by_plane.get(key,[])
-        if not lst: return
-        t=float(at_us)
-        starts=self._starts_by_plane.get(key)
-        if starts is None or len(starts)!=len(lst):
-            starts=[s.start_us for s in lst]; self._starts_by_plane[key]=starts
-        import bisect as b
-        j=b.bisect_left(starts,t) if starts else 0
-        i=j-1
+        key = (die, plane)
+        segs = self.plane(key)
+        if segs is None:
+            return
+        import numpy as np
+        t = float(at_us)
+        j = int(np.searchsorted(segs.starts, t, side="left"))
+        i = j - 1
         # Adjust straddling segment strictly before t
-        if 0<=i<len(lst):
-            seg=lst[i]
-            if seg.start_us < t < seg.end_us and (pred is None or pred(seg)):
-                seg.end_us = t
+        if i >= 0 and segs.start[i] < t < segs.end[i] and (pred is None or pred(self._interval(key, segs, i))):
+            segs.end[i] = t
         # Remove any matching segments at or after t, even if interleaved with non-matching ones
-        removed = False
-        def _match(s: _StateInterval) -> bool:
-            return True if pred is None else bool(pred(s))
-        new_lst: List[_StateInterval] = []
-        for idx, seg in enumerate(lst):
-            if idx >= j and seg.start_us >= t and _match(seg):
-                removed = True
+        if j >= segs.n:
+            return
+        mask = np.ones(segs.n, dtype=bool)
+        if pred is None:
+            mask[j:] = False
+        else:
+            for k in range(j, segs.n):
+                if pred(self._interval(key, segs, k)):
+                    mask[k] = False
+        if not mask.all():
+            segs.keep(mask)
+
+    def retire_before(self, before_us: float) -> List[_StateInterval]:
+        """Drop per-plane prefixes of segments ending at/before before_us; return them.
+
+        The last segment of each retired prefix is kept as an anchor so that
+        phase_key_at() can still derive "<BASE>.END" for queries at/after before_us.
+        """
+        import numpy as np
+        t = float(before_us)
+        out: List[_StateInterval] = []
+        for key, segs in self._planes.items():
+            live = segs.ends > t
+            k = int(np.argmax(live)) if live.any() else segs.n
+            if k <= 1:
                 continue
-            new_lst.append(seg)
+            out.extend(self._interval(key, segs, i) for i in range(k - 1))
+            segs.drop_prefix(k - 1)
+        return out
+
+    def _plane_segments(self, key: Tuple[int, int], segs: _PlaneSegs):
+        die, plane = key
+        names = self._names
+        n = segs.n
+        for b, s, s0, s1 in zip(segs.base[:n].tolist(), segs.state[:n].tolist(), segs.start[:n].tolist(), segs.end[:n].tolist()):
+            yield (die, plane, names[b], names[s], s0, s1)
+
+    def segments(self):
+        """Yield (die, plane, op_base, state, start_us, end_us) in plane-insertion, then start order."""
+        for key, segs in self._planes.items():
+            yield from self._plane_segments(key, segs)
+
+    def plane_streams(self) -> List[Tuple[Tuple[int, int], Any]]:
+        """[((die, plane), start-ordered segment iterator)] in plane-insertion order."""
+        return [(key, self._plane_segments(key, segs)) for key, segs in self._planes.items()]
+
+
+def _tuple_span(item: Any) -> Tuple[float, float]:
+    return (float(item[0]), float(item[1]))
+
+
+def _window_span(item: Any) -> Tuple[float, float]:
+    return (float(item.start), float(item.end))
+
+
+class _IntervalIndex:
+    """Sorted interval container with bisect-based overlap queries.
+
+    Items are kept ordered by (start, end) alongside a prefix-max of end times,
+    so `overlapping(a, b)` touches only O(log n + k) entries instead of scanning
+    every committed window. Behaves like a read-only list of items for
+    snapshot/export callers; iteration and indexing follow insertion order,
+    as the plain lists it replaces did.
+    """
+
+    __slots__ = ("_span", "_starts", "_ends", "_maxend", "_items", "_seq", "_next_seq", "_in_order")
+
+    def __init__(self, items: Any = (), span: Callable[[Any], Tuple[float, float]] = _tuple_span) -> None:
+        self._span = span
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._maxend: List[float] = []
+        self._items: List[Any] = []
+        # insertion sequence per sorted slot; _in_order while every append landed last
+        self._seq: List[int] = []
+        self._next_seq = 0
+        self._in_order = True
+        self.extend(items)
+
+    def _inserted(self) -> List[Any]:
+        if self._in_order:
+            return self._items
+        return [item for _, item in sorted(zip(self._seq, self._items), key=lambda pair: pair[0])]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._inserted())
+
+    def __getitem__(self, idx: Any) -> Any:
+        return self._inserted()[idx]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _IntervalIndex):
+            return self._inserted() == other._inserted()
+        if isinstance(other, (list, tuple)):
+            return self._inserted() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"_IntervalIndex({self._inserted()!r})"
+
+    def append(self, item: Any) -> None:
+        s, e = self._span(item)
+        starts = self._starts
+        seq = self._next_seq
+        self._next_seq = seq + 1
+        if not starts or (starts[-1], self._ends[-1]) <= (s, e):
+            starts.append(s)
+            self._ends.append(e)
+            self._items.append(item)
+            self._seq.append(seq)
+            prev = self._maxend[-1] if self._maxend else e
+            self._maxend.append(e if e > prev else prev)
+            return
+        import bisect as b
+        i = b.bisect_right(starts, s)
+        while i > 0 and starts[i - 1] == s and self._ends[i - 1] > e:
+            i -= 1
+        starts.insert(i, s)
+        self._ends.insert(i, e)
+        self._items.insert(i, item)
+        self._seq.insert(i, seq)
+        self._in_order = False
+        self._maxend.insert(i, e)
+        self._refresh_maxend(i)
+
+    def extend(self, items: Any) -> None:
+        for item in items or ():
+            self.append(item)
+
+    def _refresh_maxend(self, i: int) -> None:
+        ends = self._ends
+        maxend = self._maxend
+        acc = maxend[i - 1] if i > 0 else float("-inf")
+        for j in range(i, len(ends)):
+            e = ends[j]
+            if e > acc:
+                acc = e
+            maxend[j] = acc
+
+    def overlapping(self, start: float, end: float) -> List[Any]:
+        """Return items whose [s, e) overlaps [start, end)."""
+        import bisect as b
+        hi = b.bisect_left(self._starts, end)
+        lo = b.bisect_right(self._maxend, start, 0, hi)
+        ends = self._ends
+        items = self._items
+        return [items[j] for j in range(lo, hi) if ends[j] > start]
+
+    def any_overlap(self, start: float, end: float) -> bool:
+        import bisect as b
+        hi = b.bisect_left(self._starts, end)
+        lo = b.bisect_right(self._maxend, start, 0, hi)
+        ends = self._ends
+        for j in range(lo, hi):
+            if ends[j] > start:
+                return True
+        return False
+
+    def overlap_end(self, start: float, end: float, pred: Optional[Callable[[Any], bool]] = None) -> Optional[float]:
+        """Latest end among items overlapping [start, end) (and matching pred), or None."""
+        out: Optional[float] = None
+        for item in self.overlapping(start, end):
+            if pred is not None and not pred(item):
+                continue
+            e = self._span(item)[1]
+            if out is None or e > out:
+                out = e
+        return out
+
+    def max_end(self, default: float = 0.0) -> float:
+        return self._maxend[-1] if self._maxend else default
+
+    def _slot(self, item: Any) -> int:
+        import bisect as b
+        s = self._span(item)[0]
+        starts = self._starts
+        items = self._items
+        lo = b.bisect_left(starts, s)
+        hi = b.bisect_right(starts, s, lo)
+        for j in range(lo, hi):
+            if items[j] is item:
+                return j
+        for j in range(lo, hi):
+            if items[j] == item:
+                return j
+        raise ValueError(f"{item!r} is not in the index")
+
+    def _pop_slot(self, j: int) -> int:
+        del self._starts[j], self._ends[j], self._items[j], self._maxend[j]
+        return self._seq.pop(j)
+
+    def remove(self, item: Any) -> None:
+        """Drop one item, located by bisecting on its start."""
+        j = self._slot(item)
+        self._pop_slot(j)
+        if j < len(self._items):
+            self._refresh_maxend(j)
+
+    def replace(self, old_item: Any, new_item: Any) -> None:
+        """Swap old_item for new_item in place; new_item keeps old_item's insertion position."""
+        import bisect as b
+        j = self._slot(old_item)
+        seq = self._pop_slot(j)
+        s, e = self._span(new_item)
+        starts = self._starts
+        ends = self._ends
+        order = self._seq
+        i = b.bisect_left(starts, s)
+        while i < len(starts) and starts[i] == s and (ends[i], order[i]) < (e, seq):
+            i += 1
+        starts.insert(i, s)
+        ends.insert(i, e)
+        self._items.insert(i, new_item)
+        order.insert(i, seq)
+        self._maxend.insert(i, e)
+        if i != j:
+            self._in_order = False
+        self._refresh_maxend(min(i, j))
+
+    def retire_before(self, before_us: float) -> int:
+        """Drop items ending at/before before_us; return how many were removed."""
+        import bisect as b
+        t = float(before_us)
+        hi = b.bisect_left(self._starts, t)
+        keep = [j for j in range(hi) if self._ends[j] > t]
+        removed = hi - len(keep)
         if removed:
-            self.by_plane[key] = new_lst
-            self._starts_by_plane[key] = [s.start_us for s in new_lst]
-        else:
-            self._starts_by_plane[key]=[s.start_us for s in lst]
+            for arr in (self._starts, self._ends, self._items, self._seq):
+                arr[:hi] = [arr[j] for j in keep]
+            del self._maxend[:removed]
+            self._refresh_maxend(0)
+        return removed
+
+
+# State family -> CFG mapping of state name to exclusion group names
+EXCLUSION_FAMILIES: Dict[str, str] = {
+    "op_state": "exclusions_by_op_state",
+    "latch": "exclusions_by_latch_state",
+    "suspend": "exclusions_by_suspend_state",
+    "odt": "exclusions_by_odt_state",
+    "cache": "exclusions_by_cache_state",
+}
+
+
+class ExclusionMatrix:
+    """Compiled CFG exclusion rules as per-state bitmasks over interned bases.
+
+    Each base listed in `exclusion_groups` gets one bit; every group and every
+    (family, state) entry of the `exclusions_by_*` maps becomes the OR of its
+    bases' bits. "Is base blocked in this state" is then a single AND instead
+    of walking group lists.
+    """
+
+    def __init__(self, cfg: Dict[str, Any]) -> None:
+        self.groups_src = cfg.get("exclusion_groups")
+        self.family_src = {fam: cfg.get(key) for fam, key in EXCLUSION_FAMILIES.items()}
+        self._bit: Dict[str, int] = {}
+        self._group_bases: Dict[str, Tuple[str, ...]] = {}
+        self._group_mask: Dict[str, int] = {}
+        for g, lst in (self.groups_src or {}).items():
+            bases = tuple(str(x) for x in (lst or []))
+            mask = 0
+            for b in bases:
+                bit = self._bit.get(b)
+                if bit is None:
+                    bit = self._bit[b] = 1 << len(self._bit)
+                mask |= bit
+            self._group_bases[str(g)] = bases
+            self._group_mask[str(g)] = mask
+        self._state_groups: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self._state_mask: Dict[Tuple[str, str], int] = {}
+        for fam, src in self.family_src.items():
+            for st, groups in (src or {}).items():
+                gs = tuple(str(g) for g in (groups or []))
+                self._state_groups[(fam, str(st))] = gs
+                self._state_mask[(fam, str(st))] = self.groups_mask(gs)
+        self._excluded: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+
+    def matches(self, cfg: Dict[str, Any]) -> bool:
+        if cfg.get("exclusion_groups") is not self.groups_src:
+            return False
+        return all(cfg.get(key) is self.family_src[fam] for fam, key in EXCLUSION_FAMILIES.items())
+
+    def base_bit(self, base: str) -> int:
+        return self._bit.get(str(base), 0)
+
+    def groups_mask(self, groups: Any) -> int:
+        mask = 0
+        gm = self._group_mask
+        for g in groups or ():
+            mask |= gm.get(str(g), 0)
+        return mask
+
+    def state_mask(self, family: str, state: Any) -> int:
+        return self._state_mask.get((family, str(state)), 0)
+
+    def state_groups(self, family: str, state: Any) -> Tuple[str, ...]:
+        return self._state_groups.get((family, str(state)), ())
+
+    def blocks(self, family: str, state: Any, base: str) -> bool:
+        return bool(self._state_mask.get((family, str(state)), 0) & self._bit.get(str(base), 0))
+
+    def blocking_groups(self, base: str, groups: Any) -> Tuple[str, ...]:
+        """Groups (in the given order) whose member bases include base."""
+        bit = self._bit.get(str(base), 0)
+        if not bit:
+            return ()
+        gm = self._group_mask
+        return tuple(str(g) for g in (groups or ()) if gm.get(str(g), 0) & bit)
+
+    def excluded_bases(self, family: str, state: Any) -> Tuple[str, ...]:
+        """Bases blocked in state, deduplicated in group/config order."""
+        key = (family, str(state))
+        out = self._excluded.get(key)
+        if out is None:
+            seen: Set[str] = set()
+            acc: List[str] = []
+            for g in self._state_groups.get(key, ()):
+                for b in self._group_bases.get(g, ()):
+                    if b not in seen:
+                        seen.add(b)
+                        acc.append(b)
+            out = self._excluded[key] = tuple(acc)
+        return out
+
+
+_EXCLUSION_MATRICES: Dict[Tuple[int, ...], ExclusionMatrix] = {}
+_EXCLUSION_MATRICES_MAX = 8
+
+
+def exclusion_matrix(cfg: Dict[str, Any]) -> ExclusionMatrix:
+    """Return the compiled ExclusionMatrix for cfg, building it on first use.
+
+    Keyed by identity of the exclusion mappings, so shallow cfg copies share
+    one matrix. Callers that mutate those mappings in place must call
+    `invalidate_exclusion_cache()`.
+    """
+    cfg = cfg or {}
+    key = (id(cfg.get("exclusion_groups")),) + tuple(id(cfg.get(k)) for k in EXCLUSION_FAMILIES.values())
+    m = _EXCLUSION_MATRICES.get(key)
+    if m is not None and m.matches(cfg):
+        return m
+    if len(_EXCLUSION_MATRICES) >= _EXCLUSION_MATRICES_MAX:
+        _EXCLUSION_MATRICES.clear()
+    m = _EXCLUSION_MATRICES[key] = ExclusionMatrix(cfg)
+    return m
+
+
+def invalidate_exclusion_cache() -> None:
+    _EXCLUSION_MATRICES.clear()
+
+
 @dataclass
 class _StOpEntry:
     die: int
@@ -164,12 +681,15 @@ class ResourceManager:
         self.dies = int(dies)
         self.planes = int(planes)
         self._avail: Dict[Tuple[int, int], float] = {(d, p): 0.0 for d in range(self.dies) for p in range(self.planes)}
-        self._plane_resv: Dict[Tuple[int, int], List[Tuple[float, float]]] = {(d, p): [] for d in range(self.dies) for p in range(self.planes)}
-        self._bus_resv: List[Tuple[float, float]] = []
-        self._excl_global: List[ExclWindow] = []
-        self._excl_die: Dict[int, List[ExclWindow]] = {}
+        # Committed windows are held in sorted interval indexes (bisect overlap queries)
+        self._plane_resv: Dict[Tuple[int, int], _IntervalIndex] = {(d, p): _IntervalIndex() for d in range(self.dies) for p in range(self.planes)}
+        self._bus_resv: _IntervalIndex = _IntervalIndex()
+        self._excl_global: _IntervalIndex = _IntervalIndex(span=_window_span)
+        self._excl_die: Dict[int, _IntervalIndex] = {}
         self._latch: Dict[LatchKey, _LatchBucket] = {}
         self._st = _StateTimeline()
+        # Optional on-disk spill for state-timeline segments retired by compact()
+        self._st_archive_path: Optional[str] = None
         # runtime states for Proposer/Validator (PRD §5.4/5.5)
         self._odt_disabled: bool = False
         self._cache_read: Dict[Tuple[int, int], _CacheEntry] = {}
@@ -206,6 +726,11 @@ class ResourceManager:
             self._ALLOWED_SINGLE_SINGLE_BASES = set(default_allowed)
         self._program_base_whitelist: Set[str] = self._load_program_base_whitelist()
         self._last_resume_error: Optional[Dict[str, Any]] = None
+        # Monotonic state versions (see state_version()); bumped by every mutation
+        # that can change a proposal outcome
+        self._ver_global: int = 0
+        self._ver_bus: int = 0
+        self._ver_die: Dict[int, int] = {d: 0 for d in range(self.dies)}
 
     def _txn_record_latch(self, txn: _Txn, die: int, plane: int, entry: _LatchEntry) -> None:
         key = (int(die), int(plane))
@@ -217,7 +742,37 @@ class ResourceManager:
         bucket = self._latch.setdefault(key, {})
         bucket[entry.kind] = entry
 
+    def _touch(self, die: Optional[int] = None, bus: bool = False) -> None:
+        """Bump state versions for one die (every die when die is None) and optionally the bus."""
+        self._ver_global += 1
+        if die is None:
+            for d in self._ver_die:
+                self._ver_die[d] += 1
+        else:
+            self._ver_die[int(die)] = self._ver_die.get(int(die), 0) + 1
+        if bus:
+            self._ver_bus += 1
+
+    def state_version(self, die: Optional[int] = None) -> int:
+        """Monotonic version of state visible to die (global version when die is None).
+
+        A die version changes whenever anything a proposal on that die depends
+        on changes (die-local windows, latches, suspend/cache/ODT state, global
+        exclusions); the global version changes on every mutation.
+        """
+        if die is None:
+            return self._ver_global
+        return self._ver_die.get(int(die), 0)
+
+    def bus_version(self) -> int:
+        return self._ver_bus
+
+    def next_state_change_us(self, at_us: float) -> Optional[float]:
+        """Earliest op_state boundary after at_us on any (die, plane), or None."""
+        return self._st.next_boundary_after(quantize(at_us))
+
     def _remove_latch_entry(self, die: int, plane: int, kind: str) -> None:
+        self._touch(die)
         key = (int(die), int(plane))
         bucket = self._latch.get(key)
         if not bucket:
@@ -419,6 +974,9 @@ class ResourceManager:
                 return str(getattr(op, "name", "OP"))
 
     def _bus_segments(self, op: Any) -> List[Tuple[float, float]]:
+        compiled = getattr(op, "bus_offsets", None)
+        if compiled is not None:
+            return list(compiled)
         segs: List[Tuple[float, float]] = []
         t = 0.0
         for s in getattr(op, "states", []) or []:
@@ -429,6 +987,9 @@ class ResourceManager:
         return segs
 
     def _total_duration(self, op: Any) -> float:
+        compiled = getattr(op, "total_us", None)
+        if compiled is not None:
+            return float(compiled)
         return sum(float(getattr(s, "dur_us", 0.0)) for s in getattr(op, "states", []) or [])
 
     def _op_name(self, op: Any) -> Optional[str]:
@@ -489,9 +1050,8 @@ class ResourceManager:
         planes = list(range(self.planes)) if scope == Scope.DIE_WIDE else plane_set
         for p in planes:
             # committed windows
-            for (s, e) in self._plane_resv[(die, p)]:
-                if not (end <= s or e <= start):
-                    return False
+            if self._plane_resv[(die, p)].any_overlap(start, end):
+                return False
             # pending windows in this txn
             if pending:
                 for (s, e) in pending.get((die, p), []) or []:
@@ -504,9 +1064,8 @@ class ResourceManager:
         for (off0, off1) in self._bus_segments(op):
             a0, a1 = quantize(start + off0), quantize(start + off1)
             # committed bus windows
-            for (s, e) in self._bus_resv:
-                if not (a1 <= s or e <= a0):
-                    return False
+            if self._bus_resv.any_overlap(a0, a1):
+                return False
             # pending bus windows in this txn
             if pending:
                 for (s, e) in pending:
@@ -550,7 +1109,13 @@ class ResourceManager:
         kind: str,
         base: str,
         pending: Optional[List[ExclWindow]] = None,
+        conflicts: Optional[List[ExclWindow]] = None,
     ) -> bool:
+        """True when a die-level window conflicts by multiplicity.
+
+        conflicts: when given, every conflicting committed window is appended
+        (instead of stopping at the first) so callers can step past them.
+        """
         def overlap(a0: float, a1: float, b0: float, b1: float) -> bool:
             return not (a1 <= b0 or b1 <= a0)
 
@@ -580,11 +1145,16 @@ class ResourceManager:
                 )
             return False
         # committed windows
-        for w in self._excl_die.get(die, []):
+        committed = self._excl_die.get(die)
+        for w in (committed.overlapping(start, end) if committed is not None else []):
             if overlap(start, end, w.start, w.end):
                 other_kind = self._EXCL_TOKEN_MULTI if (self._EXCL_TOKEN_MULTI in w.tokens) else self._EXCL_TOKEN_SINGLE
                 if _conflict_by_kind(kind, other_kind, base, _extract_base_from_tokens(w.tokens)):
-                    return True
+                    if conflicts is None:
+                        return True
+                    conflicts.append(w)
+        if conflicts:
+            return True
         # include pending windows in current txn, if any
         if pending:
             for w in pending:
@@ -608,20 +1178,19 @@ class ResourceManager:
         - Block if op.base belongs to any base listed in CFG['exclusion_groups'][group].
         """
         base = self._op_base(op)
-        cfg = self.cfg or {}
-        groups_by_latch: Dict[str, List[str]] = (cfg.get("exclusions_by_latch_state") or {})
-        group_defs: Dict[str, List[str]] = (cfg.get("exclusion_groups") or {})
+        em = exclusion_matrix(self.cfg)
+        bit = em.base_bit(base)
+        if not bit:
+            # base is in no exclusion group: no latch can block it
+            return True
 
         def blocked_by_latch(die: int, plane: int) -> bool:
             active = self._active_latches(die, plane, start)
             if not active:
                 return False
             for entry in active:
-                groups = groups_by_latch.get(entry.kind, [])
-                for g in groups:
-                    bases = group_defs.get(g, [])
-                    if base in bases:
-                        return True
+                if em.state_mask("latch", entry.kind) & bit:
+                    return True
             return False
 
         die = targets[0].die
@@ -635,65 +1204,175 @@ class ResourceManager:
                 return False
         return True
 
+    @staticmethod
+    def _excl_blocks(w: ExclWindow, base: str) -> bool:
+        for tok in w.tokens:
+            if tok == "ANY":
+                return True
+            if tok.startswith("BASE:") and base == tok.split(":", 1)[1]:
+                return True
+        return False
+
     def _excl_ok(self, die: int, start: float, end: float, base: str) -> bool:
         def blocks(w: ExclWindow) -> bool:
-            for tok in w.tokens:
-                if tok == "ANY":
-                    return True
-                if tok.startswith("BASE:") and base == tok.split(":", 1)[1]:
-                    return True
-            return False
-        for w in self._excl_global:
-            if not (end <= w.start or w.end <= start) and blocks(w):
+            return self._excl_blocks(w, base)
+        for w in self._excl_global.overlapping(start, end):
+            if blocks(w):
                 return False
-        for w in self._excl_die.get(die, []):
-            if not (end <= w.start or w.end <= start) and blocks(w):
+        die_windows = self._excl_die.get(die)
+        for w in (die_windows.overlapping(start, end) if die_windows is not None else []):
+            if blocks(w):
                 return False
         return True
 
     def begin(self, now_us: float) -> _Txn:
         return _Txn(now_us=quantize(now_us))
 
-    def feasible_at(self, op: Any, targets: List[Address], start_hint: float, scope: Scope = Scope.PLANE_SET) -> Optional[float]:
+    # Upper bound on candidate starts examined by one horizon-bounded feasible_at()
+    _FIT_MAX_STEPS = 64
+
+    def feasible_at(
+        self,
+        op: Any,
+        targets: List[Address],
+        start_hint: float,
+        scope: Scope = Scope.PLANE_SET,
+        horizon_us: Optional[float] = None,
+    ) -> Optional[float]:
+        """Earliest feasible start at/after start_hint, or None.
+
+        Without horizon_us only the first candidate is checked (start_hint, or
+        later if the target planes are busy). With horizon_us, a rejected
+        candidate steps to the time its blocking window, latch or state clears
+        and is re-checked, until a start fits or the next candidate would
+        exceed horizon_us. The first candidate is always checked, so a result
+        beyond the horizon is left to the caller's admission check.
+        """
         die = targets[0].die
         plane_set = [t.plane for t in targets]
         base = self._op_base(op)
         # instant path: bus-only validation, plane/die exclusivity bypass
-        if self._base_instant(base) and self._instant_scope_ok(scope, base):
+        instant = self._base_instant(base) and self._instant_scope_ok(scope, base)
+        if instant:
             t0 = quantize(start_hint)
-            end = quantize(t0 + self._total_duration(op))
-            if not self._bus_ok(op, t0):
-                return None
-            if not self._latch_ok(op, targets, t0, scope):
-                return None
-            ok, _reason = self._eval_rules(stage="feasible", op=op, targets=targets, scope=scope, start=t0, end=end, txn=None)
-            if not ok:
+        else:
+            t0 = quantize(max(start_hint, self._earliest_planescope(die, scope, plane_set)))
+        search = horizon_us is not None
+        for _ in range(self._FIT_MAX_STEPS if search else 1):
+            ok, nxt = self._fit_check(op, targets, scope, die, plane_set, base, instant, t0, search)
+            if ok:
+                return t0
+            if nxt is None or quantize(nxt) <= t0 or quantize(nxt) > float(horizon_us):  # type: ignore[arg-type]
                 return None
-            return t0
-        # normal path
-        t0 = quantize(max(start_hint, self._earliest_planescope(die, scope, plane_set)))
+            t0 = quantize(nxt)
+        return None
+
+    def _fit_check(
+        self,
+        op: Any,
+        targets: List[Address],
+        scope: Scope,
+        die: int,
+        plane_set: List[int],
+        base: str,
+        instant: bool,
+        t0: float,
+        search: bool,
+    ) -> Tuple[bool, Optional[float]]:
+        """Check every constraint at t0; on rejection also return the next candidate when search is set."""
         end = quantize(t0 + self._total_duration(op))
-        if not self._planescope_ok(die, scope, plane_set, t0, end):
-            return None
+        if not instant:
+            if not self._planescope_ok(die, scope, plane_set, t0, end):
+                if not search:
+                    return False, None
+                planes = list(range(self.planes)) if scope == Scope.DIE_WIDE else plane_set
+                ends = [self._plane_resv[(die, p)].overlap_end(t0, end) for p in planes]
+                return False, max((e for e in ends if e is not None), default=None)
         if not self._bus_ok(op, t0):
-            return None
-        # die-level overlap exclusion per PRD: block single×multi and multi×multi; allow single×single only for specific bases
-        kind = self._multiplicity_kind(op, scope, plane_set)
-        if self._single_multi_violation(die, t0, end, kind, base):
-            return None
-        # legacy/base-token exclusions (kept for compatibility; no-op by default)
-        if not self._excl_ok(die, t0, end, base):
-            return None
+            if not search:
+                return False, None
+            nxt: Optional[float] = None
+            for (off0, off1) in self._bus_segments(op):
+                e = self._bus_resv.overlap_end(quantize(t0 + off0), quantize(t0 + off1))
+                if e is not None and (nxt is None or e - off0 > nxt):
+                    nxt = e - off0
+            return False, nxt
+        if not instant:
+            # die-level overlap exclusion per PRD: block single×multi and multi×multi; allow single×single only for specific bases
+            kind = self._multiplicity_kind(op, scope, plane_set)
+            conflicts: Optional[List[ExclWindow]] = [] if search else None
+            if self._single_multi_violation(die, t0, end, kind, base, conflicts=conflicts):
+                return False, max((w.end for w in conflicts or []), default=None)
+            # legacy/base-token exclusions (kept for compatibility; no-op by default)
+            if not self._excl_ok(die, t0, end, base):
+                if not search:
+                    return False, None
+                def blocks(w: ExclWindow) -> bool:
+                    return self._excl_blocks(w, base)
+                die_windows = self._excl_die.get(die)
+                ends = [self._excl_global.overlap_end(t0, end, blocks), die_windows.overlap_end(t0, end, blocks) if die_windows is not None else None]
+                return False, max((e for e in ends if e is not None), default=None)
         if not self._latch_ok(op, targets, t0, scope):
-            return None
+            return False, (self._next_change_point(t0) if search else None)
         # Optional rule evaluation (no-op by default; feature-flagged)
         ok, _reason = self._eval_rules(stage="feasible", op=op, targets=targets, scope=scope, start=t0, end=end, txn=None)
         if not ok:
-            return None
-        return t0
+            return False, (self._next_change_point(t0) if search else None)
+        return True, None
+
+    def _next_change_point(self, t: float, die: Optional[int] = None, timeline: bool = True) -> Optional[float]:
+        """Earliest time after t at which a latch, cache/suspend axis or (with timeline) op_state may change (on die, if given)."""
+        pts: List[float] = []
+        nb = self._st.next_boundary_after(t, die) if timeline else None
+        if nb is not None:
+            pts.append(nb)
+        for (d, _p), bucket in self._latch.items():
+            if die is None or d == die:
+                pts.extend(e.end_us for e in bucket.values() if e.end_us is not None and e.end_us > t)
+        axes = list(self._cache_read.items()) + list(self._cache_program.items()) + list(self._erase_susp.items()) + list(self._pgm_susp.items())
+        for key, ent in axes:
+            if die is not None and (key[0] if isinstance(key, tuple) else key) != die:
+                continue
+            if ent is not None and ent.end_us is not None and ent.end_us > t:
+                pts.append(ent.end_us)
+        return min(pts) if pts else None
+
+    def next_release_us(self, die: int, at_us: float, windows: bool = True) -> Optional[float]:
+        """Earliest time after at_us at which a proposal on die can change outcome without a version bump.
 
-    def reserve(self, txn: _Txn, op: Any, targets: List[Address], scope: Scope, duration_us: Optional[float] = None) -> Reservation:
+        Covers the die's latch and cache/suspend axis ends and, with windows,
+        its op_state boundaries and the ends of its plane reservations, bus
+        windows and the die/global exclusion windows still open at at_us.
+        None when nothing is pending.
+        """
+        t = quantize(at_us)
+        die = int(die)
+        pts: List[float] = []
+        nc = self._next_change_point(t, die, timeline=windows)
+        if nc is not None:
+            pts.append(nc)
+        if not windows:
+            return min(pts) if pts else None
+        inf = float("inf")
+        idxs = [self._plane_resv.get((die, p)) for p in range(self.planes)]
+        idxs += [self._bus_resv, self._excl_global, self._excl_die.get(die)]
+        for idx in idxs:
+            if idx is not None:
+                pts.extend(idx._span(w)[1] for w in idx.overlapping(t, inf))
+        return min(pts) if pts else None
+
+    def reserve(
+        self,
+        txn: _Txn,
+        op: Any,
+        targets: List[Address],
+        scope: Scope,
+        duration_us: Optional[float] = None,
+        start_us: Optional[float] = None,
+    ) -> Reservation:
+        """Reserve op in txn at its earliest start (never before start_us when given)."""
         die = targets[0].die
+        floor = float(start_us) if start_us is not None else txn.now_us
         plane_set = [t.plane for t in targets]
         dur = float(duration_us) if duration_us is not None else self._total_duration(op)
         base = self._op_base(op)
@@ -701,7 +1380,7 @@ class ResourceManager:
         if self._base_instant(base) and self._instant_scope_ok(scope, base):
             # minimal serialization guard within txn: avoid overlapping pending bus windows
             last_bus_end = max((e for (_s, e) in (txn.bus_resv or [])), default=0.0)
-            start = quantize(max(txn.now_us, last_bus_end))
+            start = quantize(max(txn.now_us, floor, last_bus_end))
             end = quantize(start + dur)
             if not self._bus_ok(op, start, pending=txn.bus_resv):
                 return Reservation(False, "bus", op, targets, None, None)
@@ -748,7 +1427,7 @@ class ResourceManager:
             self._update_overlay_for_reserved(txn, base, targets)
             return Reservation(True, None, op, targets, start, end)
         # normal path
-        start = quantize(max(txn.now_us, self._earliest_planescope(die, scope, plane_set)))
+        start = quantize(max(txn.now_us, floor, self._earliest_planescope(die, scope, plane_set)))
         end = quantize(start + dur)
         if not self._planescope_ok(die, scope, plane_set, start, end, pending=txn.plane_resv):
             return Reservation(False, "planescope", op, targets, None, None)
@@ -819,6 +1498,18 @@ class ResourceManager:
         # Track processed SUSPEND handling per die to avoid duplicate work when txn includes
         # multiple st_ops entries referencing the same die/operation.
         _susp_processed: Set[Tuple[str, int]] = set()
+        touched = {int(d) for (d, _p), lst in txn.plane_resv.items() if lst}
+        touched.update(int(d) for d, lst in txn.excl_die.items() if lst)
+        touched.update(int(d) for (d, _p), bucket in txn.latch_locks.items() if bucket)
+        touched.update(int(e.die) for e in txn.st_ops)
+        if txn.excl_global or any(str(e.base).upper() in ("ODTDISABLE", "ODTENABLE") for e in txn.st_ops):
+            self._touch(bus=bool(txn.bus_resv))
+        else:
+            for d in touched:
+                self._touch(d)
+            if txn.bus_resv:
+                self._ver_global += 1
+                self._ver_bus += 1
         for (key, lst) in txn.plane_resv.items():
             self._plane_resv[key].extend(lst)
             if lst:
@@ -828,7 +1519,7 @@ class ResourceManager:
         self._bus_resv.extend(txn.bus_resv)
         self._excl_global.extend(txn.excl_global)
         for d, lst in txn.excl_die.items():
-            self._excl_die.setdefault(d, []).extend(lst)
+            self._excl_die_index(d).extend(lst)
         for key, bucket in txn.latch_locks.items():
             if not bucket:
                 continue
@@ -951,6 +1642,13 @@ class ResourceManager:
     def rollback(self, txn: _Txn) -> None:
         return
 
+    def _excl_die_index(self, die: int) -> _IntervalIndex:
+        idx = self._excl_die.get(die)
+        if idx is None:
+            idx = _IntervalIndex(span=_window_span)
+            self._excl_die[die] = idx
+        return idx
+
     def release_on_dout_end(self, targets: List[Address], now_us: float) -> None:
         for t in targets:
             self._remove_latch_entry(t.die, t.plane, READ_LATCH_KIND)
@@ -984,59 +1682,160 @@ class ResourceManager:
           segment's "<BASE>.END" when it exists; otherwise fall back to the covering segment.
         """
         tq = quantize(float(t))
-        key = (int(die), int(plane))
-        lst = self._st.by_plane.get(key, [])
-        starts = self._st._starts_by_plane.get(key)
-        if starts is None or len(starts or []) != len(lst):
-            starts = [s.start_us for s in lst]
-            self._st._starts_by_plane[key] = starts
+        st_tl = self._st
+        segs = st_tl.plane((int(die), int(plane)))
+        names = st_tl._names
 
         # Fast path: current covering state
-        st = self._st.state_at(die, plane, tq)
+        st = st_tl.state_at(die, plane, tq)
         if st is not None and str(st).strip() != "":
             # Optionally remap ISSUE -> previous.END for analysis-only consumers
-            if exclude_issue and str(st).endswith(".ISSUE") and lst:
-                import bisect as _b
-                j = _b.bisect_right(starts, tq) - 1 if starts else -1
-                if 0 <= j < len(lst):
-                    cur = lst[j]
-                    if str(cur.state).upper() == "ISSUE":
+            if exclude_issue and str(st).endswith(".ISSUE") and segs is not None:
+                j = st_tl.index_at(segs, tq)
+                if j >= 0:
+                    if str(names[segs.state[j]]).upper() == "ISSUE":
                         if j - 1 >= 0:
-                            prev = lst[j - 1]
-                            if float(prev.end_us) <= tq:
-                                return f"{prev.op_base}.END"
+                            if float(segs.end[j - 1]) <= tq:
+                                return f"{names[segs.base[j - 1]]}.END"
                         # No previous segment; fall through to default/derive_end path below
                         if not derive_end:
                             return str(default)
                         # try virtual end based on prior segment even if inside first ISSUE
                         return str(default)
-            if prefer_end_on_boundary and lst:
+            if prefer_end_on_boundary and segs is not None:
                 # Detect exact boundary: a segment whose start == t exists
-                import bisect as _b
-                j = _b.bisect_right(starts, tq) - 1 if starts else -1
-                if 0 <= j < len(lst) and abs(float(lst[j].start_us) - tq) <= 0.0:
+                j = st_tl.index_at(segs, tq)
+                if j >= 0 and abs(float(segs.start[j]) - tq) <= 0.0:
                     # If this is exactly the start of segment j, prefer previous END when present
                     if j - 1 >= 0:
-                        prev = lst[j - 1]
                         # Only prefer END if previous segment truly ended at or before t
-                        if float(prev.end_us) <= tq:
-                            return f"{prev.op_base}.END"
+                        if float(segs.end[j - 1]) <= tq:
+                            return f"{names[segs.base[j - 1]]}.END"
                     # No previous segment; fall back to current state
             return str(st)
 
         if not derive_end:
             return str(default)
-        if not lst:
+        if segs is None:
             return str(default)
-        import bisect as _b
-        i = _b.bisect_right(starts, tq) - 1 if starts else -1
-        if 0 <= i < len(lst):
-            seg = lst[i]
+        i = st_tl.index_at(segs, tq)
+        if i >= 0:
             # If t is at or after this segment's end and no segment covers t, treat as virtual END
-            if tq >= float(seg.end_us):
-                return f"{seg.op_base}.END"
+            if tq >= float(segs.end[i]):
+                return f"{names[segs.base[i]]}.END"
         return str(default)
 
+    # --- Batch (NumPy) timeline queries for exporters ---
+    def _plane_groups(self, die: Any, plane: Any, n: int):
+        """Yield ((die, plane), row indices) for scalar or per-row die/plane arguments."""
+        import numpy as np
+        d = np.broadcast_to(np.asarray(die, dtype=np.int64), (n,))
+        p = np.broadcast_to(np.asarray(plane, dtype=np.int64), (n,))
+        if n == 0:
+            return
+        width = int(max(self.planes, int(p.max()) + 1))
+        uniq, inv = np.unique(d * width + p, return_inverse=True)
+        for k, code in enumerate(uniq.tolist()):
+            yield (int(code // width), int(code % width)), np.nonzero(inv == k)[0]
+
+    def _plane_lookup(self, die: int, plane: int, tq: Any):
+        """Locate quantized times tq in one plane's segment columns.
+
+        Returns (segs, starts, ends, j, has, covered): segs is the plane's
+        _PlaneSegs (None when empty), j is the last segment starting at/before
+        each time (0 where has is False) and covered marks times inside
+        segment j.
+        """
+        import numpy as np
+        segs = self._st.plane((int(die), int(plane)))
+        if segs is None:
+            return None, None, None, None, None, None
+        starts, ends = segs.starts, segs.ends
+        j = np.searchsorted(starts, tq, side="right") - 1
+        has = j >= 0
+        jj = np.where(has, j, 0)
+        covered = has & (tq < ends[jj])
+        return segs, starts, ends, jj, has, covered
+
+    def op_states_at(self, die: Any, plane: Any, times: Any):
+        """Vectorized op_state(): object array of "BASE.STATE" (None where idle)."""
+        import numpy as np
+        tq = np.round(np.asarray(times, dtype=float) / SIM_RES_US) * SIM_RES_US
+        out = np.full(tq.shape, None, dtype=object)
+        for (d, p), idx in self._plane_groups(die, plane, tq.size):
+            segs, _s, _e, jj, _has, covered = self._plane_lookup(d, p, tq[idx])
+            if segs is None:
+                continue
+            keys = self._st.labels(segs)
+            out[idx[covered]] = keys[jj[covered]]
+        return out
+
+    def phase_keys_at(
+        self,
+        die: Any,
+        plane: Any,
+        times: Any,
+        default: str = "DEFAULT",
+        derive_end: bool = True,
+        prefer_end_on_boundary: bool = True,
+        exclude_issue: bool = True,
+    ):
+        """Vectorized phase_key_at() over a times array.
+
+        die/plane are scalars or per-time arrays; returns an object array of
+        keys identical to calling phase_key_at() per element.
+        """
+        import numpy as np
+        tq = np.round(np.asarray(times, dtype=float) / SIM_RES_US) * SIM_RES_US
+        out = np.full(tq.shape, str(default), dtype=object)
+        for (d, p), idx in self._plane_groups(die, plane, tq.size):
+            t = tq[idx]
+            segs, starts, ends, jj, has, covered = self._plane_lookup(d, p, t)
+            if segs is None:
+                continue
+            cur = self._st.labels(segs)
+            end_keys = self._st.labels(segs, suffix="END")
+            res = np.full(t.shape, str(default), dtype=object)
+            pp = np.maximum(jj - 1, 0)
+            prev_ended = has & (jj >= 1) & (ends[pp] <= t)
+            rest = covered
+            if exclude_issue:
+                # state == "ISSUE" exactly (".ISSUE" suffix and upper() == "ISSUE")
+                is_issue = np.array([n == "ISSUE" for n in self._st._names], dtype=bool)
+                issue = is_issue[segs.state[: segs.n]]
+                in_issue = covered & issue[jj]
+                m = in_issue & prev_ended
+                res[m] = end_keys[pp[m]]
+                rest = covered & ~in_issue
+            if prefer_end_on_boundary:
+                m = rest & (starts[jj] == t) & prev_ended
+                res[m] = end_keys[pp[m]]
+                rest = rest & ~m
+            res[rest] = cur[jj[rest]]
+            if derive_end:
+                m = has & ~covered
+                res[m] = end_keys[jj[m]]
+            out[idx] = res
+        return out
+
+    def die_status_at(self, die: Any, times: Any, planes: Optional[int] = None):
+        """Per-time die status over planes: "busy" (any CORE_BUSY), "extrdy" (DATA_IN/DATA_OUT) or "ready"."""
+        import numpy as np
+        tq = np.round(np.asarray(times, dtype=float) / SIM_RES_US) * SIM_RES_US
+        d_arr = np.broadcast_to(np.asarray(die, dtype=np.int64), tq.shape)
+        busy = np.zeros(tq.shape, dtype=bool)
+        io = np.zeros(tq.shape, dtype=bool)
+        for p in range(self.planes if planes is None else int(planes)):
+            for (d, _p), idx in self._plane_groups(d_arr, p, tq.size):
+                segs, _s, _e, jj, _has, covered = self._plane_lookup(d, p, tq[idx])
+                if segs is None:
+                    continue
+                state = np.array([c.split(".", 1)[1] for c in self._st.labels(segs)], dtype=object)
+                st = state[jj]
+                busy[idx] |= covered & (st == "CORE_BUSY")
+                io[idx] |= covered & ((st == "DATA_OUT") | (st == "DATA_IN"))
+        return np.where(busy, "busy", np.where(io, "extrdy", "ready")).astype(object)
+
     def has_overlap(self, scope: Scope, die: int, plane_set: Optional[List[int]], start_us: float, end_us: float, pred: Optional[Callable[[_StateInterval], bool]] = None) -> bool:
         t0, t1 = quantize(start_us), quantize(end_us)
         if scope == Scope.DIE_WIDE:
@@ -1067,9 +1866,11 @@ class ResourceManager:
         return "ODT_DISABLE" if self._odt_disabled else None
 
     def set_odt_disable(self) -> None:
+        self._touch()
         self._odt_disabled = True
 
     def set_odt_enable(self) -> None:
+        self._touch()
         self._odt_disabled = False
 
     def cache_state(self, die: int, plane: int, at_us: Optional[float] = None) -> Optional[str]:
@@ -1104,19 +1905,23 @@ class ResourceManager:
         return None
 
     def begin_cache_read(self, die: int, plane: int, start_us: float, celltype: Optional[str] = None) -> None:
+        self._touch(die)
         self._cache_read[(die, plane)] = _CacheEntry(die=die, plane=plane, kind="ON_CACHE_READ", start_us=quantize(start_us), celltype=celltype)
 
     def end_cache_read(self, die: int, plane: int, end_us: float) -> None:
+        self._touch(die)
         ent = self._cache_read.get((die, plane))
         if ent and ent.end_us is None:
             ent.end_us = quantize(end_us)
 
     def begin_cache_program(self, die: int, start_us: float, kind: str = "ON_CACHE_PROGRAM", celltype: Optional[str] = None) -> None:
+        self._touch(die)
         if kind not in ("ON_CACHE_PROGRAM", "ON_ONESHOT_CACHE_PROGRAM"):
             kind = "ON_CACHE_PROGRAM"
         self._cache_program[die] = _CacheEntry(die=die, plane=None, kind=kind, start_us=quantize(start_us), celltype=celltype)
 
     def end_cache_program(self, die: int, end_us: float) -> None:
+        self._touch(die)
         ent = self._cache_program.get(die)
         if ent and ent.end_us is None:
             ent.end_us = quantize(end_us)
@@ -1171,6 +1976,7 @@ class ResourceManager:
         Accepts 'ERASE_SUSPENDED'/'PROGRAM_SUSPENDED' to activate a given axis,
         None to clear both axes. Intended for tests/tools; normal flow uses ops.
         """
+        self._touch(die)
         t = quantize(now_us)
         if state is None:
             # Clear both axes
@@ -1345,6 +2151,7 @@ class ResourceManager:
         states: Optional[List[Tuple[str, float]]] = None,
         bus_segments: Optional[List[Tuple[float, float]]] = None,
     ) -> None:
+        self._touch(die)
         axis = self._axis_for_base(base)
 
         def _normalize_states(raw: Optional[List[Tuple[str, float]]]) -> List[Tuple[str, float]]:
@@ -1574,6 +2381,7 @@ class ResourceManager:
 
         New code should call move_to_suspended_axis(..., axis).
         """
+        self._touch(die)
         ops = self._ongoing_ops.get(die, [])
         if not ops:
             return
@@ -1607,6 +2415,7 @@ class ResourceManager:
 
         axis: 'ERASE' | 'PROGRAM'
         """
+        self._touch(die)
         ops = self._ongoing_ops.get(die, [])
         if not ops:
             return
@@ -1673,62 +2482,52 @@ class ResourceManager:
         meta.axis = fam
 
         # Release future reservations to allow re-reservation on resume.
+        # Only this op's own windows are touched: look them up around its span
+        # and truncate/drop them in place rather than rebuilding each index.
         tol = SIM_RES_US
         cutoff = now_q
+
+        def _trim(idx: _IntervalIndex, cut: Callable[[Any], Any], pred: Optional[Callable[[Any], bool]] = None) -> None:
+            for win in idx.overlapping(orig_start - 2 * tol, orig_end + 2 * tol):
+                s, e = idx._span(win)
+                if abs(s - orig_start) > tol or abs(e - orig_end) > tol:
+                    continue
+                if pred is not None and not pred(win):
+                    continue
+                if e <= cutoff + tol:
+                    continue
+                if s >= cutoff - tol:
+                    # drop future portion entirely
+                    idx.remove(win)
+                else:
+                    idx.replace(win, cut(win))
+
         for plane in target_planes:
             key = (int(die), int(plane))
-            windows = self._plane_resv.get(key, [])
-            new_windows: List[Tuple[float, float]] = []
-            for (s, e) in windows:
-                if abs(s - orig_start) <= tol and abs(e - orig_end) <= tol:
-                    if e <= cutoff + tol:
-                        new_windows.append((s, e))
-                    elif s >= cutoff - tol:
-                        # drop future portion entirely
-                        continue
-                    else:
-                        new_windows.append((s, cutoff))
-                else:
-                    new_windows.append((s, e))
-            self._plane_resv[key] = new_windows
-            if new_windows:
-                self._avail[key] = max(end for (_, end) in new_windows)
+            windows = self._plane_resv.get(key)
+            if windows is None:
+                windows = self._plane_resv[key] = _IntervalIndex()
+            _trim(windows, lambda w: (w[0], cutoff))
+            if len(windows):
+                self._avail[key] = windows.max_end()
             else:
                 self._avail[key] = max(self._avail.get(key, 0.0), cutoff)
 
-        # Trim die-level exclusion windows for this op base
+        # Trim die-level and global exclusion windows for this op base
         token = f"OPBASE:{str(meta.base)}"
-        die_windows = self._excl_die.get(int(die), [])
-        new_die_windows: List[ExclWindow] = []
-        for win in die_windows:
-            if token in win.tokens and abs(win.start - orig_start) <= tol and abs(win.end - orig_end) <= tol:
-                if win.end <= cutoff + tol:
-                    new_die_windows.append(win)
-                elif win.start >= cutoff - tol:
-                    continue
-                else:
-                    new_die_windows.append(ExclWindow(start=win.start, end=cutoff, scope=win.scope, die=win.die, tokens=set(win.tokens)))
-            else:
-                new_die_windows.append(win)
-        self._excl_die[int(die)] = new_die_windows
-
-        new_global_windows: List[ExclWindow] = []
-        for win in self._excl_global:
-            if token in win.tokens and abs(win.start - orig_start) <= tol and abs(win.end - orig_end) <= tol:
-                if win.end <= cutoff + tol:
-                    new_global_windows.append(win)
-                elif win.start >= cutoff - tol:
-                    continue
-                else:
-                    new_global_windows.append(ExclWindow(start=win.start, end=cutoff, scope=win.scope, die=win.die, tokens=set(win.tokens)))
-            else:
-                new_global_windows.append(win)
-        self._excl_global = new_global_windows
+
+        def _cut_window(win: ExclWindow) -> ExclWindow:
+            return ExclWindow(start=win.start, end=cutoff, scope=win.scope, die=win.die, tokens=set(win.tokens))
+
+        def _is_op_window(win: ExclWindow) -> bool:
+            return token in win.tokens
+
+        _trim(self._excl_die_index(int(die)), _cut_window, _is_op_window)
+        _trim(self._excl_global, _cut_window, _is_op_window)
 
         # Trim bus reservations belonging to this op (match original segments)
         if orig_bus_segments:
-            removals: List[Tuple[float, float]] = []
-            truncations: List[Tuple[float, float]] = []
+            bus = self._bus_resv
             for (off0, off1) in orig_bus_segments:
                 try:
                     abs_s = quantize(orig_start + float(off0))
@@ -1737,26 +2536,14 @@ class ResourceManager:
                     continue
                 if abs_e <= cutoff + tol:
                     continue
-                if abs_s >= cutoff - tol:
-                    removals.append((abs_s, abs_e))
-                else:
-                    truncations.append((abs_s, abs_e))
-            if removals or truncations:
-                updated_bus: List[Tuple[float, float]] = []
-                for (s, e) in self._bus_resv:
-                    key = (quantize(s), quantize(e))
-                    if key in removals:
+                for seg in bus.overlapping(abs_s - tol, abs_e + tol):
+                    s, e = seg
+                    if (quantize(s), quantize(e)) != (abs_s, abs_e):
                         continue
-                    truncated = False
-                    for (ts, te) in truncations:
-                        if key == (ts, te):
-                            if s < cutoff:
-                                updated_bus.append((s, cutoff))
-                            truncated = True
-                            break
-                    if not truncated:
-                        updated_bus.append((s, e))
-                self._bus_resv = updated_bus
+                    if abs_s < cutoff - tol and s < cutoff:
+                        bus.replace(seg, (s, cutoff))
+                    else:
+                        bus.remove(seg)
         if fam == "ERASE":
             stack = self._suspended_ops_erase.setdefault(die, [])
             stack.append(meta)
@@ -1779,6 +2566,7 @@ class ResourceManager:
 
         New code should call resume_from_suspended_axis(..., axis).
         """
+        self._touch(die, bus=True)
         # Determine candidate from both axes
         lst_e = self._suspended_ops_erase.get(die, [])
         lst_p = self._suspended_ops_program.get(die, [])
@@ -1807,6 +2595,7 @@ class ResourceManager:
         axis: str,
         now_us: Optional[float] = None,
     ) -> Optional[_OpMeta]:
+        self._touch(die, bus=True)
         fam = str(axis).upper()
         lst = self._suspended_ops_program.get(die, []) if fam == "PROGRAM" else self._suspended_ops_erase.get(die, [])
         if not lst:
@@ -1926,12 +2715,112 @@ class ResourceManager:
     def complete_op(self, op_id: int) -> None:
         if op_id is None:
             return
+        self._touch()
         for ops in self._ongoing_ops.values():
             for i in range(len(ops) - 1, -1, -1):
                 if ops[i].op_id == op_id:
                     ops.pop(i)
                     return
 
+    def compact_floor_us(self) -> Optional[float]:
+        """Earliest start still referenced by ongoing/suspended ops, suspend axes, latches or caches.
+
+        Windows and timeline segments at or after this point may be rewritten by
+        suspend/resume handling, so compact() callers must not pass a watermark
+        beyond it. Returns None when nothing is active.
+        """
+        starts: List[float] = []
+        for ops in list(self._ongoing_ops.values()) + list(self._suspended_ops_erase.values()) + list(self._suspended_ops_program.values()):
+            starts.extend(float(m.start_us) for m in ops)
+        for axis in list(self._erase_susp.values()) + list(self._pgm_susp.values()) + list(self._suspend_states.values()):
+            if axis is not None:
+                starts.append(float(axis.start_us))
+        for bucket in self._latch.values():
+            starts.extend(float(e.start_us) for e in bucket.values())
+        for entry in list(self._cache_read.values()) + list(self._cache_program.values()):
+            starts.append(float(entry.start_us))
+        return min(starts) if starts else None
+
+    def set_timeline_archive(self, path: Optional[str]) -> None:
+        """Spill state-timeline segments retired by compact() to a CSV archive at path.
+
+        Without an archive, compact() leaves the state timeline untouched because
+        exporters read it back after the run.
+        """
+        self._st_archive_path = str(path) if path else None
+
+    def restore_timeline_archive(self) -> int:
+        """Reload archived state-timeline segments (e.g., before exports); return the count."""
+        path = getattr(self, "_st_archive_path", None)
+        if not path or not os.path.exists(path):
+            return 0
+        import csv
+        n = 0
+        with open(path, "r", encoding="utf-8", newline="") as fh:
+            for row in csv.reader(fh):
+                d, p, base, state, s0, s1 = row
+                self._st._insert_plane((int(d), int(p)), _StateInterval(int(d), int(p), base, state, float(s0), float(s1)))
+                n += 1
+        # Segments are resident again; the next compact() spills them anew
+        os.remove(path)
+        return n
+
+    def compact(self, before_us: float) -> Dict[str, int]:
+        """Retire committed windows that end at or before before_us.
+
+        before_us is a low-watermark supplied by the caller (the Scheduler uses
+        min(now, next pending event, compact_floor_us())); nothing queried by
+        feasible_at/reserve or rewritten by suspend/resume lies below it.
+        State-timeline segments are retired only when an archive is set.
+        Returns per-structure retired counts.
+        """
+        t = quantize(float(before_us))
+        stats = {"plane": 0, "bus": 0, "excl": 0, "timeline": 0}
+        for idx in self._plane_resv.values():
+            stats["plane"] += idx.retire_before(t)
+        stats["bus"] += self._bus_resv.retire_before(t)
+        stats["excl"] += self._excl_global.retire_before(t)
+        for idx in self._excl_die.values():
+            stats["excl"] += idx.retire_before(t)
+        path = getattr(self, "_st_archive_path", None)
+        if path:
+            segs = self._st.retire_before(t)
+            if segs:
+                import csv
+                with open(path, "a", encoding="utf-8", newline="") as fh:
+                    w = csv.writer(fh, lineterminator="\n")
+                    for seg in segs:
+                        w.writerow([seg.die, seg.plane, seg.op_base, seg.state, seg.start_us, seg.end_us])
+                stats["timeline"] = len(segs)
+        return stats
+
+    def timeline_segments(self):
+        """Yield (die, plane, op_base, state, start_us, end_us) per state segment, in snapshot order.
+
+        Streams the live state timeline without copying it (exporters use this
+        instead of snapshot()["timeline"]).
+        """
+        yield from self._st.segments()
+
+    def timeline_plane_streams(self) -> List[Tuple[Tuple[int, int], Any]]:
+        """[((die, plane), iterator)] of timeline_segments() tuples, one start-ordered stream per plane.
+
+        Exporters merge these instead of collecting and sorting every segment.
+        """
+        return self._st.plane_streams()
+
+    def load_timeline_segments(self, segments: Iterable[Tuple[int, int, str, str, float, float]]) -> None:
+        """Replace the state timeline with segments in timeline_segments() order.
+
+        Unlike restore(), which re-inserts by start time, the per-plane order
+        (including ties) is kept exactly, so a checkpoint round-trip is lossless.
+        """
+        self._touch(bus=True)
+        st = _StateTimeline()
+        for (die, plane, op_base, state, s0, s1) in segments:
+            st.append_plane((int(die), int(plane)), str(op_base), str(state), s0, s1)
+        self._st = st
+
     def snapshot(self) -> Dict[str, Any]:
         return {
             "avail": dict(self._avail),
@@ -1946,7 +2835,7 @@ class ResourceManager:
                 }
                 for k, bucket in self._latch.items()
             },
-            "timeline": [(seg.die, seg.plane, seg.op_base, seg.state, seg.start_us, seg.end_us) for lst in self._st.by_plane.values() for seg in lst],
+            "timeline": list(self.timeline_segments()),
             # proposer-facing runtime states
             "odt_disabled": bool(self._odt_disabled),
             "cache_read": [
@@ -2061,11 +2950,12 @@ class ResourceManager:
         }
 
     def restore(self, snap: Dict[str, Any]) -> None:
+        self._touch(bus=True)
         self._avail = dict(snap.get("avail", {}))
-        self._plane_resv = {tuple(k) if not isinstance(k, tuple) else k: list(v) for k, v in snap.get("plane_resv", {}).items()}
-        self._bus_resv = list(snap.get("bus_resv", []))
-        self._excl_global = [ExclWindow(w.start, w.end, w.scope, w.die, set(w.tokens)) for w in snap.get("excl_global", [])]
-        self._excl_die = {int(d): [ExclWindow(w.start, w.end, w.scope, w.die, set(w.tokens)) for w in lst] for d, lst in snap.get("excl_die", {}).items()}
+        self._plane_resv = {tuple(k) if not isinstance(k, tuple) else k: _IntervalIndex(v) for k, v in snap.get("plane_resv", {}).items()}
+        self._bus_resv = _IntervalIndex(snap.get("bus_resv", []))
+        self._excl_global = _IntervalIndex([ExclWindow(w.start, w.end, w.scope, w.die, set(w.tokens)) for w in snap.get("excl_global", [])], span=_window_span)
+        self._excl_die = {int(d): _IntervalIndex([ExclWindow(w.start, w.end, w.scope, w.die, set(w.tokens)) for w in lst], span=_window_span) for d, lst in snap.get("excl_die", {}).items()}
         self._latch = {}
         for k, raw_bucket in (snap.get("latch", {}) or {}).items():
             key_tuple = tuple(k) if not isinstance(k, tuple) else k
@@ -2452,12 +3342,8 @@ class ResourceManager:
 
     # --- Rule helpers: state_forbid family ---
     def _blocked_by_groups(self, base: str, groups: List[str]) -> bool:
-        group_defs: Dict[str, List[str]] = (self.cfg.get("exclusion_groups") or {})
-        for g in groups:
-            bases = group_defs.get(g, [])
-            if base in bases:
-                return True
-        return False
+        em = exclusion_matrix(self.cfg)
+        return bool(em.groups_mask(groups) & em.base_bit(base))
 
     def _rule_forbid_on_suspend(self, base: str, die: int, at_us: float) -> Optional[str]:
         """Block operations based on split suspend axes at `at_us`.
@@ -2468,13 +3354,8 @@ class ResourceManager:
         t = float(at_us)
         es = self.erase_suspend_state(die, at_us=t)
         ps = self.program_suspend_state(die, at_us=t)
-        groups_by_state: Dict[str, List[str]] = (self.cfg.get("exclusions_by_suspend_state") or {})
-        groups: List[str] = []
-        groups.extend(groups_by_state.get(str(es), []) or [])
-        groups.extend(groups_by_state.get(str(ps), []) or [])
-        if not groups:
-            return None
-        if self._blocked_by_groups(base, groups):
+        em = exclusion_matrix(self.cfg)
+        if (em.state_mask("suspend", es) | em.state_mask("suspend", ps)) & em.base_bit(base):
             return "state_forbid_suspend"
         return None
 
@@ -2487,9 +3368,7 @@ class ResourceManager:
         odt = self.odt_state()
         if not odt:
             return None
-        groups_by_state: Dict[str, List[str]] = (self.cfg.get("exclusions_by_odt_state") or {})
-        groups = groups_by_state.get(odt, [])
-        if self._blocked_by_groups(base, groups):
+        if exclusion_matrix(self.cfg).blocks("odt", odt, base):
             return "state_forbid_odt"
         return None
 
@@ -2499,19 +3378,20 @@ class ResourceManager:
         Checks die-level program cache first, then per-target plane read cache.
         Config keys: exclusions_by_cache_state -> [group]
         """
-        groups_by_state: Dict[str, List[str]] = (self.cfg.get("exclusions_by_cache_state") or {})
+        em = exclusion_matrix(self.cfg)
+        bit = em.base_bit(base)
+        if not bit:
+            return None
         # die-level cache program has priority
         st_die = self.cache_state(die, plane=0, at_us=at_us)
         if st_die in ("ON_CACHE_PROGRAM", "ON_ONESHOT_CACHE_PROGRAM"):
-            groups = groups_by_state.get(str(st_die), [])
-            if self._blocked_by_groups(base, groups):
+            if em.state_mask("cache", st_die) & bit:
                 return "state_forbid_cache"
         # plane-level cache read on any target plane
         for p in plane_set:
             st_plane = self.cache_state(die, plane=p, at_us=at_us)
             if not st_plane:
                 continue
-            groups = groups_by_state.get(str(st_plane), [])
-            if self._blocked_by_groups(base, groups):
+            if em.state_mask("cache", st_plane) & bit:
                 return "state_forbid_cache"
         return None
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import math
 from collections import deque
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, TypedDict, Tuple
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Iterator, Optional, TypedDict, Tuple
 
 # Core collaborators
 from resourcemgr import ResourceManager, Address, SIM_RES_US, quantize
@@ -175,15 +176,61 @@ class Scheduler:
         self.metrics["backlog_flush_pending"] = 0
         self.metrics["backlog_drop"] = 0
         self.metrics["backlog_retry_events"] = 0
+        # Periodic ResourceManager compaction at a safe low-watermark (opt-in; 0 disables).
+        # Retired windows drop out of rm.snapshot(), so the default keeps them.
+        try:
+            self._compact_period_us: float = float(pol.get("rm_compact_period_us", 0.0))
+        except Exception:
+            self._compact_period_us = 0.0
+        self._last_compact_us: float = self.now_us
+        self.metrics["rm_compactions"] = 0
+        self.metrics["rm_retired_windows"] = 0
+        self.metrics["rm_retired_segments"] = 0
+        # QUEUE_REFILL pacing: periodic (every queue_refill_period_us) | idle
+        # (a futile refill parks the next one at the earliest free instant; see _park_refill)
+        mode = str(pol.get("queue_refill_mode", "periodic") or "periodic").strip().lower()
+        self._refill_idle: bool = mode == "idle"
+        # parked refill: (event seq, wake time, park time, RM global version when last checked)
+        self._refill_parked: Optional[Tuple[int, float, float, int]] = None
+        self.metrics["refill_ticks_saved"] = 0
+        self.metrics["refill_wakeups_saved"] = 0
+        # Negative proposal cache (opt-in): failed outcomes per (hook, phase key),
+        # reused while RM/AddressManager versions hold and nothing on the die is released
+        self._neg_cache_enabled: bool = bool(pol.get("propose_negative_cache", False))
+        self._neg_cache: Dict[Tuple[Any, ...], Tuple[Tuple[int, int, int], float, str, Optional[Dict[str, Any]]]] = {}
+        self.metrics["propose_cache_hits"] = 0
+        self.metrics["propose_cache_misses"] = 0
+        # PHASE_HOOK coalescing (opt-in): off | plane (one proposal per time/die/plane/label)
+        # | die (one per time/die/label; the first plane's hook stands for its peers)
+        coalesce = str(pol.get("phase_hook_coalesce", "off") or "off").strip().lower()
+        self._hook_coalesce: Optional[str] = coalesce if coalesce in ("plane", "die") else None
+        self.metrics["phase_hooks_coalesced"] = 0
+        # PHASE_HOOK generation: lazy (one cursor per committed op in the queue) | eager
+        gen = str(pol.get("phase_hook_generation", "lazy") or "lazy").strip().lower()
+        self._lazy_hooks: bool = gen != "eager"
 
     # -----------------
     # Public API
     # -----------------
     def run(
-        self, run_until_us: Optional[int] = None, max_hooks: Optional[int] = None
+        self,
+        run_until_us: Optional[int] = None,
+        max_hooks: Optional[int] = None,
+        *,
+        checkpoint_every_us: Optional[float] = None,
+        on_checkpoint: Optional[Callable[["Scheduler"], None]] = None,
     ) -> SchedulerResult:
+        """Tick until run_until_us/max_hooks.
+
+        When on_checkpoint is given it is called between ticks once simulated
+        time has advanced checkpoint_every_us past the previous call (or the
+        start), at a point where snapshot() captures everything run() needs
+        to continue.
+        """
         hooks_budget = float("inf") if max_hooks is None else int(max_hooks)
         stop_reason: Optional[str] = None
+        ckpt_period = float(checkpoint_every_us or 0.0) if on_checkpoint is not None else 0.0
+        next_ckpt = self.now_us + ckpt_period
         while True:
             if self._hooks >= hooks_budget:
                 stop_reason = "hooks_budget"
@@ -193,6 +240,10 @@ class Scheduler:
                 break
             tr = self.tick()
             self._hooks += 1
+            if ckpt_period > 0.0 and self.now_us >= next_ckpt:
+                if run_until_us is None or self.now_us < float(run_until_us):
+                    on_checkpoint(self)  # type: ignore[misc]
+                next_ckpt = self.now_us + ckpt_period
         if self._drain_on_exit and stop_reason == "run_until":
             self._drain_pending_op_end_events()
         return SchedulerResult(
@@ -220,11 +271,13 @@ class Scheduler:
         for _t, _prio, _seq, kind, payload in batch:
             if kind == "OP_END":
                 self._handle_op_end(payload)
+        seen_hooks: Optional[set] = set() if self._hook_coalesce is not None else None
         for _t, _prio, _seq, kind, payload in batch:
             if kind == "PHASE_HOOK":
-                c, rb, rsn = self._propose_and_schedule(
-                    self.now_us, payload.get("hook", {"label": "DEFAULT"})
-                )
+                hook = payload.get("hook", {"label": "DEFAULT"})
+                if seen_hooks is not None and self._coalesce_hook(hook, seen_hooks):
+                    continue
+                c, rb, rsn = self._propose_and_schedule(self.now_us, hook)
                 committed_total += c
                 rolled_back_any = rolled_back_any or rb
                 reason = reason or rsn
@@ -238,6 +291,13 @@ class Scheduler:
                 committed_total += committed
         for _t, _prio, _seq, kind, payload in batch:
             if kind == "QUEUE_REFILL":
+                if self._refill_parked is not None and self._refill_parked[0] == _seq:
+                    self._refill_parked = None
+                if self._refill_idle and self._refill_futile(self.now_us):
+                    self._next_refill_hook()
+                    self.metrics["refill_ticks_saved"] += 1
+                    self._park_refill()
+                    continue
                 c, rb, rsn = self._propose_and_schedule(
                     self.now_us, self._next_refill_hook()
                 )
@@ -252,6 +312,9 @@ class Scheduler:
             if kind == "OP_START":
                 self._handle_op_start(payload)
         # OP_START events are logged for diagnostics; no additional side-effects
+        if self._refill_parked is not None:
+            self._rearm_parked_refill()
+        self._maybe_compact()
         return TickResult(
             committed=committed_total, rolled_back=rolled_back_any, reason=reason
         )
@@ -267,16 +330,12 @@ class Scheduler:
 
     def _drain_pending_op_end_events(self) -> int:
         """Process any queued OP_END events after the run loop exits."""
-        queue = list(self._eq._q)
+        queue = self._eq.pop_kind("OP_END")
         if not queue:
             return 0
         drained = 0
-        kept: List[Tuple[float, int, int, str, Dict[str, Any]]] = []
         last_time = self.now_us
-        for when, prio, seq, kind, payload in queue:
-            if kind != "OP_END":
-                kept.append((when, prio, seq, kind, payload))
-                continue
+        for when, _prio, _seq, _kind, payload in queue:
             target_time = float(when)
             if target_time < last_time:
                 target_time = last_time
@@ -296,13 +355,42 @@ class Scheduler:
                     self._op_end_handles.pop(op_uid_int, None)
             drained += 1
             last_time = self.now_us
-        self._eq._q = kept
         if drained:
             self.metrics["drain_op_end_processed"] = (
                 int(self.metrics.get("drain_op_end_processed", 0)) + drained
             )
         return drained
 
+    def _compact_watermark(self) -> float:
+        """Earliest time still reachable: now, the next pending event, or active RM state."""
+        wm = self.now_us
+        nxt = self._eq.peek_time()
+        if nxt is not None:
+            wm = min(wm, float(nxt))
+        try:
+            floor = self._deps.rm.compact_floor_us()
+            if floor is not None:
+                wm = min(wm, float(floor))
+        except Exception:
+            return float("-inf")
+        return wm
+
+    def _maybe_compact(self) -> None:
+        period = self._compact_period_us
+        if period <= 0.0 or (self.now_us - self._last_compact_us) < period:
+            return
+        self._last_compact_us = self.now_us
+        rm = self._deps.rm
+        if not hasattr(rm, "compact"):
+            return
+        wm = self._compact_watermark()
+        if wm == float("-inf"):
+            return
+        stats = rm.compact(wm)
+        self.metrics["rm_compactions"] += 1
+        self.metrics["rm_retired_windows"] += int(stats.get("plane", 0)) + int(stats.get("bus", 0)) + int(stats.get("excl", 0))
+        self.metrics["rm_retired_segments"] += int(stats.get("timeline", 0))
+
     # bootstrap progress helpers moved to bootstrap.py
 
     # -----------------
@@ -341,6 +429,140 @@ class Scheduler:
             planes = 1
         return (max(1, dies), max(1, planes))
 
+    def _coalesce_hook(self, hook: Dict[str, Any], seen: set) -> bool:
+        """True when a peer hook with the same key already ran in this time batch.
+
+        Hooks of one batch share the quantized timestamp, so deduplicating at
+        dispatch collapses exactly the entries pending for the same instant;
+        the first (lowest event_seq) hook keeps its place in proposal order.
+        """
+        try:
+            plane = None if self._hook_coalesce == "die" else int(hook.get("plane", 0))
+            key = (int(hook.get("die", 0)), plane, str(hook.get("label")))
+        except Exception:
+            return False
+        if key in seen:
+            self.metrics["phase_hooks_coalesced"] += 1
+            return True
+        seen.add(key)
+        return False
+
+    def _refill_futile(self, at_us: float) -> bool:
+        """True when a QUEUE_REFILL at *at_us* cannot commit with the current RM state.
+
+        Non-instant ops need a free plane within the admission window, so the
+        tick is futile while every (die, plane) stays busy past it, unless the
+        hook's phase may still draw an instant (bus-only) op.
+        """
+        d = self._deps
+        cfg_used = self._boot.overlay_cfg(d.cfg) if self._boot.active() else d.cfg
+        try:
+            free_at = min(d.rm._avail.values())
+            if free_at < at_us + _proposer._pol_window(cfg_used):
+                return False
+            hook = {"label": "DEFAULT", "die": int(self._rr_die), "plane": int(self._rr_plane)}
+            return not _proposer.phase_may_admit_instant(cfg_used, hook, d.rm, at_us)
+        except Exception:
+            return False
+
+    def _refill_wake_us(self) -> float:
+        """First instant worth a QUEUE_REFILL: max(next grid tick, earliest plane/latch/suspend release)."""
+        d = self._deps
+        free_at = min(d.rm._avail.values(), default=self.now_us)
+        nc = d.rm._next_change_point(self.now_us, timeline=False)
+        if nc is not None:
+            free_at = min(free_at, nc)
+        return quantize(max(self.now_us + self._queue_period(), free_at))
+
+    def _refill_grid_skips(self, since_us: float, until_us: float) -> int:
+        """Periodic grid ticks strictly between since_us and until_us."""
+        period = self._queue_period()
+        if period <= 0.0 or until_us <= since_us:
+            return 0
+        return max(0, math.ceil((until_us - since_us) / period - 1e-9) - 1)
+
+    def _park_refill(self) -> None:
+        """Push the next QUEUE_REFILL straight to the earliest free instant.
+
+        Op_state boundaries bring their own PHASE_HOOK events, so only plane
+        availability, latch ends and cache/suspend ends can turn a futile tick
+        into a useful one. The grid ticks jumped over are counted as saved.
+        """
+        when = self._refill_wake_us()
+        seq = self._eq.push(when, "QUEUE_REFILL", payload={})
+        skipped = self._refill_grid_skips(self.now_us, when)
+        self.metrics["refill_ticks_saved"] += skipped
+        self.metrics["refill_wakeups_saved"] += skipped
+        self._refill_parked = (seq, when, self.now_us, self._deps.rm.state_version())
+
+    def _rearm_parked_refill(self) -> None:
+        """Pull a parked QUEUE_REFILL earlier when an RM mutation released something sooner."""
+        seq, when, since, ver = self._refill_parked  # type: ignore[misc]
+        rm = self._deps.rm
+        if rm.state_version() == ver:
+            return
+        target = self._refill_wake_us()
+        if target < when and self._eq.remove(seq, kind="QUEUE_REFILL"):
+            given_back = self._refill_grid_skips(since, when) - self._refill_grid_skips(since, target)
+            self.metrics["refill_ticks_saved"] -= given_back
+            self.metrics["refill_wakeups_saved"] -= given_back
+            seq, when = self._eq.push(target, "QUEUE_REFILL", payload={}), target
+        self._refill_parked = (seq, when, since, rm.state_version())
+
+    def _neg_cache_key(
+        self, now: float, hook: Dict[str, Any], cfg_used: Dict[str, Any]
+    ) -> Tuple[Optional[Tuple[Any, ...]], Optional[Tuple[str, Optional[str], bool]]]:
+        """(cache key, derived phase key) for a proposal; key is None when the hook carries extra payload."""
+        if not isinstance(hook, dict) or not set(hook) <= {"label", "die", "plane"}:
+            return None, None
+        try:
+            derived = _proposer._derive_phase_key(cfg_used, hook, self._deps.rm, now)
+            table = _proposer.phase_dist_table(cfg_used)
+        except Exception:
+            return None, None
+        key = (id(table), int(hook.get("die", 0)), int(hook.get("plane", 0)), str(hook.get("label")), derived[0])
+        return key, derived
+
+    def _neg_cache_versions(self, hook: Dict[str, Any]) -> Tuple[int, int, int]:
+        rm = self._deps.rm
+        return (rm.state_version(int(hook.get("die", 0))), rm.bus_version(), int(getattr(self._deps.addrman, "version", 0)))
+
+    def _neg_cache_store(
+        self,
+        key: Tuple[Any, ...],
+        now: float,
+        hook: Dict[str, Any],
+        cfg_used: Dict[str, Any],
+        attempts: Optional[List[Dict[str, Any]]],
+        reason: str,
+        details: Optional[Dict[str, Any]],
+    ) -> None:
+        # Versions cover every mutation; time alone can still turn the failure
+        # around. An empty candidate set depends on the phase key only;
+        # state blocks and empty samples on latch/cache/suspend releases; any
+        # feasibility check also on window/state releases and on a candidate's
+        # start t0 coming within the admission window.
+        reasons = {str(att.get("reason")) for att in attempts or ()}
+        until = float("inf")
+        if reasons:
+            windows = not reasons <= {"state_block", "sample_none"}
+            try:
+                release = self._deps.rm.next_release_us(int(hook.get("die", 0)), now, windows=windows)
+            except Exception:
+                return
+            if release is not None:
+                until = float(release)
+        window = float(_proposer._pol_window(cfg_used))
+        for att in attempts or ():
+            t0 = (att.get("details") or {}).get("t0")
+            if t0 is not None:
+                until = min(until, float(t0) - window)
+        if until <= now:
+            return
+        if len(self._neg_cache) >= 4096:
+            self._neg_cache.clear()
+        self._neg_cache[key] = (self._neg_cache_versions(hook), until, reason, details)
+
     def _next_refill_hook(self) -> Dict[str, Any]:
         dies, planes = self._topology()
         # build hook from current cursor
@@ -508,6 +730,68 @@ class Scheduler:
         self._apply_pgm_rows.clear()
         return rows
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture the run state between ticks (event queue, backlog, counters, RNG).
+
+        Like ResourceManager.snapshot(), values are plain containers holding
+        Address/Scope/op objects; callers encode them (see checkpoint.py).
+        Lazy PHASE_HOOK sources are materialized into the queue first, which
+        leaves pop order unchanged. RM/AddressManager state is not included.
+        """
+        seq, events = self._eq.snapshot()
+        return {
+            "now_us": self.now_us,
+            "hooks": self._hooks,
+            "ops_committed": self._ops_committed,
+            "metrics": self.metrics,
+            "boot": self._boot.snapshot(),
+            "event_seq": seq,
+            "events": events,
+            "op_end_handles": dict(self._op_end_handles),
+            "rr": (self._rr_die, self._rr_plane),
+            "op_uid_seq": self._op_uid_seq,
+            "resumed_op_uids": sorted(self._resumed_op_uids),
+            "resume_expected_targets": dict(self._resume_expected_targets),
+            "op_event_rows": list(self._op_event_rows),
+            "apply_pgm_rows": list(self._apply_pgm_rows),
+            "apply_pgm_call_seq": dict(self._apply_pgm_call_seq),
+            "backlog": [
+                (key, [{f.name: getattr(e, f.name) for f in fields(e)} for e in queue])
+                for key, queue in self._backlog.items()
+            ],
+            "backlog_pending": sorted(self._backlog_pending),
+            "last_compact_us": self._last_compact_us,
+            "refill_parked": self._refill_parked,
+            "rng": self._deps.rng.getstate(),
+        }
+
+    def restore(self, snap: Dict[str, Any]) -> None:
+        """Load a snapshot() taken from a scheduler built with the same topology."""
+        self.now_us = float(snap["now_us"])
+        self._hooks = int(snap["hooks"])
+        self._ops_committed = int(snap["ops_committed"])
+        self.metrics = dict(snap["metrics"])
+        self._boot.restore(snap["boot"])
+        self._eq.restore(int(snap["event_seq"]), snap["events"])
+        self._op_end_handles = {int(k): int(v) for k, v in snap["op_end_handles"].items()}
+        self._rr_die, self._rr_plane = (int(x) for x in snap["rr"])
+        self._op_uid_seq = int(snap["op_uid_seq"])
+        self._resumed_op_uids = {int(x) for x in snap["resumed_op_uids"]}
+        self._resume_expected_targets = {int(k): list(v) for k, v in snap["resume_expected_targets"].items()}
+        self._op_event_rows = list(snap["op_event_rows"])
+        self._apply_pgm_rows = list(snap["apply_pgm_rows"])
+        self._apply_pgm_call_seq = dict(snap["apply_pgm_call_seq"])
+        self._backlog = {
+            (str(axis), int(die)): deque(_BacklogEntry(**e) for e in entries)
+            for (axis, die), entries in snap["backlog"]
+        }
+        self._backlog_pending = {(str(axis), int(die)) for axis, die in snap["backlog_pending"]}
+        self._last_compact_us = float(snap["last_compact_us"])
+        parked = snap.get("refill_parked")
+        self._refill_parked = None if parked is None else (int(parked[0]), float(parked[1]), float(parked[2]), -1)
+        self._deps.rng.setstate(snap["rng"])
+        self._neg_cache.clear()
+
     def _backlog_queue(self, axis: str, die: int) -> deque[_BacklogEntry]:
         key = (str(axis), int(die))
         return self._backlog.setdefault(key, deque())
@@ -833,7 +1117,7 @@ class Scheduler:
                     f"[resume] reapply failed axis={axis} base={b} die={die0} op_id={err.get('op_id')} "
                     f"reason={reason} start_hint={err.get('start_hint_us')}"
                 )
-                _proposer._log(msg)
+                _proposer._log(msg, level=_proposer.LOG_SUMMARY)
             return
         op_uid = getattr(meta, "op_id", None)
         if op_uid is None:
@@ -986,12 +1270,23 @@ class Scheduler:
         self, now: float, hook: Dict[str, Any]
     ) -> Tuple[int, bool, Optional[str]]:
         d = self._deps
-        self.metrics["propose_calls"] += 1
         cfg_used = d.cfg
         if self._boot.active():
             cfg_used = self._boot.overlay_cfg(d.cfg)
             self.metrics["bootstrap_stage"] = self._boot.stage()
             self.metrics["bootstrap_active"] = True
+        neg_key, derived_key = self._neg_cache_key(now, hook, cfg_used) if self._neg_cache_enabled else (None, None)
+        if neg_key is not None:
+            hit = self._neg_cache.get(neg_key)
+            if hit is not None and hit[0] == self._neg_cache_versions(hook) and now < hit[1]:
+                self.metrics["propose_cache_hits"] += 1
+                self.metrics["last_state_block_details"] = hit[3]
+                self.metrics["last_reason"] = hit[2]
+                return (0, False, hit[2])
+            self.metrics["propose_cache_misses"] += 1
+        self.metrics["propose_calls"] += 1
+        # reuse the phase key derived for the cache lookup
+        extra = {"phase_key": derived_key} if derived_key is not None else {}
         result = _proposer.propose(
             now,
             hook=hook,
@@ -999,6 +1294,7 @@ class Scheduler:
             res_view=d.rm,
             addr_sampler=d.addrman,
             rng=d.rng,
+            **extra,
         )
         diagnostics = result.diagnostics
         batch = result.batch
@@ -1042,6 +1338,8 @@ class Scheduler:
                     except Exception:
                         pass
             self.metrics["last_reason"] = reason
+            if neg_key is not None:
+                self._neg_cache_store(neg_key, now, hook, cfg_used, attempts_payload, reason, state_block_details)
             return (0, False, reason)
 
         # Feature: Skip Delay in proposal — do not reserve/commit or emit events; advance to next hook.
@@ -1072,6 +1370,7 @@ class Scheduler:
 
         # Admission window and atomic reservation
         W = float((d.cfg.get("policies", {}) or {}).get("admission_window", 0.0))
+        gap_search = _proposer._pol_gap_search(cfg_used)
         txn = d.rm.begin(now)
         ok_all = True
         reserved_any = False
@@ -1190,7 +1489,11 @@ class Scheduler:
                 self.metrics["last_reason"] = "window_exceed"
                 self.metrics["window_exceeds"] += 1
                 break
-            r = d.rm.reserve(txn, op, p.targets, p.scope)
+            if idx == 0 and gap_search:
+                # keep the gap the proposer found instead of re-deriving the first candidate
+                r = d.rm.reserve(txn, op, p.targets, p.scope, start_us=p.start_us)
+            else:
+                r = d.rm.reserve(txn, op, p.targets, p.scope)
             # Debug: print validity snapshot and outcome
             try:
                 snap = getattr(d.rm, "last_validation", None)
@@ -1480,7 +1783,11 @@ class Scheduler:
         # If this operation does not affect state, do not emit PHASE_HOOKs
         if not _affects_state(self._deps.cfg, base):
             return
-        # State-driven PHASE_HOOKs (skip ISSUE)
+        # State-driven PHASE_HOOKs (skip ISSUE): per state, one hook per target
+        # plane just before the state ends (pre) and one right after (post).
+        # groups: (when, seq offset, label) in generation order.
+        groups: List[Tuple[float, int, str]] = []
+        n_hooks = 0
         t = float(start)
         for seg in getattr(op, "states", []) or []:
             name = getattr(seg, "name", "")
@@ -1490,42 +1797,54 @@ class Scheduler:
             t_end = t + dur
             # PRD v2 §5.3: skip ISSUE/DATA_IN/DATA_OUT for PHASE_HOOKs
             if str(name).upper() not in SKIP_STATES:
-                pre_t = max(t, t_end - max(SIM_RES_US, 0.1 * dur))
-                pre_t = quantize(pre_t)
-                # one PHASE_HOOK per target plane
-                for tgt in targets:
-                    hook = {
-                        "die": int(tgt.die),
-                        "plane": int(tgt.plane),
-                        "label": f"{base}.{name}",
-                    }
-                    if (
-                        enrich_hook
-                        and plane_set_sorted is not None
-                        and hook_targets_payload is not None
-                    ):
-                        hook["plane_set"] = list(plane_set_sorted)
-                        hook["targets"] = list(hook_targets_payload)
-                    self._eq.push(pre_t, "PHASE_HOOK", payload={"hook": hook})
+                label = f"{base}.{name}"
+                pre_t = quantize(max(t, t_end - max(SIM_RES_US, 0.1 * dur)))
+                groups.append((pre_t, n_hooks, label))
+                n_hooks += len(targets)
                 # also immediately after state end to drive next-stage proposals
-                post_t = quantize(t_end + 0.6)
-                for tgt in targets:
-                    hook = {
-                        "die": int(tgt.die),
-                        "plane": int(tgt.plane),
-                        "label": f"{base}.{name}",
-                    }
-                    if (
-                        enrich_hook
-                        and plane_set_sorted is not None
-                        and hook_targets_payload is not None
-                    ):
-                        hook["plane_set"] = list(plane_set_sorted)
-                        hook["targets"] = list(hook_targets_payload)
-                    self._eq.push(post_t, "PHASE_HOOK", payload={"hook": hook})
+                groups.append((quantize(t_end + 0.6), n_hooks, label))
+                n_hooks += len(targets)
             t = t_end
+        if not n_hooks:
+            return
+        planes = [(int(tgt.die), int(tgt.plane)) for tgt in targets]
+        enrich = None
+        if enrich_hook and plane_set_sorted is not None and hook_targets_payload is not None:
+            enrich = (plane_set_sorted, hook_targets_payload)
+        if self._lazy_hooks:
+            # Reserve the seqs eager pushes would take so pop order is unchanged
+            first_seq = self._eq.reserve(n_hooks)
+            groups.sort()
+            self._eq.push_source(self._phase_hook_source(groups, first_seq, planes, enrich))
+            return
+        for when, _off, label in groups:
+            for die, plane in planes:
+                self._eq.push(when, "PHASE_HOOK", payload={"hook": self._phase_hook(die, plane, label, enrich)})
         return
 
+    @staticmethod
+    def _phase_hook(
+        die: int, plane: int, label: str, enrich: Optional[Tuple[List[int], List[tuple]]]
+    ) -> Dict[str, Any]:
+        hook: Dict[str, Any] = {"die": die, "plane": plane, "label": label}
+        if enrich is not None:
+            hook["plane_set"] = list(enrich[0])
+            hook["targets"] = list(enrich[1])
+        return hook
+
+    @classmethod
+    def _phase_hook_source(
+        cls,
+        groups: List[Tuple[float, int, str]],
+        first_seq: int,
+        planes: List[Tuple[int, int]],
+        enrich: Optional[Tuple[List[int], List[tuple]]],
+    ) -> Iterator[Tuple[float, int, str, Dict[str, Any]]]:
+        """Yield an op's PHASE_HOOKs in (time, seq) order, building payloads on demand."""
+        for when, off, label in groups:
+            for i, (die, plane) in enumerate(planes):
+                yield when, first_seq + off + i, "PHASE_HOOK", {"hook": cls._phase_hook(die, plane, label, enrich)}
+
     def _cancel_op_end(self, op_uid: int) -> bool:
         try:
             op_uid_int = int(op_uid)
@@ -1558,10 +1877,6 @@ class Scheduler:
 
 def _is_instant_base(cfg: Dict[str, Any], base: str) -> bool:
     try:
-        return bool(
-            ((cfg.get("op_bases", {}) or {}).get(base, {}) or {}).get(
-                "instant_resv", False
-            )
-        )
+        return _proposer.op_spec_table(cfg).base_instant(base)
     except Exception:
         return False
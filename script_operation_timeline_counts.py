@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Aggregate op_name and op_base counts from operation timeline CSV files."""
+"""Aggregate op_name and op_base counts from operation timeline files (CSV, Parquet or npz)."""
 from __future__ import annotations
 
 import argparse
@@ -10,9 +10,12 @@ from collections import Counter
 from pathlib import Path
 from typing import Iterable, Sequence
 
+import tableio
+
 DEFAULT_OP_NAME_FILENAME = "op_name_counts.csv"
 DEFAULT_OP_BASE_FILENAME = "op_base_counts.csv"
 REQUIRED_COLUMNS = ("op_name", "op_base")
+TIMELINE_SUFFIXES = tuple(tableio.table_suffix(fmt) for fmt in tableio.EXPORT_FORMATS)
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -23,7 +26,7 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         "directories",
         nargs="+",
         type=Path,
-        help="Directories to scan for operation_timeline*.csv files.",
+        help="Directories to scan for operation_timeline*.{csv,parquet,npz} files.",
     )
     parser.add_argument(
         "--output-dir",
@@ -63,7 +66,8 @@ def discover_csv_files(directories: Sequence[Path]) -> list[Path]:
         if not directory.is_dir():
             raise NotADirectoryError(f"not a directory: {directory}")
         for candidate_dir in _candidate_directories(directory):
-            for candidate in sorted(candidate_dir.glob("operation_timeline*.csv")):
+            matches = (p for suffix in TIMELINE_SUFFIXES for p in candidate_dir.glob(f"operation_timeline*{suffix}"))
+            for candidate in sorted(matches):
                 if candidate in seen:
                     continue
                 seen.add(candidate)
@@ -83,6 +87,12 @@ def aggregate_counts(paths: Sequence[Path]) -> tuple[Counter[str], Counter[str]]
     name_counts: Counter[str] = Counter()
     base_counts: Counter[str] = Counter()
     for path in paths:
+        if path.suffix.lower() != ".csv":
+            # Columnar exports: count the dictionary-encoded columns directly
+            _require_columns(path, tableio.table_columns(str(path)))
+            name_counts.update(tableio.value_counts(str(path), "op_name"))
+            base_counts.update(tableio.value_counts(str(path), "op_base"))
+            continue
         with path.open("r", encoding="utf-8", newline="") as handle:
             reader = csv.DictReader(handle)
             _require_columns(path, reader.fieldnames)
@@ -0,0 +1,485 @@
+"""Columnar table I/O for the large timeline exports.
+
+``main.py --export-format`` writes ``operation_timeline_*``,
+``op_state_timeline_*`` and ``op_event_resume`` as CSV (default), Parquet or
+NumPy ``.npz``. Columnar files are typed: integer/float/bool columns keep
+their dtype and string columns (op_name, op_base, op_state, ...) are
+dictionary-encoded. ``read_table``/``value_counts`` accept any of the three
+formats so downstream scripts do not care which one a run produced.
+Parquet needs pandas plus pyarrow (the optional entry in requirements.txt) or
+fastparquet; npz only needs numpy.
+
+npz layout: ``__columns__`` holds the column order; a plain column is stored
+under its own name, a dictionary-encoded column stores int32 codes under its
+name (``-1`` = missing) and the category strings under ``<name>__dict``.
+The cumulative op_event_resume table is appended per run (TableAppender):
+Parquet as row groups of one file, npz as ``<stem>.partNNNN.npz`` files that
+the readers here concatenate.
+"""
+from __future__ import annotations
+
+import csv
+import glob
+import math
+import os
+import shutil
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+EXPORT_FORMATS = ("csv", "parquet", "npz")
+_SUFFIX = {"csv": ".csv", "parquet": ".parquet", "npz": ".npz"}
+_DICT_KEY = "__dict"
+_COLUMNS_KEY = "__columns__"
+
+
+def table_suffix(fmt: str) -> str:
+    try:
+        return _SUFFIX[str(fmt)]
+    except KeyError:
+        raise ValueError(f"unknown export format: {fmt!r} (expected one of {EXPORT_FORMATS})") from None
+
+
+def format_of(path: str) -> str:
+    ext = os.path.splitext(str(path))[1].lower()
+    for fmt, suffix in _SUFFIX.items():
+        if ext == suffix:
+            return fmt
+    return "csv"
+
+
+def parquet_available() -> bool:
+    try:
+        import pandas  # noqa: F401  # type: ignore
+    except Exception:
+        return False
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine)
+            return True
+        except Exception:
+            continue
+    return False
+
+
+# ------------------------------
+# Writing
+# ------------------------------
+def _collect(rows: Iterable[Dict[str, Any]], fieldnames: Sequence[str]) -> Dict[str, List[Any]]:
+    cols: Dict[str, List[Any]] = {name: [] for name in fieldnames}
+    appenders = [(name, cols[name].append) for name in fieldnames]
+    for r in rows:
+        for name, add in appenders:
+            add(r.get(name))
+    return cols
+
+
+def _kind(values: List[Any]) -> str:
+    present = [v for v in values if v is not None]
+    if not present:
+        return "str"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in present):
+        return "str"
+    return "int" if all(isinstance(v, int) for v in present) else "float"
+
+
+def _storage_kind(values: List[Any]) -> str:
+    """Column storage: int/bool only without missing values (else float/str), as _typed_columns writes them."""
+    kind = _kind(values)
+    if any(v is None for v in values):
+        return {"int": "float", "bool": "str"}.get(kind, kind)
+    return kind
+
+
+def _encode(values: List[Any]):
+    """Return (codes, categories) with categories in first-seen order."""
+    import numpy as np  # type: ignore
+
+    lookup: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        if v is None:
+            codes[i] = -1
+            continue
+        s = str(v)
+        c = lookup.get(s)
+        if c is None:
+            c = lookup[s] = len(lookup)
+        codes[i] = c
+    return codes, np.array(list(lookup), dtype=str)
+
+
+def _typed_columns(cols: Dict[str, List[Any]], kinds: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Map each column to a numpy array or a (codes, categories) pair.
+
+    *kinds* pins the storage kind per column (see TableAppender); a batch
+    that no longer fits it raises ValueError.
+    """
+    import numpy as np  # type: ignore
+
+    out: Dict[str, Any] = {}
+    for name, values in cols.items():
+        kind = _storage_kind(values) if kinds is None else kinds[name]
+        if kind in ("int", "bool") and any(v is None for v in values):
+            raise ValueError(f"column {name!r} has missing values but is stored as {kind}")
+        try:
+            if kind == "int":
+                out[name] = np.array(values, dtype=np.int64)
+            elif kind == "float":
+                out[name] = np.array([math.nan if v is None else float(v) for v in values], dtype=np.float64)
+            elif kind == "bool":
+                out[name] = np.array(values, dtype=bool)
+            else:
+                out[name] = _encode(values)
+        except (TypeError, ValueError):
+            raise ValueError(f"column {name!r} does not fit its {kind} storage") from None
+    return out
+
+
+def _write_npz(path: str, typed: Dict[str, Any], fieldnames: Sequence[str]) -> None:
+    import numpy as np  # type: ignore
+
+    arrays: Dict[str, Any] = {_COLUMNS_KEY: np.array(list(fieldnames), dtype=str)}
+    for name, col in typed.items():
+        if isinstance(col, tuple):
+            arrays[name], arrays[name + _DICT_KEY] = col
+        else:
+            arrays[name] = col
+    # np.savez appends .npz when missing; write through a handle to keep the exact path
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def _pandas_frame(typed: Dict[str, Any], fieldnames: Sequence[str]):
+    import pandas as pd  # type: ignore
+
+    data: Dict[str, Any] = {}
+    for name, col in typed.items():
+        if isinstance(col, tuple):
+            codes, cats = col
+            data[name] = pd.Categorical.from_codes(codes, categories=list(cats))
+        else:
+            data[name] = col
+    return pd.DataFrame(data, columns=list(fieldnames))
+
+
+def write_table(path: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str], fmt: str) -> None:
+    """Write *rows* to *path* as ``parquet`` or ``npz`` (CSV is handled by the caller)."""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    typed = _typed_columns(_collect(rows, fieldnames))
+    if fmt == "npz":
+        _write_npz(path, typed, fieldnames)
+    elif fmt == "parquet":
+        _pandas_frame(typed, fieldnames).to_parquet(path, index=False)
+    else:
+        raise ValueError(f"write_table handles columnar formats only, got {fmt!r}")
+
+
+def part_path(path: str, i: int) -> str:
+    """``<stem>.partNNNN<ext>``: the i-th (1-based) part file of a table written by TableAppender as npz."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.part{int(i):04d}{ext}"
+
+
+def _part_paths(path: str) -> List[str]:
+    stem, ext = os.path.splitext(path)
+    return sorted(glob.glob(glob.escape(stem) + ".part[0-9][0-9][0-9][0-9]" + glob.escape(ext)))
+
+
+class TableAppender:
+    """Append row batches to one columnar table without rewriting earlier batches.
+
+    Parquet batches become row groups of a single file that stays open
+    (pyarrow ParquetWriter; fastparquet appends in place) and gets its footer
+    on close(). npz batches become part files ``<stem>.partNNNN.npz``, which
+    the readers in this module concatenate when ``<stem>.npz`` itself is
+    absent. Column storage kinds are fixed by the first non-empty batch so
+    every row group/part shares one schema.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], fmt: str) -> None:
+        if fmt not in ("parquet", "npz"):
+            raise ValueError(f"TableAppender handles columnar formats only, got {fmt!r}")
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.fmt = fmt
+        self.kinds: Optional[Dict[str, str]] = None
+        self.parts = 0  # row groups (parquet) or part files (npz) written
+        self.rows = 0
+        self._started = False
+        self._pq: Optional[Any] = None  # pyarrow ParquetWriter
+        self._schema: Optional[Any] = None
+
+    def _start(self) -> None:
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        for old in [self.path] + _part_paths(self.path):
+            if os.path.exists(old):
+                os.remove(old)
+        self._started = True
+
+    def _arrow_schema(self) -> Any:
+        import pyarrow as pa  # type: ignore
+
+        types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "str": pa.dictionary(pa.int32(), pa.string())}
+        return pa.schema([(name, types[self.kinds[name]]) for name in self.fieldnames])  # type: ignore[index]
+
+    def _write_group(self, cols: Dict[str, List[Any]], typed: Dict[str, Any]) -> None:
+        try:
+            import pyarrow as pa  # type: ignore
+            import pyarrow.parquet as pq  # type: ignore
+        except ImportError:
+            import fastparquet  # type: ignore
+            import pandas as pd  # type: ignore
+
+            # fastparquet appends assume one category set per column, so strings stay plain objects
+            data = {
+                name: ([None if v is None else str(v) for v in cols[name]] if isinstance(col, tuple) else col)
+                for name, col in typed.items()
+            }
+            fastparquet.write(self.path, pd.DataFrame(data, columns=self.fieldnames), append=self.parts > 0)
+            return
+        if self._schema is None:
+            self._schema = self._arrow_schema()
+        arrays = []
+        for field in self._schema:
+            values = cols[field.name]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array([None if v is None else str(v) for v in values], type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(typed[field.name], type=field.type))
+        if self._pq is None:
+            self._pq = pq.ParquetWriter(self.path, self._schema)
+        self._pq.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def append(self, rows: Iterable[Dict[str, Any]]) -> None:
+        rows = list(rows)
+        if not rows:
+            return
+        if not self._started:
+            self._start()
+        cols = _collect(rows, self.fieldnames)
+        if self.kinds is None:
+            self.kinds = {name: _storage_kind(values) for name, values in cols.items()}
+        typed = _typed_columns(cols, self.kinds)
+        if self.fmt == "npz":
+            _write_npz(part_path(self.path, self.parts + 1), typed, self.fieldnames)
+        else:
+            self._write_group(cols, typed)
+        self.parts += 1
+        self.rows += len(rows)
+
+    def resume(self, src: str, parts: int, rows: int, kinds: Optional[Dict[str, str]]) -> None:
+        """Continue after the first *parts* row groups/part files of the table at *src*; later ones are dropped.
+
+        *src* may be this appender's own path or a table in another
+        directory. A Parquet source must be complete (closed with its footer).
+        """
+        if self._pq is not None:
+            self._pq.close()
+            self._pq = None
+        self._start_resumed(src, int(parts), kinds)
+        self.parts, self.rows, self.kinds = int(parts), int(rows), (dict(kinds) if kinds else None)
+
+    def _start_resumed(self, src: str, parts: int, kinds: Optional[Dict[str, str]]) -> None:
+        if parts <= 0:
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        same = os.path.abspath(src) == os.path.abspath(self.path)
+        if self.fmt == "npz":
+            keep = [part_path(src, i) for i in range(1, parts + 1)]
+            missing = [p for p in keep if not os.path.exists(p)]
+            if missing:
+                raise ValueError(f"missing checkpointed table parts: {missing[0]}")
+            for old in [self.path] + _part_paths(self.path):
+                if os.path.exists(old) and not (same and old in keep):
+                    os.remove(old)
+            if not same:
+                for i, p in enumerate(keep, start=1):
+                    shutil.copyfile(p, part_path(self.path, i))
+            self._started = True
+            return
+        moved = src
+        if same:
+            moved = self.path + ".resume"
+            os.replace(self.path, moved)
+        try:
+            try:
+                import pyarrow.parquet as pq  # type: ignore
+            except ImportError:
+                import fastparquet  # type: ignore
+
+                for i, df in zip(range(parts), fastparquet.ParquetFile(moved).iter_row_groups()):
+                    fastparquet.write(self.path, df, append=i > 0)
+                self._started = True
+                return
+            try:
+                pf = pq.ParquetFile(moved)
+            except Exception as exc:
+                raise ValueError(f"cannot read {src} (was its session closed?): {exc}") from None
+            if pf.num_row_groups < parts:
+                raise ValueError(f"{src} holds fewer than the checkpointed {parts} row groups")
+            self.kinds = dict(kinds) if kinds else None
+            self._schema = self._arrow_schema()
+            self._pq = pq.ParquetWriter(self.path, self._schema)
+            for i in range(parts):
+                self._pq.write_table(pf.read_row_group(i).cast(self._schema))
+            self._started = True
+        finally:
+            if same and os.path.exists(moved):
+                os.remove(moved)
+
+    def close(self) -> None:
+        """Finish the table; one that never received rows is written empty."""
+        if self._pq is not None:
+            self._pq.close()
+            self._pq = None
+        self._schema = None
+        if not self._started:
+            write_table(self.path, [], self.fieldnames, self.fmt)
+            self._started = True
+
+
+# ------------------------------
+# Reading
+# ------------------------------
+def _npz_columns(path: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Return {name: ndarray | (codes, categories)} from an npz table or its part files."""
+    import numpy as np  # type: ignore
+
+    paths = [path] if os.path.exists(path) else (_part_paths(path) or [path])
+    pieces: List[Dict[str, Any]] = []
+    for p in paths:
+        out: Dict[str, Any] = {}
+        with np.load(p, allow_pickle=False) as z:
+            names = [str(n) for n in z[_COLUMNS_KEY]]
+            for name in names if columns is None else [c for c in columns if c in names]:
+                if name + _DICT_KEY in z.files:
+                    out[name] = (z[name], z[name + _DICT_KEY])
+                else:
+                    out[name] = z[name]
+        pieces.append(out)
+    if len(pieces) == 1:
+        return pieces[0]
+    merged: Dict[str, Any] = {}
+    for name, first in pieces[0].items():
+        if not isinstance(first, tuple):
+            merged[name] = np.concatenate([piece[name] for piece in pieces])
+            continue
+        # re-code every part against one category list (first-seen order)
+        lookup: Dict[str, int] = {}
+        codes_out = []
+        for piece in pieces:
+            codes, cats = piece[name]
+            remap = np.array([lookup.setdefault(str(c), len(lookup)) for c in cats.tolist()] + [-1], dtype=np.int32)
+            codes_out.append(remap[codes])  # code -1 picks the trailing -1
+        merged[name] = (np.concatenate(codes_out), np.array(list(lookup), dtype=str))
+    return merged
+
+
+def table_columns(path: str) -> List[str]:
+    fmt = format_of(path)
+    if fmt == "npz":
+        import numpy as np  # type: ignore
+
+        first = path if os.path.exists(path) else (_part_paths(path) or [path])[0]
+        with np.load(first, allow_pickle=False) as z:
+            return [str(n) for n in z[_COLUMNS_KEY]]
+    if fmt == "parquet":
+        return list(read_table(path).columns)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f).fieldnames or [])
+
+
+def read_table(path: str):
+    """Load a CSV, Parquet or npz table into a pandas DataFrame.
+
+    Dictionary-encoded columns come back as ``category`` dtype.
+    """
+    import pandas as pd  # type: ignore
+
+    fmt = format_of(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "npz":
+        data: Dict[str, Any] = {}
+        cols = _npz_columns(path)
+        for name, col in cols.items():
+            if isinstance(col, tuple):
+                codes, cats = col
+                data[name] = pd.Categorical.from_codes(codes, categories=[str(c) for c in cats])
+            else:
+                data[name] = col
+        return pd.DataFrame(data, columns=list(cols))
+    return pd.read_csv(path)
+
+
+def read_rows(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Load up to *limit* rows of a table as dicts of plain Python values.
+
+    Missing values (empty codes, NaN) come back as None, so rows written by
+    write_table can be written again with the same column types. CSV values
+    stay strings.
+    """
+    fmt = format_of(path)
+    if fmt == "csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            return [row for _i, row in zip(range(limit), reader)] if limit is not None else list(reader)
+    cols: Dict[str, List[Any]] = {}
+    if fmt == "npz":
+        for name, col in _npz_columns(path).items():
+            if isinstance(col, tuple):
+                codes, cats = col
+                cats_l = [str(c) for c in cats.tolist()]
+                cols[name] = [None if c < 0 else cats_l[c] for c in codes[:limit].tolist()]
+            else:
+                cols[name] = col[:limit].tolist()
+    else:
+        df = read_table(path)
+        for name in df.columns:
+            series = df[name] if limit is None else df[name].iloc[:limit]
+            cols[name] = series.astype(object).tolist() if str(series.dtype) == "category" else series.tolist()
+    for name, values in cols.items():
+        cols[name] = [None if (isinstance(v, float) and math.isnan(v)) else v for v in values]
+    names = list(cols)
+    n = len(cols[names[0]]) if names else 0
+    return [{name: cols[name][i] for name in names} for i in range(n)]
+
+
+def value_counts(path: str, column: str) -> Counter:
+    """Count non-empty values of one column; npz tables are counted on their codes."""
+    fmt = format_of(path)
+    if fmt == "npz":
+        import numpy as np  # type: ignore
+
+        col = _npz_columns(path, [column]).get(column)
+        if col is None:
+            raise KeyError(column)
+        out: Counter = Counter()
+        if isinstance(col, tuple):
+            codes, cats = col
+            hits = np.bincount(codes[codes >= 0], minlength=len(cats))
+            for cat, n in zip(cats, hits):
+                key = str(cat).strip()
+                if key and n:
+                    out[key] += int(n)
+        else:
+            out.update(s for s in (str(v).strip() for v in col.tolist()) if s)
+        return out
+    if fmt == "parquet":
+        series = read_table(path)[column]
+        return Counter(s for s in (str(v).strip() for v in series.dropna().tolist()) if s)
+    out = Counter()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            key = (row.get(column) or "").strip()
+            if key:
+                out[key] += 1
+    return out
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from addrman import ERASE, SLC, TBD, TLC, AddressManager
+
+
+def _am():
+    am = AddressManager(num_planes=2, num_blocks=8, pagesize=16, num_dies=2)
+    am._rng = np.random.default_rng(0)
+    return am
+
+
+def test_states_and_celltypes_are_stored_as_small_codes():
+    am = _am()
+    assert am.addrstates.dtype == np.int16
+    assert am._modes_erase.dtype == np.uint8 and am._modes_pgm.dtype == np.uint8
+    am.set_adds_val([0, 1, 2], ERASE, mode=SLC)
+    am.set_adds_val([1], 4, mode="A0SLC")
+    assert am.addrmodes_erase[:3].tolist() == [SLC, SLC, SLC]
+    assert am.get_addrmodes()[:3].tolist() == [TBD, "A0SLC", TBD]
+    assert am.tolist([1]) == [(4, "A0SLC")]
+
+
+def test_unknown_celltype_is_registered_on_write_only():
+    am = _am()
+    assert len(am.sample_pgm(mode="QLC")) == 0
+    assert "QLC" not in am._celltypes
+    am.set_adds_val([3], ERASE, mode="QLC")
+    assert am.mode_erase_of(3) == "QLC"
+    adds = am.sample_pgm(mode="QLC")
+    assert adds[0, 0].tolist() == [0, 3, 0]
+
+
+def test_undo_restores_mode_codes():
+    am = _am()
+    am.random_erase(sel_plane=[0, 1], mode=TLC, sel_die=1)
+    erased = np.flatnonzero(am.addrstates == ERASE)
+    am.apply_pgm(am.sample_pgm(sel_plane=[0, 1], mode=TLC, sel_die=1), mode=TLC)
+    assert am.addrmodes_pgm[erased].tolist() == [TLC, TLC]
+    am.undo_last()
+    assert am.addrmodes_pgm[erased].tolist() == [TBD, TBD]
+    assert am.addrstates[erased].tolist() == [ERASE, ERASE]
+
+
+def test_decoded_mode_views_are_read_only():
+    am = _am()
+    am.set_adds_val([0], ERASE, mode=SLC)
+    for view in (am.addrmodes_erase, am.addrmodes_pgm, am.addrmodes, am.addr_mode_erase, am.addr_mode_pgm):
+        assert not view.flags.writeable
+        with pytest.raises(ValueError):
+            view[0] = TLC
+    assert am.mode_erase_of(0) == SLC
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+
+from addrman import ERASE, AddressManager, _Fenwick, _fenwick_select
+
+
+def _pair(seed):
+    ams = []
+    for min_blocks in (10**9, 0):
+        am = AddressManager(num_planes=4, num_blocks=32, pagesize=12, num_dies=2, badlist=[(0, 3), (1, 9)])
+        am.pool_min_blocks = min_blocks
+        am._rng = np.random.default_rng(seed)
+        ams.append(am)
+    return ams
+
+
+def test_fenwick_select_spans_several_trees():
+    a, b = _Fenwick([0, 2, 0, 1, 3]), _Fenwick([1, 0, 0, 0, 1])
+    assert [a.prefix(i) + b.prefix(i) for i in range(6)] == [0, 1, 3, 3, 4, 8]
+    assert [_fenwick_select([a, b], r)[0] for r in range(8)] == [0, 1, 1, 3, 4, 4, 4, 4]
+    a.set(4, 0)
+    assert _fenwick_select([a, b], 4) == (4, 0) and _fenwick_select([a], 2) == (3, 0)
+
+
+def test_pooled_sampling_matches_mask_sampling():
+    for seed in range(8):
+        masked, pooled = _pair(seed)
+        rnd = random.Random(seed)
+        for _ in range(300):
+            op = rnd.choice(["erase", "pgm", "pgm", "read", "undo", "set"])
+            mode = rnd.choice(["TLC", "SLC", "A0SLC"])
+            kw = {"sel_plane": rnd.choice([None, 0, 3, [2]]), "sel_die": rnd.choice([None, 1, [1, 0]]), "size": rnd.choice([1, 2])}
+            if op == "erase":
+                out = [am.random_erase(mode=mode, **kw) for am in (masked, pooled)]
+            elif op == "pgm":
+                out = [am.random_pgm(mode=mode, **kw) for am in (masked, pooled)]
+            elif op == "read":
+                offset = rnd.choice([None, 0, 2])
+                out = [am.random_read(mode=mode, offset=offset, **kw) for am in (masked, pooled)]
+            elif op == "set":
+                blocks = [rnd.randrange(64) for _ in range(2)]
+                out = [am.set_adds_val(blocks, ERASE, mode=mode) for am in (masked, pooled)]
+            else:
+                out = [am.undo_last() for am in (masked, pooled)]
+            assert np.array_equal(np.asarray(out[0]), np.asarray(out[1]))
+            assert masked.oversample == pooled.oversample
+            assert np.array_equal(masked.addrstates, pooled.addrstates)
+        pooled.sample_erase()
+        assert ("erase",) in pooled._pools
+
+
+def test_read_pool_weights_follow_programmed_pages():
+    am = AddressManager(num_planes=1, num_blocks=4, pagesize=8, num_dies=1)
+    am.pool_min_blocks = 0
+    am.set_adds_val([1, 2], ERASE, mode="SLC")
+    am.apply_pgm(np.array([[[0, 1, 0]], [[0, 1, 1]], [[0, 2, 0]]]), mode="SLC")
+    pool = am._pool(("read", am.celltype_code("SLC"), 0))
+    assert pool.all.vals == [0, 2, 1, 0]
+    am.apply_pgm(np.array([[[0, 2, 1]]]), mode="SLC")
+    am.apply_erase(np.array([[[0, 1, 0]]]), mode="SLC")
+    assert pool.all.vals == [0, 0, 2, 0]
+    pages = {tuple(am.sample_read(mode="SLC")[0, 0].tolist()) for _ in range(50)}
+    assert pages == {(0, 2, 0), (0, 2, 1)}
+
+
+def test_requests_above_pool_max_size_use_masks_and_match():
+    for seed in range(4):
+        masked, pooled = _pair(seed)
+        big = pooled.pool_max_size + 1
+        rnd = random.Random(seed)
+        # large draws alone take the mask path and build no pools
+        out = [am.random_erase(mode="TLC", sel_plane=0, size=big) for am in (masked, pooled)]
+        assert np.array_equal(out[0], out[1]) and not pooled._pools
+        for _ in range(200):
+            op = rnd.choice(["erase", "pgm", "seq", "read", "undo"])
+            mode = rnd.choice(["TLC", "SLC"])
+            kw = {"sel_plane": rnd.choice([None, 1]), "sel_die": rnd.choice([None, 0]), "size": rnd.choice([1, 2, big, big + 3])}
+            if op == "erase":
+                out = [am.random_erase(mode=mode, **kw) for am in (masked, pooled)]
+            elif op in ("pgm", "seq"):
+                out = [am.random_pgm(mode=mode, sequential=(op == "seq"), **kw) for am in (masked, pooled)]
+            elif op == "read":
+                out = [am.random_read(mode=mode, **kw) for am in (masked, pooled)]
+            else:
+                out = [am.undo_last() for am in (masked, pooled)]
+            assert np.array_equal(np.asarray(out[0]), np.asarray(out[1]))
+            assert masked.oversample == pooled.oversample
+            assert np.array_equal(masked.addrstates, pooled.addrstates)
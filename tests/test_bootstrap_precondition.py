@@ -0,0 +1,43 @@
+import numpy as np
+
+from addrman import ERASE, GOOD, AddressManager
+from bootstrap import precondition_addrman
+
+CFG = {
+    "topology": {"dies": 1, "planes": 2, "blocks_per_die": 32, "pages_per_block": 8},
+    "bootstrap": {"thresholds": {"erase_volume": 12, "program_volume": 8}, "celltype_weights": {"SLC": 0.5, "TLC": 0.5}},
+    "op_names": {
+        "Erase_SLC": {"base": "ERASE", "celltype": "SLC"},
+        "Erase_TLC": {"base": "ERASE", "celltype": "TLC"},
+        "Program_SLC": {"base": "PROGRAM_SLC", "celltype": "SLC"},
+        "Program_TLC": {"base": "ONESHOT_PROGRAM_MSB", "celltype": "TLC"},
+    },
+}
+
+
+def _am():
+    return AddressManager(num_planes=2, num_blocks=32, pagesize=8, num_dies=1, badlist=np.array([[0, 3]]))
+
+
+def test_precondition_meets_bootstrap_volumes():
+    am = _am()
+    info = precondition_addrman(CFG, am, seed=1, badlist=[(0, 3)])
+    assert not info["cached"] and info["erased"] == 12 and info["programmed"] == 8
+    states = am.addrstates
+    assert int(np.sum(states == ERASE)) == 4 and int(np.sum(states >= 0)) == 8
+    assert int(np.sum(states == GOOD)) == 32 - 1 - 12
+    # programmed blocks keep the celltype they were erased with
+    for blk in np.flatnonzero(states >= 0).tolist():
+        assert am._modes_pgm[blk] == am._modes_erase[blk]
+
+
+def test_precondition_cache_round_trip(tmp_path):
+    first = _am()
+    info = precondition_addrman(CFG, first, seed=5, badlist=[(0, 3)], cache_dir=str(tmp_path))
+    again = _am()
+    hit = precondition_addrman(CFG, again, seed=5, badlist=[(0, 3)], cache_dir=str(tmp_path))
+    assert hit["cached"] and hit["key"] == info["key"] and hit["programmed"] == 8
+    for name, arr in first.snapshot().items():
+        assert np.array_equal(arr, again.snapshot()[name]), name
+    other = precondition_addrman(CFG, _am(), seed=6, badlist=[(0, 3)], cache_dir=str(tmp_path))
+    assert not other["cached"] and other["key"] != info["key"]
@@ -0,0 +1,135 @@
+import json
+
+import numpy as np
+import pytest
+
+import checkpoint
+import tableio
+from addrman import AddressManager
+from main import InstrumentedScheduler, _op_event_resume_writer
+from proposer import _OpStub, _StateSeg
+from resourcemgr import Address, ResourceManager, Scope
+
+CFG = {
+    "topology": {"dies": 1, "planes": 2, "blocks_per_die": 16, "pages_per_block": 8},
+    "policies": {"queue_refill_period_us": 10.0, "admission_window": 5.0},
+    "op_bases": {
+        "ERASE": {"scope": "DIE_WIDE", "states": [{"ISSUE": None, "bus": True}, {"CORE_BUSY": None}]},
+        "PROGRAM_SLC": {"scope": "PLANE_SET", "states": [{"ISSUE": None, "bus": True}, {"CORE_BUSY": None}]},
+    },
+    "op_names": {
+        "Erase_SLC": {"base": "ERASE", "celltype": "SLC", "durations": {"ISSUE": 0.5, "CORE_BUSY": 20.0}},
+        "Program_SLC": {"base": "PROGRAM_SLC", "celltype": "SLC", "durations": {"ISSUE": 0.5, "CORE_BUSY": 8.0}},
+    },
+    "phase_conditional": {"DEFAULT": {"Erase_SLC": 0.4, "Program_SLC": 0.6}},
+}
+
+
+def _build():
+    rm = ResourceManager(cfg=CFG, dies=1, planes=2)
+    am = AddressManager(num_planes=2, num_blocks=16, pagesize=8, num_dies=1)
+    am._rng = np.random.default_rng(7)
+    rm.register_addr_policy(am.check_epr)
+    return rm, am, InstrumentedScheduler(cfg=CFG, rm=rm, addrman=am)
+
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path):
+    rm_ref, am_ref, ref = _build()
+    ref.run(run_until_us=400)
+
+    rm, am, sched = _build()
+    saved = []
+
+    def on_checkpoint(s):
+        if not saved:
+            saved.append(checkpoint.save_checkpoint(str(tmp_path / "ck"), sched=s, rm=rm, am=am, run_idx=0, t_end=400.0, cfg=CFG))
+
+    sched.run(run_until_us=400, checkpoint_every_us=150.0, on_checkpoint=on_checkpoint)
+    assert sched.timeline_rows() == ref.timeline_rows()
+
+    ck = checkpoint.load_checkpoint(saved[0])
+    assert ck.run_idx == 0 and 150.0 <= ck.manifest["now_us"] < 400.0
+    rm2, am2, resumed = _build()
+    am2._rng = np.random.default_rng(99)  # replaced by the checkpointed RNG
+    ck.restore_rm(rm2)
+    ck.restore_am(am2)
+    ck.restore_scheduler(resumed)
+    resumed.run(run_until_us=ck.t_end_us)
+    assert resumed.timeline_rows() == ref.timeline_rows()
+    assert resumed._ops_committed == ref._ops_committed
+    assert np.array_equal(am2.addrstates, am_ref.addrstates)
+    assert list(rm2.timeline_segments()) == list(rm_ref.timeline_segments())
+
+
+def test_codec_round_trips_simulator_objects():
+    op = _OpStub(name="Erase_SLC", base="ERASE", states=(_StateSeg("ISSUE", 0.5, True), _StateSeg("CORE_BUSY", 20.0)), total_us=20.5, bus_offsets=((0.0, 0.5),))
+    state = {
+        "targets": [Address(0, 1, 5, None)],
+        "scope": Scope.DIE_WIDE,
+        "op": op,
+        "keys": {(0, 1): 2.5, None: 1},
+        "pending": {("ERASE", 0)},
+        "__odd": "tagged-looking key",
+    }
+    assert checkpoint.decode(json.loads(json.dumps(checkpoint.encode(state)))) == state
+    with pytest.raises(TypeError):
+        checkpoint.encode(object())
+
+
+def test_load_rejects_tampered_or_newer_checkpoints(tmp_path):
+    rm, am, sched = _build()
+    path = checkpoint.save_checkpoint(str(tmp_path / "ck"), sched=sched, rm=rm, am=am, run_idx=0, t_end=10.0, cfg=CFG)
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["version"] = checkpoint.CHECKPOINT_VERSION + 1
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError, match="version"):
+        checkpoint.load_checkpoint(path)
+    manifest["version"] = checkpoint.CHECKPOINT_VERSION
+    manifest["npz_sha256"] = "0" * 64
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError, match="checksum"):
+        checkpoint.load_checkpoint(path)
+
+
+def _event_rows(run, times):
+    # op_uid restarts every run, so a run's rows can sort before the previous run's at a shared instant
+    return [
+        {"op_name": f"Op_{run}", "op_id": uid, "op_uid": uid, "die": 0, "plane": run, "block": 1, "page": 0,
+         "is_resumed": False, "event": "OP_END", "triggered_us": t}
+        for uid, t in enumerate(times, start=1)
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "npz", "parquet"])
+def test_cumulative_outputs_resume_from_manifest_extents(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    name = "op_event_resume" + tableio.table_suffix(fmt)
+    run0, run1 = _event_rows(0, [1.5, 4.0, 4.0]), _event_rows(1, [4.0, 9.25])
+    full = _op_event_resume_writer(str(tmp_path / "full"), fmt)
+    full.append(run0)
+    ck_dir = str(tmp_path / "full" / "checkpoints")
+    rm, am, sched = _build()
+    path = checkpoint.save_checkpoint(
+        ck_dir + "/ck", sched=sched, rm=rm, am=am, run_idx=1, t_end=10.0, cfg=CFG,
+        outputs={"op_event_resume": full.mark(ck_dir)},
+    )
+    full.append(run1)
+    full.close()
+    expected = (tmp_path / "full" / name).read_bytes() if fmt == "csv" else tableio.read_rows(str(tmp_path / "full" / name))
+    assert fmt == "csv" or [r["op_uid"] for r in expected] == [1, 1, 2, 3, 2]
+
+    ck = checkpoint.load_checkpoint(path)
+    assert "history" not in ck.state
+    mark = ck.outputs["op_event_resume"]
+    assert mark["file"] == "../" + name and len(mark["tail"]) == 2
+    for out in ("moved", "full"):  # another output dir copies the prefix; the same dir is cut back in place
+        w = _op_event_resume_writer(str(tmp_path / out), fmt)
+        w.resume(mark, mark["path"])
+        w.append(run1)
+        w.close()
+        got = tmp_path / out / name
+        assert (got.read_bytes() if fmt == "csv" else tableio.read_rows(str(got))) == expected
@@ -35,3 +35,64 @@ def test_push_returns_sequence_and_remove_filters_by_kind() -> None:
 
     # Queue should now be empty
     assert q.pop_time_batch() == (0.0, [])
+
+
+def test_batch_order_matches_time_prio_seq_and_skips_tombstones() -> None:
+    q = EventQueue()
+    s_start = q.push(2.0, "OP_START", {})
+    s_hook = q.push(2.0, "PHASE_HOOK", {})
+    s_end_a = q.push(2.0, "OP_END", {})
+    s_end_b = q.push(2.0, "OP_END", {})
+    s_early = q.push(1.0, "QUEUE_REFILL", {})
+
+    assert q.remove(s_early) is True
+    assert len(q) == 4
+    assert q.peek_time() == 2.0
+
+    t0, batch = q.pop_time_batch()
+    assert t0 == 2.0
+    assert [entry[2] for entry in batch] == [s_end_a, s_end_b, s_hook, s_start]
+    assert q.is_empty()
+
+
+def test_pop_kind_removes_only_matching_events() -> None:
+    q = EventQueue()
+    q.push(3.0, "OP_END", {"id": "late"})
+    keep = q.push(1.0, "PHASE_HOOK", {})
+    q.push(2.0, "OP_END", {"id": "early"})
+
+    drained = q.pop_kind("OP_END")
+    assert [entry[4]["id"] for entry in drained] == ["early", "late"]
+    assert [entry[2] for entry in q._q] == [keep]
+
+
+def _drain(q: EventQueue) -> list:
+    out = []
+    while not q.is_empty():
+        t0, batch = q.pop_time_batch()
+        out.append((t0, [(entry[2], entry[4]["n"]) for entry in batch]))
+    return out
+
+
+def test_lazy_sources_pop_like_eager_pushes() -> None:
+    plan = [(1.0, "a"), (2.0, "b"), (2.0, "c"), (4.0, "d")]
+    eager = EventQueue()
+    lazy = EventQueue()
+    for q in (eager, lazy):
+        q.push(2.0, "PHASE_HOOK", {"n": "x"})
+    for when, n in plan:
+        eager.push(when, "PHASE_HOOK", {"n": n})
+    first = lazy.reserve(len(plan))
+    lazy.push_source((when, first + i, "PHASE_HOOK", {"n": n}) for i, (when, n) in enumerate(plan))
+    for q in (eager, lazy):
+        q.push(2.0, "PHASE_HOOK", {"n": "y"})
+    assert len(lazy) == 3
+    assert _drain(lazy) == _drain(eager)
+
+
+def test_removing_pending_source_event_drops_the_rest() -> None:
+    q = EventQueue()
+    first = q.reserve(2)
+    q.push_source(iter([(1.0, first, "PHASE_HOOK", {"n": 0}), (2.0, first + 1, "PHASE_HOOK", {"n": 1})]))
+    assert q.remove(first) is True
+    assert q.is_empty() and not q._sources
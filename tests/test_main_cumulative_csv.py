@@ -0,0 +1,36 @@
+import csv
+
+import main
+
+
+def _row(t, uid, event="OP_END"):
+    return {"op_name": "Read_A", "op_id": uid, "op_uid": uid, "die": 0, "plane": 0, "block": 1, "page": 2,
+            "is_resumed": False, "event": event, "triggered_us": t}
+
+
+def _expected(tmp_path, rows):
+    path = tmp_path / "expected.csv"
+    main._csv_write(str(path), sorted(rows, key=main._op_event_sort_key), main.OP_EVENT_RESUME_FIELDS)
+    return path.read_text(encoding="utf-8")
+
+
+def test_appends_merge_rows_tied_at_the_run_boundary(tmp_path):
+    chunks = [[_row(5.0, 2), _row(1.0, 1), _row(9.0, 7)], [_row(9.0, 3), _row(12.0, 1)], []]
+    writer = main._op_event_resume_writer(str(tmp_path / "out"))
+    seen = []
+    for chunk in chunks:
+        seen.extend(chunk)
+        path = writer.append(chunk)
+        # the file is complete after every run
+        assert open(path, encoding="utf-8").read() == _expected(tmp_path, seen)
+    writer.close()
+
+
+def test_older_rows_fall_back_to_a_full_rewrite(tmp_path):
+    writer = main._op_event_resume_writer(str(tmp_path / "out"))
+    writer.append([_row(5.0, 1), _row(8.0, 2)])
+    path = writer.append([_row(3.0, 9)])
+    writer.close()
+    assert open(path, encoding="utf-8").read() == _expected(tmp_path, [_row(5.0, 1), _row(8.0, 2), _row(3.0, 9)])
+    with open(path, encoding="utf-8", newline="") as f:
+        assert [r["op_uid"] for r in csv.DictReader(f)] == ["9", "1", "2"]
@@ -0,0 +1,48 @@
+import csv
+
+from main import export_op_state_timeline
+from resourcemgr import ResourceManager, _StateInterval
+
+CFG = {"topology": {"dies": 2, "planes": 2}, "op_bases": {}, "op_names": {}}
+
+
+def _rm():
+    rm = ResourceManager(cfg=CFG, dies=2, planes=2)
+    st = rm._st
+    for i, (die, plane) in enumerate([(1, 0), (0, 1), (0, 0), (1, 1)]):
+        st.reserve_op(die, plane, "READ", [("ISSUE", 1.0), ("CORE_BUSY", 4.0)], 5.0 * i)
+        st.reserve_op(die, plane, "READ", [("ISSUE", 1.0), ("CORE_BUSY", 4.0)], 30.0)
+    # same-start segments on one plane: the ERASE lands first in the columns but has the larger op_uid
+    st._insert_plane((0, 0), _StateInterval(0, 0, "ERASE", "ISSUE", 30.0, 30.5))
+    return rm
+
+
+def _rows():
+    rows = [{"die": 0, "plane": 0, "op_base": "ERASE", "start_us": 30.0, "end_us": 30.5, "op_uid": 99}]
+    for uid, (die, plane, s0) in enumerate([(1, 0, 0.0), (0, 1, 5.0), (0, 0, 10.0), (1, 1, 15.0)], start=1):
+        rows.append({"die": die, "plane": plane, "op_base": "READ", "start_us": s0, "end_us": s0 + 5.0, "op_uid": uid})
+        rows.append({"die": die, "plane": plane, "op_base": "READ", "start_us": 30.0, "end_us": 35.0, "op_uid": uid + 10})
+    return rows
+
+
+def _written(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(int(r["die"]), int(r["plane"]), r["op_state"], float(r["start"])) for r in csv.DictReader(f)]
+
+
+def _expected(rm, key):
+    segs = sorted(rm.timeline_segments(), key=key)
+    return [(d, p, f"{b}.{s}", s0) for (d, p, b, s, s0, _s1) in segs]
+
+
+def test_merged_plane_streams_match_sorted_segments(tmp_path):
+    rm = _rm()
+    by_plane = export_op_state_timeline(rm, rows=None, out_dir=str(tmp_path), run_idx=0)
+    assert _written(by_plane) == _expected(rm, lambda x: (x[0], x[1], x[4]))
+
+    uid = {(r["die"], r["plane"], r["op_base"], r["start_us"]): r["op_uid"] for r in _rows()}
+    by_time = export_op_state_timeline(rm, rows=_rows(), out_dir=str(tmp_path), run_idx=1)
+    got = _written(by_time)
+    assert got[:2] == [(1, 0, "READ.ISSUE", 0.0), (1, 0, "READ.CORE_BUSY", 1.0)]
+    assert got[8:10] == [(0, 0, "READ.ISSUE", 30.0), (0, 0, "ERASE.ISSUE", 30.0)]
+    assert got == _expected(rm, lambda x: (x[4], x[0], x[1], uid.get((x[0], x[1], x[2], x[4]), 0)))
@@ -0,0 +1,47 @@
+import pytest
+
+import proposer
+
+
+@pytest.fixture(autouse=True)
+def _restore_logger():
+    yield
+    proposer.close_file_log()
+    proposer.set_log_level("debug")
+
+
+def test_levels_gate_lines_and_skip_lazy_formatting(tmp_path):
+    path = tmp_path / "proposer.log"
+    proposer.enable_file_log(str(path))
+    proposer.set_log_level("summary")
+    calls = []
+
+    def _msg():
+        calls.append(1)
+        return "debug line"
+
+    proposer._log(_msg)
+    proposer._log(lambda: "summary line", level=proposer.LOG_SUMMARY)
+    proposer.close_file_log()
+
+    assert calls == []
+    assert path.read_text(encoding="utf-8").splitlines() == ["# proposer debug log", "summary line"]
+
+
+def test_off_silences_stdout_and_unknown_level_is_rejected(capsys):
+    proposer.set_log_level("off")
+    proposer._log("hidden", level=proposer.LOG_SUMMARY)
+    assert capsys.readouterr().out == ""
+    with pytest.raises(ValueError):
+        proposer.set_log_level("verbose")
+
+
+def test_enable_file_log_flushes_previous_handle(tmp_path):
+    first, second = tmp_path / "a.log", tmp_path / "b.log"
+    proposer.enable_file_log(str(first))
+    proposer._log("one")
+    proposer.enable_file_log(str(second))
+    proposer._log("two")
+    proposer.close_file_log()
+    assert first.read_text(encoding="utf-8").splitlines()[-1] == "one"
+    assert second.read_text(encoding="utf-8").splitlines()[-1] == "two"
@@ -0,0 +1,70 @@
+import pytest
+
+import proposer
+from resourcemgr import Scope
+
+
+def _cfg():
+    return {
+        "op_bases": {
+            "READ": {
+                "scope": "PLANE_SET",
+                "states": [
+                    {"ISSUE": None, "bus": True},
+                    {"CORE_BUSY": None, "bus": False},
+                    {"DATA_OUT": None, "bus": True},
+                ],
+            },
+            "SR": {"scope": "NONE", "instant_resv": True, "states": [{"name": "ISSUE", "bus": True}]},
+        },
+        "op_names": {
+            "Read_SLC": {
+                "base": "READ",
+                "celltype": "SLC",
+                "multi": False,
+                "durations": {"ISSUE": 0.5, "CORE_BUSY": 10.0, "DOUT": 2.0},
+            },
+            "Read_Status": {"base": "SR", "celltype": "NONE", "durations": {"ISSUE": 0.2}},
+            "Broken": {"base": "READ", "durations": {"ISSUE": "x"}},
+        },
+    }
+
+
+def test_spec_compiles_states_offsets_and_flags() -> None:
+    cfg = _cfg()
+    table = proposer.op_spec_table(cfg)
+    spec = table.spec("Read_SLC")
+    assert spec is not None
+    assert [(s.name, s.dur_us, s.bus) for s in spec.states] == [
+        ("ISSUE", 0.5, True),
+        ("CORE_BUSY", 10.0, False),
+        ("DATA_OUT", 2.0, True),
+    ]
+    assert spec.total_us == pytest.approx(12.5)
+    assert spec.bus_offsets == ((0.0, 0.5), (10.5, 12.5))
+    assert spec.scope is Scope.PLANE_SET
+    assert spec.celltype == "SLC"
+    assert spec.multi is False
+
+    sr = table.spec("Read_Status")
+    assert sr is not None and sr.instant is True and sr.scope is Scope.NONE
+    assert sr.celltype is None
+    assert table.names_for_base("READ") == ("Read_SLC", "Broken")
+
+
+def test_table_is_shared_by_shallow_copies_and_build_op_reuses_stub() -> None:
+    cfg = _cfg()
+    overlay = dict(cfg)
+    overlay["phase_conditional"] = {"DEFAULT": {"Read_SLC": 1.0}}
+    assert proposer.op_spec_table(overlay) is proposer.op_spec_table(cfg)
+    op_a = proposer._build_op(cfg, "Read_SLC", [])
+    op_b = proposer._build_op(overlay, "Read_SLC", [])
+    assert op_a is op_b
+
+
+def test_build_op_errors_are_raised_per_op() -> None:
+    cfg = _cfg()
+    with pytest.raises(ValueError):
+        proposer._build_op(cfg, "Broken", [])
+    with pytest.raises(KeyError):
+        proposer._build_op(cfg, "Missing", [])
@@ -0,0 +1,93 @@
+from resourcemgr import ExclWindow, ResourceManager, _LatchEntry, _OpMeta
+
+
+def _rm():
+    rm = ResourceManager(cfg={}, dies=1, planes=2)
+    rm._plane_resv[(0, 0)].extend([(0.0, 10.0), (10.0, 20.0), (20.0, 30.0)])
+    rm._bus_resv.extend([(0.0, 1.0), (20.0, 21.0)])
+    rm._excl_die_index(0).extend([ExclWindow(0.0, 10.0, "DIE", 0, {"SINGLE"}), ExclWindow(5.0, 40.0, "DIE", 0, {"SINGLE"})])
+    rm._st.reserve_op(0, 0, "READ", [("ISSUE", 1.0), ("CORE_BUSY", 9.0), ("DATA_OUT", 10.0)], 0.0)
+    return rm
+
+
+def test_compact_retires_windows_ending_before_watermark_only():
+    rm = _rm()
+    stats = rm.compact(20.0)
+    assert stats == {"plane": 2, "bus": 1, "excl": 1, "timeline": 0}
+    assert rm._plane_resv[(0, 0)] == [(20.0, 30.0)]
+    assert rm._bus_resv == [(20.0, 21.0)]
+    assert [(w.start, w.end) for w in rm._excl_die[0]] == [(5.0, 40.0)]
+    # no archive configured: the state timeline is left for the exporters
+    assert len(rm._st.by_plane[(0, 0)]) == 3
+
+
+def test_compact_floor_tracks_ongoing_ops_and_latches():
+    rm = ResourceManager(cfg={}, dies=1, planes=2)
+    assert rm.compact_floor_us() is None
+    rm._ongoing_ops[0].append(_OpMeta(die=0, base="ERASE", start_us=42.0, end_us=90.0))
+    assert rm.compact_floor_us() == 42.0
+    rm._set_latch_entry(0, 1, _LatchEntry(kind="LATCH_ON_READ", start_us=30.0, end_us=None))
+    assert rm.compact_floor_us() == 30.0
+    rm._ongoing_ops[0].clear()
+    rm._latch.clear()
+    assert rm.compact_floor_us() is None
+
+
+def test_timeline_archive_round_trip_preserves_phase_keys(tmp_path):
+    rm = _rm()
+    before = [rm.phase_key_at(0, 0, t) for t in (0.5, 5.0, 15.0, 25.0)]
+    rm.set_timeline_archive(str(tmp_path / "st.csv"))
+    stats = rm.compact(20.0)
+    # ISSUE/CORE_BUSY retired; DATA_OUT kept as the END anchor for queries at/after the watermark
+    assert stats["timeline"] == 2
+    assert rm.phase_key_at(0, 0, 25.0) == "READ.END"
+    assert rm.restore_timeline_archive() == 2
+    assert not (tmp_path / "st.csv").exists()
+    assert [rm.phase_key_at(0, 0, t) for t in (0.5, 5.0, 15.0, 25.0)] == before
+
+
+_SCHED_CFG = {
+    "topology": {"dies": 1, "planes": 2, "blocks_per_die": 16, "pages_per_block": 8},
+    "policies": {"queue_refill_period_us": 10.0, "admission_window": 5.0},
+    "op_bases": {
+        "ERASE": {"scope": "DIE_WIDE", "states": [{"ISSUE": None, "bus": True}, {"CORE_BUSY": None}]},
+        "PROGRAM_SLC": {"scope": "PLANE_SET", "states": [{"ISSUE": None, "bus": True}, {"CORE_BUSY": None}]},
+    },
+    "op_names": {
+        "Erase_SLC": {"base": "ERASE", "celltype": "SLC", "durations": {"ISSUE": 0.5, "CORE_BUSY": 20.0}},
+        "Program_SLC": {"base": "PROGRAM_SLC", "celltype": "SLC", "durations": {"ISSUE": 0.5, "CORE_BUSY": 8.0}},
+    },
+    "phase_conditional": {"DEFAULT": {"Erase_SLC": 0.4, "Program_SLC": 0.6}},
+}
+
+
+def _scheduled_rm(policies):
+    import numpy as np
+    from addrman import AddressManager
+    from main import InstrumentedScheduler
+
+    cfg = dict(_SCHED_CFG, policies=dict(_SCHED_CFG["policies"], **policies))
+    rm = ResourceManager(cfg=cfg, dies=1, planes=2)
+    am = AddressManager(num_planes=2, num_blocks=16, pagesize=8, num_dies=1)
+    am._rng = np.random.default_rng(7)
+    rm.register_addr_policy(am.check_epr)
+    sched = InstrumentedScheduler(cfg=cfg, rm=rm, addrman=am)
+    sched.run(run_until_us=3000)
+    return rm, sched
+
+
+def test_default_config_keeps_snapshot_windows():
+    import os
+
+    import yaml
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "config.yaml"), encoding="utf-8") as f:
+        shipped = (yaml.safe_load(f).get("policies") or {}).get("rm_compact_period_us")
+    rm, sched = _scheduled_rm({} if shipped is None else {"rm_compact_period_us": shipped})
+    assert sched.metrics["rm_compactions"] == 0
+    snap = rm.snapshot()
+    first = min(r["start_us"] for r in sched.timeline_rows())
+    assert min(w[0] for w in snap["bus_resv"]) == first
+    # the same run with compaction enabled does retire windows from the snapshot
+    rm_c, _ = _scheduled_rm({"rm_compact_period_us": 100.0})
+    assert len(rm_c.snapshot()["bus_resv"]) < len(snap["bus_resv"])
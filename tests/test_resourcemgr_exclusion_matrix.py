@@ -0,0 +1,45 @@
+from resourcemgr import ExclusionMatrix, ResourceManager, exclusion_matrix
+
+
+def _cfg():
+    return {
+        "exclusion_groups": {
+            "after_erase": ["READ", "PROGRAM_SLC"],
+            "after_read": ["READ", "ERASE"],
+            "empty": [],
+        },
+        "exclusions_by_op_state": {"ERASE.CORE_BUSY": ["after_erase", "after_read"]},
+        "exclusions_by_odt_state": {"ODT_DISABLE": ["after_read"]},
+        "exclusions_by_suspend_state": {"ERASE_SUSPENDED": ["after_erase"], "NOT_ERASE_SUSPENDED": ["empty"]},
+    }
+
+
+def test_state_masks_match_group_membership():
+    em = ExclusionMatrix(_cfg())
+    assert em.blocks("op_state", "ERASE.CORE_BUSY", "ERASE")
+    assert em.blocks("odt", "ODT_DISABLE", "READ")
+    assert not em.blocks("odt", "ODT_DISABLE", "PROGRAM_SLC")
+    assert not em.blocks("op_state", "READ.CORE_BUSY", "READ")
+    assert em.base_bit("SR") == 0 and not em.blocks("odt", "ODT_DISABLE", "SR")
+    assert em.blocking_groups("READ", ["after_read", "missing", "after_erase"]) == ("after_read", "after_erase")
+    # deduplicated in group order
+    assert em.excluded_bases("op_state", "ERASE.CORE_BUSY") == ("READ", "PROGRAM_SLC", "ERASE")
+
+
+def test_matrix_is_shared_by_shallow_copies_and_rebuilt_on_new_groups():
+    cfg = _cfg()
+    em = exclusion_matrix(cfg)
+    assert exclusion_matrix(dict(cfg)) is em
+    cfg2 = dict(cfg)
+    cfg2["exclusion_groups"] = {"after_erase": ["ERASE"]}
+    assert exclusion_matrix(cfg2) is not em
+    assert exclusion_matrix(cfg2).blocks("suspend", "ERASE_SUSPENDED", "ERASE")
+
+
+def test_resource_manager_rules_use_compiled_masks():
+    rm = ResourceManager(cfg=_cfg(), dies=1, planes=1)
+    assert rm._blocked_by_groups("ERASE", ["after_erase", "after_read"])
+    assert not rm._blocked_by_groups("ERASE", ["after_erase"])
+    assert rm._rule_forbid_on_odt("READ", 0.0) is None
+    rm.set_odt_disable()
+    assert rm._rule_forbid_on_odt("READ", 0.0) == "state_forbid_odt"
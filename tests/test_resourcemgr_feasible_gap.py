@@ -0,0 +1,48 @@
+from resourcemgr import Address, ExclWindow, ResourceManager, Scope, _LatchEntry
+
+
+class _State:
+    def __init__(self, name, dur_us, bus=False):
+        self.name = name
+        self.dur_us = float(dur_us)
+        self.bus = bool(bus)
+
+
+class _Op:
+    def __init__(self, base="READ", dur_us=5.0):
+        self.base = base
+        self.states = [_State("ISSUE", 1.0, bus=True), _State("CORE_BUSY", dur_us)]
+
+
+T = [Address(die=0, plane=0, block=0, page=0)]
+
+
+def test_search_steps_past_bus_and_die_windows():
+    rm = ResourceManager(cfg={}, dies=1, planes=2)
+    rm._bus_resv.extend([(0.0, 2.0), (2.5, 4.0)])
+    # a committed multi-plane window blocks single-plane ops on the die until 9.0
+    rm._excl_die_index(0).append(ExclWindow(4.0, 9.0, "DIE", 0, {"MULTI"}))
+    op = _Op()
+    assert rm.feasible_at(op, T, 0.0) is None
+    # bus frees at 2.0 (too short a gap), then 4.0; the MULTI window pushes to 9.0
+    assert rm.feasible_at(op, T, 0.0, horizon_us=20.0) == 9.0
+    assert rm.feasible_at(op, T, 0.0, horizon_us=5.0) is None
+
+
+def test_search_waits_for_latch_release_and_keeps_legacy_first_candidate():
+    cfg = {"exclusion_groups": {"g": ["READ"]}, "exclusions_by_latch_state": {"LATCH_ON_READ": ["g"]}}
+    rm = ResourceManager(cfg=cfg, dies=1, planes=1)
+    rm._set_latch_entry(0, 0, _LatchEntry(kind="LATCH_ON_READ", start_us=0.0, end_us=3.0))
+    assert rm.feasible_at(_Op(), T, 0.0, horizon_us=10.0) == 3.0
+    rm._avail[(0, 0)] = 50.0
+    # planes busy past the horizon: the first candidate is still returned as before
+    assert rm.feasible_at(_Op(), T, 0.0, horizon_us=10.0) == rm.feasible_at(_Op(), T, 0.0) == 50.0
+
+
+def test_reserve_honours_searched_start():
+    rm = ResourceManager(cfg={}, dies=1, planes=1)
+    rm._bus_resv.append((0.0, 2.0))
+    txn = rm.begin(0.0)
+    assert not rm.reserve(txn, _Op(), T, Scope.PLANE_SET).ok
+    res = rm.reserve(txn, _Op(), T, Scope.PLANE_SET, start_us=rm.feasible_at(_Op(), T, 0.0, horizon_us=5.0))
+    assert res.ok and res.start_us == 2.0
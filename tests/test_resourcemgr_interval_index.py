@@ -0,0 +1,77 @@
+import random
+
+from resourcemgr import ExclWindow, ResourceManager, _IntervalIndex, _window_span
+
+
+def _brute(windows, a, b):
+    return sorted(w for w in windows if not (b <= w[0] or w[1] <= a))
+
+
+def test_overlapping_matches_linear_scan_with_out_of_order_inserts():
+    rng = random.Random(7)
+    windows = []
+    idx = _IntervalIndex()
+    for _ in range(400):
+        s = round(rng.uniform(0.0, 1000.0), 2)
+        w = (s, round(s + rng.uniform(0.1, 80.0), 2))
+        windows.append(w)
+        idx.append(w)
+    # queries run over the sorted slots; snapshot/list views keep insertion order
+    assert idx._items == sorted(windows)
+    assert list(idx) == windows and idx[0] == windows[0]
+    for _ in range(200):
+        a = rng.uniform(-10.0, 1100.0)
+        b = a + rng.uniform(0.0, 50.0)
+        assert sorted(idx.overlapping(a, b)) == _brute(windows, a, b)
+        assert idx.any_overlap(a, b) == bool(_brute(windows, a, b))
+
+
+def test_touching_windows_do_not_overlap_and_list_equality_holds():
+    idx = _IntervalIndex([(0.0, 10.0), (10.0, 20.0)])
+    assert not idx.any_overlap(20.0, 30.0)
+    assert idx.overlapping(5.0, 10.0) == [(0.0, 10.0)]
+    assert idx == [(0.0, 10.0), (10.0, 20.0)]
+    assert idx.max_end() == 20.0
+
+
+def test_restore_rebuilds_indexes_from_snapshot_lists():
+    rm = ResourceManager(cfg={}, dies=1, planes=2)
+    rm._plane_resv[(0, 1)].append((5.0, 9.0))
+    rm._excl_die_index(0).append(ExclWindow(5.0, 9.0, "DIE", 0, {"SINGLE"}))
+    snap = rm.snapshot()
+
+    other = ResourceManager(cfg={}, dies=1, planes=2)
+    other.restore(snap)
+
+    assert isinstance(other._plane_resv[(0, 1)], _IntervalIndex)
+    assert other._plane_resv[(0, 1)].any_overlap(8.0, 12.0)
+    assert [(w.start, w.end) for w in other._excl_die[0].overlapping(0.0, 6.0)] == [(5.0, 9.0)]
+    assert _window_span(other._excl_die[0][0]) == (5.0, 9.0)
+
+
+def test_replace_and_remove_match_a_rebuilt_index():
+    rng = random.Random(11)
+    windows = []
+    idx = _IntervalIndex()
+    for _ in range(200):
+        s = round(rng.uniform(0.0, 500.0), 2)
+        w = (s, round(s + rng.uniform(0.1, 40.0), 2))
+        windows.append(w)
+        idx.append(w)
+    for _ in range(60):
+        j = rng.randrange(len(windows))
+        old = windows[j]
+        if rng.random() < 0.5:
+            idx.remove(old)
+            del windows[j]
+        else:
+            new = (old[0], round(old[0] + rng.uniform(0.0, 60.0), 2))
+            idx.replace(old, new)
+            windows[j] = new
+    rebuilt = _IntervalIndex(windows)
+    assert list(idx) == windows
+    assert idx._items == rebuilt._items and idx._maxend == rebuilt._maxend
+    for _ in range(100):
+        a = rng.uniform(-10.0, 600.0)
+        b = a + rng.uniform(0.0, 30.0)
+        assert sorted(idx.overlapping(a, b)) == _brute(windows, a, b)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from resourcemgr import ResourceManager
+
+
+def _rm():
+    rm = ResourceManager(cfg={}, dies=2, planes=2)
+    st = rm._st
+    st.reserve_op(0, 0, "PLANE_READ", [("ISSUE", 1.0), ("CORE_BUSY", 4.0), ("DATA_OUT", 2.0)], 0.0)
+    st.reserve_op(0, 0, "ERASE", [("ISSUE", 0.5), ("CORE_BUSY", 3.0)], 7.0)
+    st.reserve_op(0, 1, "PROGRAM_SLC", [("ISSUE", 1.0), ("DATA_IN", 2.0), ("CORE_BUSY", 5.0)], 12.0)
+    st.reserve_op(1, 1, "PLANE_READ", [("ISSUE", 1.0), ("CORE_BUSY", 2.0)], 3.0)
+    return rm
+
+
+def _times():
+    # segment boundaries, interior points, gaps and values that quantize onto a boundary
+    return np.array([0.0, 0.5, 1.0, 4.999, 5.0, 6.0, 7.0, 7.2, 7.5, 10.5, 11.0, 12.0, 13.004, 15.0, 20.0, 25.0, -1.0])
+
+
+def test_phase_keys_match_scalar_lookup():
+    rm = _rm()
+    ts = _times()
+    for die in range(2):
+        for plane in range(2):
+            got = rm.phase_keys_at(die, plane, ts).tolist()
+            assert got == [rm.phase_key_at(die, plane, float(t)) for t in ts]
+            for flags in ((False, True, True), (True, False, True), (True, True, False)):
+                kw = dict(zip(("derive_end", "prefer_end_on_boundary", "exclude_issue"), flags))
+                got = rm.phase_keys_at(die, plane, ts, **kw).tolist()
+                assert got == [rm.phase_key_at(die, plane, float(t), **kw) for t in ts]
+
+
+def test_mixed_die_plane_arrays_and_op_states():
+    rm = _rm()
+    ts = np.tile(_times(), 4)
+    dies = np.repeat([0, 0, 1, 1], len(_times()))
+    planes = np.repeat([0, 1, 0, 1], len(_times()))
+    expected = [rm.phase_key_at(int(d), int(p), float(t)) for d, p, t in zip(dies, planes, ts)]
+    assert rm.phase_keys_at(dies, planes, ts).tolist() == expected
+    assert rm.op_states_at(dies, planes, ts).tolist() == [rm.op_state(int(d), int(p), float(t)) for d, p, t in zip(dies, planes, ts)]
+    assert rm.phase_keys_at([], [], []).tolist() == []
+
+
+def test_die_status_reports_busy_over_io():
+    rm = _rm()
+    status = rm.die_status_at([0, 0, 0, 0, 1, 0], [0.5, 2.0, 5.5, 13.5, 4.5, 30.0]).tolist()
+    assert status == ["ready", "busy", "extrdy", "extrdy", "busy", "ready"]
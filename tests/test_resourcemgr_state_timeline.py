@@ -0,0 +1,37 @@
+from resourcemgr import _StateInterval, _StateTimeline
+
+
+def _tl():
+    st = _StateTimeline()
+    for i in range(40):  # past the initial column capacity
+        st.reserve_op(0, 0, "READ", [("ISSUE", 1.0), ("CORE_BUSY", 4.0)], 10.0 * i)
+    return st
+
+
+def test_columns_grow_and_intern_names():
+    st = _tl()
+    segs = st.plane((0, 0))
+    assert len(segs) == 80 and len(segs.start) >= 80
+    assert st._names == ["READ", "ISSUE", "CORE_BUSY"]
+    assert st.state_at(0, 0, 11.5) == "READ.CORE_BUSY"
+    assert st.state_at(0, 0, 16.0) is None
+    assert st.next_boundary_after(12.0) == 15.0
+    assert st.overlaps_plane(0, 0, 14.0, 20.0)
+    assert not st.overlaps_plane(0, 0, 15.0, 20.0)
+    assert st.overlaps_plane(0, 0, 14.0, 20.0, pred=lambda s: s.state == "CORE_BUSY")
+    assert not st.overlaps_plane(0, 0, 14.0, 20.0, pred=lambda s: s.state == "ISSUE")
+
+
+def test_out_of_order_insert_ties_and_truncate():
+    st = _tl()
+    st._insert_plane((0, 0), _StateInterval(0, 0, "ERASE", "ISSUE", 10.0, 10.5))
+    segs = st.by_plane[(0, 0)]
+    assert [(s.op_base, s.start_us) for s in segs[1:4]] == [("READ", 1.0), ("ERASE", 10.0), ("READ", 10.0)]
+    st.truncate_after(0, 0, 12.0, pred=lambda s: s.op_base == "READ")
+    rows = [r for r in st.segments() if r[4] < 25.0]
+    assert rows[-1] == (0, 0, "READ", "CORE_BUSY", 11.0, 12.0)
+    assert all(r[4] < 12.0 for r in st.segments())
+    retired = st.retire_before(11.0)
+    assert [(s.op_base, s.start_us) for s in retired] == [("READ", 0.0), ("READ", 1.0), ("ERASE", 10.0)]
+    # the last retired-prefix segment stays as the .END anchor
+    assert (st.by_plane[(0, 0)][0].op_base, st.by_plane[(0, 0)][0].end_us) == ("READ", 11.0)
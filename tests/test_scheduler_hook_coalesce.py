@@ -0,0 +1,35 @@
+from resourcemgr import ResourceManager
+from scheduler import Scheduler
+
+
+class _EmptyAddrMan:
+    def sample_read(self, **_kw):
+        return []
+
+
+def _sched(mode):
+    cfg = {
+        "topology": {"dies": 2, "planes": 2},
+        "policies": {"queue_refill_period_us": 100.0, "phase_hook_coalesce": mode},
+        "op_bases": {"READ": {"scope": "PLANE_SET", "states": [{"ISSUE": None, "bus": True}]}},
+        "op_names": {"Read_A": {"base": "READ", "durations": {"ISSUE": 1.0}}},
+        "phase_conditional": {"DEFAULT": {"Read_A": 1.0}},
+    }
+    sched = Scheduler(cfg=cfg, rm=ResourceManager(cfg=cfg, dies=2, planes=2), addrman=_EmptyAddrMan())
+    sched._eq.pop_time_batch()  # drop the seed refill
+    hooks = [(0, 0, "READ.CORE_BUSY"), (0, 1, "READ.CORE_BUSY"), (0, 0, "READ.CORE_BUSY"), (1, 0, "READ.CORE_BUSY"), (0, 0, "ERASE.CORE_BUSY")]
+    for die, plane, label in hooks:
+        sched._eq.push(10.0, "PHASE_HOOK", payload={"hook": {"die": die, "plane": plane, "label": label}})
+    sched._eq.push(20.0, "PHASE_HOOK", payload={"hook": {"die": 0, "plane": 0, "label": "READ.CORE_BUSY"}})
+    return sched
+
+
+def test_coalescing_collapses_peers_within_one_instant_only():
+    counts = {}
+    for mode in ("off", "plane", "die"):
+        sched = _sched(mode)
+        sched.tick()
+        sched.tick()
+        counts[mode] = (sched.metrics["propose_calls"], sched.metrics["phase_hooks_coalesced"])
+    # the t=20 hook is never merged with its t=10 peer
+    assert counts == {"off": (6, 0), "plane": (5, 1), "die": (4, 2)}
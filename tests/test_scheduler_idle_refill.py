@@ -0,0 +1,91 @@
+from resourcemgr import ResourceManager
+from scheduler import Scheduler
+
+
+class _EmptyAddrMan:
+    def sample_read(self, **_kw):
+        return []
+
+
+def _cfg(dist):
+    return {
+        "topology": {"dies": 1, "planes": 2},
+        "policies": {"queue_refill_period_us": 100.0, "queue_refill_mode": "idle", "admission_window": 0.5},
+        "op_bases": {
+            "READ": {"scope": "PLANE_SET", "states": [{"ISSUE": None, "bus": True}]},
+            "SR": {"scope": "NONE", "instant_resv": True, "states": [{"ISSUE": None, "bus": True}]},
+        },
+        "op_names": {
+            "Read_A": {"base": "READ", "durations": {"ISSUE": 1.0}},
+            "Sr_A": {"base": "SR", "durations": {"ISSUE": 1.0}},
+        },
+        "phase_conditional": {"DEFAULT": dist},
+    }
+
+
+def _busy_sched(dist, busy_until=7000.0):
+    cfg = _cfg(dist)
+    rm = ResourceManager(cfg=cfg, dies=1, planes=2)
+    for key in rm._avail:
+        rm._avail[key] = busy_until
+    sched = Scheduler(cfg=cfg, rm=rm, addrman=_EmptyAddrMan())
+    sched._eq.pop_time_batch()  # drop the seed refill
+    return sched
+
+
+def test_ticks_are_futile_only_while_planes_busy_and_no_instant_op():
+    sched = _busy_sched({"Read_A": 1.0})
+    assert sched._refill_futile(0.0)
+    assert not sched._refill_futile(6999.6)
+    assert not _busy_sched({"Read_A": 0.9, "Sr_A": 0.1})._refill_futile(0.0)
+    assert _busy_sched({"Read_A": 1.0, "Sr_A": 0.0})._refill_futile(0.0)
+
+
+def test_futile_refill_parks_at_free_instant_across_events():
+    sched = _busy_sched({"Read_A": 1.0})
+    sched._eq.push(0.0, "QUEUE_REFILL", payload={})
+    sched._eq.push(3000.0, "OP_END", payload={})
+    sched.tick()
+    assert sched.metrics["refill_wakeups_saved"] == 69
+    assert [(t, kind) for t, _pri, _seq, kind, _p in sched._eq.entries()] == [
+        (3000.0, "OP_END"),
+        (7000.0, "QUEUE_REFILL"),
+    ]
+
+
+def test_parked_refill_rearms_when_rm_releases_earlier():
+    sched = _busy_sched({"Read_A": 1.0})
+    sched._eq.push(0.0, "QUEUE_REFILL", payload={})
+    sched.tick()
+    sched._deps.rm._avail[(0, 1)] = 2000.0  # e.g. a suspend truncated the plane's work
+    sched._deps.rm._touch(0)
+    sched._eq.push(500.0, "OP_END", payload={})
+    sched.tick()
+    assert sched.metrics["refill_wakeups_saved"] == 19
+    assert [(t, kind) for t, _pri, _seq, kind, _p in sched._eq.entries()] == [(2000.0, "QUEUE_REFILL")]
+
+
+def _refill_pops(mode):
+    sched = _busy_sched({"Read_A": 1.0}, busy_until=1000.0)
+    sched._refill_idle = mode == "idle"
+    sched._eq.push(0.0, "QUEUE_REFILL", payload={})
+    pops = []
+    pop = sched._eq.pop_time_batch
+
+    def counting_pop():
+        t, batch = pop()
+        pops.extend(t for _t, _pri, _seq, kind, _p in batch if kind == "QUEUE_REFILL")
+        return t, batch
+
+    sched._eq.pop_time_batch = counting_pop
+    sched.run(run_until_us=2000)
+    return sched, pops
+
+
+def test_idle_run_skips_wakeups_until_planes_free():
+    sched, pops = _refill_pops("idle")
+    _periodic, periodic_pops = _refill_pops("periodic")
+    assert len(periodic_pops) == 21 and pops == [0.0] + [1000.0 + 100.0 * k for k in range(11)]
+    m = sched.metrics
+    assert m["refill_ticks_saved"] == 10 and m["refill_wakeups_saved"] == 9
+    assert m["propose_calls"] == 11  # 1000, 1100, ..., 2000
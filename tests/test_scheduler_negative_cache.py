@@ -0,0 +1,80 @@
+from resourcemgr import ResourceManager
+from scheduler import Scheduler
+
+
+class _EmptyAddrMan:
+    version = 0
+
+    def sample_read(self, **_kw):
+        return []
+
+
+def _sched():
+    cfg = {
+        "topology": {"dies": 2, "planes": 1},
+        "policies": {"propose_negative_cache": True},
+        "op_bases": {"READ": {"scope": "PLANE_SET", "states": [{"ISSUE": None, "bus": True}]}},
+        "op_names": {"Read_A": {"base": "READ", "durations": {"ISSUE": 1.0}}},
+        "phase_conditional": {"DEFAULT": {"Read_A": 1.0}},
+    }
+    rm = ResourceManager(cfg=cfg, dies=2, planes=1)
+    sched = Scheduler(cfg=cfg, rm=rm, addrman=_EmptyAddrMan())
+    sched._eq.pop_time_batch()  # drop the seed refill
+    return sched, rm
+
+
+def test_versions_track_die_bus_and_global_mutations():
+    rm = ResourceManager(cfg={}, dies=2, planes=1)
+    txn = rm.begin(0.0)
+    txn.plane_resv[(1, 0)] = [(0.0, 5.0)]
+    txn.bus_resv.append((0.0, 1.0))
+    rm.commit(txn)
+    assert (rm.state_version(0), rm.state_version(1), rm.bus_version()) == (0, 1, 1)
+    rm.set_odt_disable()
+    assert (rm.state_version(0), rm.state_version(1)) == (1, 2)
+    g = rm.state_version()
+    rm.end_cache_program(0, 3.0)
+    assert rm.state_version() == g + 1 and rm.state_version(1) == 2
+
+
+def test_failed_proposal_is_reused_until_versions_change():
+    sched, rm = _sched()
+    hook = {"label": "DEFAULT", "die": 0, "plane": 0}
+    first = sched._propose_and_schedule(0.0, hook)
+    assert sched._propose_and_schedule(0.0, hook) == first
+    assert (sched.metrics["propose_calls"], sched.metrics["propose_cache_hits"]) == (1, 1)
+    # die 1 changes do not touch die 0 entries; ODT changes every die
+    rm.begin_cache_read(1, 0, 0.0)
+    sched._propose_and_schedule(0.0, hook)
+    assert sched.metrics["propose_cache_hits"] == 2
+    rm.set_odt_disable()
+    sched._propose_and_schedule(0.0, hook)
+    assert sched.metrics["propose_calls"] == 2
+
+
+def test_refill_ticks_reuse_failures_until_address_state_changes():
+    sched, rm = _sched()
+    sched._eq.push(0.0, "QUEUE_REFILL", payload={})
+    for _ in range(6):  # refill hooks alternate die 0 / die 1
+        sched.tick()
+    assert sched.now_us > 0.0
+    assert (sched.metrics["propose_calls"], sched.metrics["propose_cache_hits"]) == (2, 4)
+    sched._deps.addrman.version += 1  # any AddressManager mutation
+    sched.tick()
+    assert sched.metrics["propose_calls"] == 3
+    # hooks carrying targets are never cached
+    hook = {"label": "DEFAULT", "die": 0, "plane": 0, "targets": []}
+    assert sched._neg_cache_key(0.0, hook, sched._deps.cfg) == (None, None)
+
+
+def test_release_bound_covers_die_windows_and_states():
+    rm = ResourceManager(cfg={}, dies=2, planes=1)
+    rm._st.reserve_op(0, 0, "READ", [("CORE_BUSY", 10.0)], 100.0)
+    rm._plane_resv[(1, 0)].append((0.0, 30.0))
+    rm._bus_resv.append((20.0, 25.0))
+    assert rm.next_release_us(0, 50.0) == 100.0
+    assert rm.next_release_us(0, 105.0) == 110.0
+    assert rm.next_release_us(0, 0.0) == 25.0
+    assert rm.next_release_us(1, 26.0) == 30.0
+    # state blocks only wait on latch/cache/suspend releases
+    assert rm.next_release_us(0, 0.0, windows=False) is None
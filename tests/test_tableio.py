@@ -0,0 +1,105 @@
+import pytest
+
+import tableio
+from script_operation_timeline_counts import collect_counts_from_directories
+
+FIELDS = ["start", "die", "op_name", "op_base", "source", "is_resumed", "note"]
+
+
+def _rows():
+    return [
+        {"start": 0.0, "die": 0, "op_name": "Read_A", "op_base": "READ", "source": None, "is_resumed": False, "note": 1},
+        {"start": 7000.110000000001, "die": 1, "op_name": "Erase_A", "op_base": "ERASE", "source": "x", "is_resumed": True, "note": "n"},
+        {"start": 12.5, "die": 0, "op_name": "Read_A", "op_base": "READ", "source": None, "is_resumed": False, "note": None},
+    ]
+
+
+def test_npz_round_trip_keeps_dtypes_and_dictionary_encodes_strings(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / f"operation_timeline_1{tableio.table_suffix('npz')}"
+    tableio.write_table(str(path), iter(_rows()), FIELDS, "npz")
+
+    with np.load(path) as z:
+        assert list(z["__columns__"]) == FIELDS
+        assert z["op_name"].dtype == np.int32 and list(z["op_name__dict"]) == ["Read_A", "Erase_A"]
+        assert z["start"].dtype == np.float64 and z["die"].dtype == np.int64 and z["is_resumed"].dtype == bool
+        assert list(z["source"]) == [-1, 0, -1]
+
+    assert tableio.table_columns(str(path)) == FIELDS
+    assert tableio.value_counts(str(path), "op_base") == {"READ": 2, "ERASE": 1}
+    df = tableio.read_table(str(path))
+    assert df["start"].tolist()[1] == 7000.110000000001
+    assert df["op_name"].astype(str).tolist() == ["Read_A", "Erase_A", "Read_A"]
+    # mixed-type columns fall back to (dictionary-encoded) strings
+    assert df["note"].astype(object).tolist()[:2] == ["1", "n"] and df["note"].isna().tolist()[2]
+
+
+def test_parquet_round_trip_keeps_dtypes_and_categoricals(tmp_path):
+    pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    path = tmp_path / f"op_state_timeline_1{tableio.table_suffix('parquet')}"
+    tableio.write_table(str(path), iter(_rows()), FIELDS, "parquet")
+
+    assert tableio.parquet_available()
+    assert tableio.table_columns(str(path)) == FIELDS
+    assert tableio.value_counts(str(path), "op_base") == {"READ": 2, "ERASE": 1}
+    df = tableio.read_table(str(path))
+    assert str(df["start"].dtype) == "float64" and str(df["die"].dtype) == "int64"
+    assert str(df["is_resumed"].dtype) == "bool" and str(df["op_name"].dtype) == "category"
+    assert df["start"].tolist()[1] == 7000.110000000001
+    assert df["op_name"].astype(str).tolist() == ["Read_A", "Erase_A", "Read_A"]
+    assert df["source"].isna().tolist() == [True, False, True]
+
+
+@pytest.mark.parametrize("fmt", ["npz", "parquet"])
+def test_appender_adds_parts_and_resumes_after_a_prefix(tmp_path, fmt):
+    pytest.importorskip("pyarrow" if fmt == "parquet" else "numpy")
+    path = str(tmp_path / f"op_event_resume{tableio.table_suffix(fmt)}")
+    rows = _rows()
+    out = tableio.TableAppender(path, FIELDS, fmt)
+    out.append(rows[:2])
+    out.append([])
+    out.append(rows[2:])
+    out.close()
+    assert out.parts == 2 and out.rows == 3
+    if fmt == "npz":
+        assert not (tmp_path / "op_event_resume.npz").exists()
+        assert (tmp_path / "op_event_resume.part0002.npz").exists()
+    else:
+        import pyarrow.parquet as pq
+
+        assert pq.ParquetFile(path).num_row_groups == 2
+    # later parts may use new categories; readers merge them
+    assert tableio.value_counts(path, "op_name") == {"Read_A": 2, "Erase_A": 1}
+    assert tableio.table_columns(path) == FIELDS
+    df = tableio.read_table(path)
+    assert df["op_name"].astype(str).tolist() == ["Read_A", "Erase_A", "Read_A"]
+    assert str(df["die"].dtype) == "int64" and str(df["start"].dtype) == "float64"
+
+    for dest in (path, str(tmp_path / "moved" / f"op_event_resume{tableio.table_suffix(fmt)}")):
+        again = tableio.TableAppender(dest, FIELDS, fmt)
+        again.resume(path, 1, 2, out.kinds)
+        again.append(rows[:1])
+        again.close()
+        assert [r["start"] for r in tableio.read_rows(dest)] == [0.0, 7000.110000000001, 0.0]
+    # the first batch pins each column's storage kind
+    pinned = tableio.TableAppender(str(tmp_path / "pinned" / f"t{tableio.table_suffix(fmt)}"), FIELDS, fmt)
+    pinned.append(rows[:1])
+    with pytest.raises(ValueError, match="die"):
+        pinned.append([dict(rows[0], die=None)])
+    pinned.close()
+
+
+def test_counts_script_accepts_columnar_and_csv_timelines(tmp_path):
+    pytest.importorskip("numpy")
+    tableio.write_table(str(tmp_path / "operation_timeline_a.npz"), _rows(), FIELDS, "npz")
+    (tmp_path / "operation_timeline_b.csv").write_text("op_name,op_base\nRead_B,READ\n", encoding="utf-8")
+    names, bases = collect_counts_from_directories([tmp_path])
+    assert names == {"Read_A": 2, "Erase_A": 1, "Read_B": 1}
+    assert bases == {"READ": 3, "ERASE": 1}
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        tableio.table_suffix("feather")
+    assert tableio.format_of("x/op_state_timeline_1.parquet") == "parquet"
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Benchmark: AddressManager sampling (random_*/check_epr) latency and memory.
+
+Every (blocks, pages) topology starts from the same prepared state: half of
+the blocks erased (TLC), half of those lightly programmed. State is restored
+before each section, so ERASE/PGM/READ timings do not depend on each other.
+Sections cover single-plane and ``--mp-size`` multi-plane requests,
+sequential and non-sequential, plus ``check_epr`` on sampled targets.
+
+``--impl pool,mask`` times the incremental candidate pools against the full
+mask path (pools disabled via ``pool_min_blocks``). Results go to stdout as
+CSV and optionally to ``--csv-out``/``--json-out``; ``--compare`` checks the
+run against a saved CSV/JSON baseline and exits 1 on regressions above
+``--tolerance``.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from addrman import ERASE, TLC, AddressManager  # noqa: E402
+
+KEY_FIELDS = ["impl", "planes", "dies", "blocks", "pages", "iters", "mp_size"]
+SINGLE_FIELDS = ["erase_ms", "pgm_ms", "read_ms", "pgm_seq_ms", "read_seq_ms"]
+MULTI_FIELDS = ["mp_erase_ms", "mp_pgm_ms", "mp_pgm_seq_ms", "mp_read_ms", "mp_read_seq_ms"]
+EPR_FIELDS = ["epr_pgm_ms", "epr_read_ms"]
+MEM_FIELDS = ["state_kib", "peak_kib"]
+FIELDS = KEY_FIELDS + SINGLE_FIELDS + MULTI_FIELDS + EPR_FIELDS + MEM_FIELDS
+TIME_FIELDS = SINGLE_FIELDS + MULTI_FIELDS + EPR_FIELDS
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(x) for x in str(text).split(",") if x.strip()]
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--planes", type=int, default=4)
+    parser.add_argument("--dies", type=int, default=1)
+    parser.add_argument("--blocks", type=str, default="4096,16384", help="Comma-separated blocks per die.")
+    parser.add_argument("--pages", type=str, default="256,2048", help="Comma-separated pages per block.")
+    parser.add_argument("--iters", type=int, default=100, help="Calls timed per section (default: 100).")
+    parser.add_argument("--erase-size", type=int, default=64)
+    parser.add_argument("--pgm-size", type=int, default=64)
+    parser.add_argument("--read-size", type=int, default=128)
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--mp-size", type=int, default=2, help="Planes per multi-plane request; 0 skips multi-plane sections.")
+    parser.add_argument("--impl", type=str, default="pool", help="Comma-separated sampling paths: pool, mask.")
+    parser.add_argument("--no-mem", action="store_true", help="Skip the tracemalloc peak-memory pass.")
+    parser.add_argument("--csv-out", type=str, default=None)
+    parser.add_argument("--json-out", type=str, default=None)
+    parser.add_argument("--compare", type=str, default=None, help="Baseline CSV/JSON from a previous run.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown vs. baseline (default: 0.10).")
+    return parser.parse_args(argv)
+
+
+# ------------------------------
+# Setup
+# ------------------------------
+def build(args: argparse.Namespace, blocks: int, pages: int, impl: str) -> AddressManager:
+    am = AddressManager(num_planes=args.planes, num_blocks=blocks, pagesize=pages, offset=args.offset, num_dies=args.dies)
+    am.pool_min_blocks = 0 if impl == "pool" else 1 << 62
+    rng = np.random.default_rng(args.seed)
+    erased = rng.choice(am.num_blocks, size=am.num_blocks // 2, replace=False)
+    am.set_adds_val(erased, ERASE, mode=TLC)
+    programmed = erased[: erased.size // 2]
+    am.addrstates[programmed] = rng.integers(args.offset, max(args.offset + 1, pages // 4), size=programmed.size)
+    am._modes_pgm[programmed] = am.celltype_code(TLC)
+    am.invalidate_pools()
+    am._rng = np.random.default_rng(args.seed)
+    return am
+
+
+def snapshot(am: AddressManager) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return am.addrstates.copy(), am._modes_erase.copy(), am._modes_pgm.copy()
+
+
+def restore(am: AddressManager, snap: Tuple[np.ndarray, np.ndarray, np.ndarray], seed: int) -> None:
+    am.addrstates[:], am._modes_erase[:], am._modes_pgm[:] = snap
+    am.invalidate_pools()
+    am._rng = np.random.default_rng(seed)
+
+
+def sections(args: argparse.Namespace, am: AddressManager) -> Dict[str, Tuple[Callable[[], Any], Callable[[], Any]]]:
+    """field -> (warm-up sample call, timed call); warm-ups build pools without mutating state."""
+    es, ps, rs = args.erase_size, args.pgm_size, args.read_size
+    seq_pgm, seq_read = max(1, min(ps, am.pagesize // 4)), max(1, min(rs, am.pagesize // 8))
+    out: Dict[str, Tuple[Callable[[], Any], Callable[[], Any]]] = {
+        "erase_ms": (lambda: am.sample_erase(sel_plane=0, size=es), lambda: am.random_erase(sel_plane=0, mode=TLC, size=es)),
+        "pgm_ms": (lambda: am.sample_pgm(size=ps), lambda: am.random_pgm(mode=TLC, size=ps)),
+        "read_ms": (lambda: am.sample_read(size=rs), lambda: am.random_read(mode=TLC, size=rs)),
+        "pgm_seq_ms": (lambda: None, lambda: am.random_pgm(sel_plane=0, mode=TLC, size=seq_pgm, sequential=True)),
+        "read_seq_ms": (lambda: None, lambda: am.random_read(sel_plane=0, mode=TLC, size=seq_read, sequential=True)),
+    }
+    if 1 < args.mp_size <= args.planes:
+        mp = list(range(args.mp_size))
+        out.update({
+            "mp_erase_ms": (lambda: None, lambda: am.random_erase(sel_plane=mp, mode=TLC, size=es)),
+            "mp_pgm_ms": (lambda: None, lambda: am.random_pgm(sel_plane=mp, mode=TLC, size=ps)),
+            "mp_pgm_seq_ms": (lambda: None, lambda: am.random_pgm(sel_plane=mp, mode=TLC, size=seq_pgm, sequential=True)),
+            "mp_read_ms": (lambda: None, lambda: am.random_read(sel_plane=mp, mode=TLC, size=rs)),
+            "mp_read_seq_ms": (lambda: None, lambda: am.random_read(sel_plane=mp, mode=TLC, size=seq_read, sequential=True)),
+        })
+    return out
+
+
+def epr_targets(am: AddressManager) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int, int]]]:
+    def _triplets(adds: np.ndarray) -> List[Tuple[int, int, int]]:
+        if len(adds) == 0:
+            return []
+        flat = np.asarray(adds).reshape(-1, 3)
+        return [(int(d), int(b) % am._blocks_per_die, int(p)) for d, b, p in flat.tolist()]
+
+    return _triplets(am.sample_pgm(mode=TLC, size=8)), _triplets(am.sample_read(mode=TLC, size=8))
+
+
+# ------------------------------
+# Measurement
+# ------------------------------
+def time_sections(args: argparse.Namespace, am: AddressManager, iters: int) -> Dict[str, float]:
+    snap = snapshot(am)
+    out: Dict[str, float] = {}
+    for field, (warm, call) in sections(args, am).items():
+        restore(am, snap, args.seed)
+        warm()
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            call()
+        out[field] = (time.perf_counter() - t0) / max(1, iters) * 1e3
+    restore(am, snap, args.seed)
+    pgm_t, read_t = epr_targets(am)
+    for field, base, targets in (("epr_pgm_ms", "PROGRAM_SLC", pgm_t), ("epr_read_ms", "READ", read_t)):
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            am.check_epr(base, targets, op_celltype=TLC)
+        out[field] = (time.perf_counter() - t0) / max(1, iters) * 1e3
+    restore(am, snap, args.seed)
+    return out
+
+
+def peak_memory_kib(args: argparse.Namespace, blocks: int, pages: int, impl: str) -> float:
+    """Peak traced allocation while building the manager and running every section briefly."""
+    tracemalloc.start()
+    try:
+        am = build(args, blocks, pages, impl)
+        time_sections(args, am, min(args.iters, 5))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for impl in [x.strip() for x in str(args.impl).split(",") if x.strip()]:
+        if impl not in ("pool", "mask"):
+            raise SystemExit(f"unknown --impl {impl!r} (expected pool, mask)")
+        for blocks in _int_list(args.blocks):
+            for pages in _int_list(args.pages):
+                am = build(args, blocks, pages, impl)
+                row: Dict[str, Any] = {
+                    "impl": impl, "planes": args.planes, "dies": args.dies, "blocks": blocks, "pages": pages,
+                    "iters": args.iters, "mp_size": args.mp_size,
+                }
+                row.update(time_sections(args, am, args.iters))
+                row["state_kib"] = (am.addrstates.nbytes + am._modes_erase.nbytes + am._modes_pgm.nbytes) / 1024.0
+                row["peak_kib"] = None if args.no_mem else peak_memory_kib(args, blocks, pages, impl)
+                rows.append(row)
+                print(_csv_line(row), flush=True)
+    return rows
+
+
+# ------------------------------
+# Output / baseline comparison
+# ------------------------------
+def _fmt(v: Any) -> str:
+    if v is None:
+        return ""
+    return f"{v:.4f}" if isinstance(v, float) else str(v)
+
+
+def _csv_line(row: Dict[str, Any]) -> str:
+    return ",".join(_fmt(row.get(f)) for f in FIELDS)
+
+
+def write_outputs(rows: List[Dict[str, Any]], csv_out: str | None, json_out: str | None) -> None:
+    if csv_out:
+        with open(csv_out, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=FIELDS)
+            w.writeheader()
+            for r in rows:
+                w.writerow({k: _fmt(r.get(k)) for k in FIELDS})
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+def load_baseline(path: str) -> List[Dict[str, Any]]:
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return list(json.load(f))
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _key(row: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(str(row.get(k)) for k in KEY_FIELDS if k != "iters")
+
+
+def compare(rows: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> int:
+    """Print per-metric ratios vs. baseline; return the number of regressions."""
+    base = {_key(r): r for r in baseline}
+    regressions = 0
+    print("impl,planes,dies,blocks,pages,mp_size,metric,base_ms,cur_ms,ratio,status")
+    for row in rows:
+        ref = base.get(_key(row))
+        if ref is None:
+            continue
+        for field in TIME_FIELDS:
+            try:
+                b, c = float(ref.get(field)), float(row.get(field))  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                continue
+            ratio = c / b if b > 0 else float("inf")
+            status = "ok"
+            if ratio > 1.0 + tolerance:
+                status = "REGRESSION"
+                regressions += 1
+            elif ratio < 1.0 - tolerance:
+                status = "faster"
+            print(",".join(list(_key(row)) + [field, f"{b:.4f}", f"{c:.4f}", f"{ratio:.3f}", status]))
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    print(",".join(FIELDS))
+    rows = run(args)
+    write_outputs(rows, args.csv_out, args.json_out)
+    if args.compare:
+        regressions = compare(rows, load_baseline(args.compare), args.tolerance)
+        if regressions:
+            print(f"{regressions} metric(s) slower than baseline by more than {args.tolerance:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: heap-backed EventQueue vs. the legacy sorted-list queue.
+
+The workload mimics Scheduler usage: every popped batch pushes a handful of
+future events (OP_START/OP_END plus per-state PHASE_HOOKs) and occasionally
+cancels a pending OP_END, as SUSPEND does via ``Scheduler._cancel_op_end``.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from event_queue import EventQueue, _PRIO  # noqa: E402
+
+
+class ListEventQueue:
+    """Legacy implementation: append + full sort per push, linear remove."""
+
+    def __init__(self) -> None:
+        self._q: List[Tuple[float, int, int, str, Dict[str, Any]]] = []
+        self._seq: int = 0
+
+    def is_empty(self) -> bool:
+        return not self._q
+
+    def push(self, when: float, kind: str, payload: Dict[str, Any]) -> int:
+        pri = _PRIO.get(kind, 3)
+        self._seq += 1
+        seq = int(self._seq)
+        payload_copy = dict(payload or {})
+        payload_copy.setdefault("event_seq", seq)
+        self._q.append((float(when), int(pri), seq, str(kind), payload_copy))
+        self._q.sort(key=lambda x: (x[0], x[1], x[2]))
+        return seq
+
+    def pop_time_batch(self):
+        if not self._q:
+            return (0.0, [])
+        t0 = self._q[0][0]
+        batch = []
+        i = 0
+        while i < len(self._q) and self._q[i][0] == t0:
+            batch.append(self._q[i])
+            i += 1
+        del self._q[:i]
+        return (t0, batch)
+
+    def remove(self, seq_id: int, *, kind: Optional[str] = None) -> bool:
+        for idx, (_, _, seq, entry_kind, _) in enumerate(self._q):
+            if seq == seq_id and (kind is None or entry_kind == kind):
+                del self._q[idx]
+                return True
+        return False
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--events",
+        type=str,
+        default="5000,20000",
+        help="Comma-separated total event counts to push per run.",
+    )
+    parser.add_argument(
+        "--hooks-per-op",
+        type=int,
+        default=8,
+        help="PHASE_HOOK events pushed per simulated op (default: 8).",
+    )
+    parser.add_argument(
+        "--cancel-ratio",
+        type=float,
+        default=0.05,
+        help="Fraction of ops whose OP_END is cancelled (default: 0.05).",
+    )
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument(
+        "--skip-list",
+        action="store_true",
+        help="Only time the heap queue (the list queue is O(n^2 log n)).",
+    )
+    return parser.parse_args(argv)
+
+
+def run_workload(queue: Any, total_events: int, hooks_per_op: int, cancel_ratio: float, seed: int) -> Tuple[float, int]:
+    rng = random.Random(seed)
+    pushed = 0
+    popped = 0
+    now = 0.0
+    pending_end: List[int] = []
+    t0 = time.perf_counter()
+    queue.push(0.0, "QUEUE_REFILL", {})
+    pushed += 1
+    while not queue.is_empty():
+        now, batch = queue.pop_time_batch()
+        popped += len(batch)
+        if pushed >= total_events:
+            continue
+        for _ in batch:
+            if pushed >= total_events:
+                break
+            start = now + round(rng.uniform(0.0, 50.0), 2)
+            end = start + round(rng.uniform(1.0, 500.0), 2)
+            queue.push(start, "OP_START", {"op_uid": pushed})
+            pending_end.append(queue.push(end, "OP_END", {"op_uid": pushed}))
+            pushed += 2
+            for h in range(hooks_per_op):
+                queue.push(start + (end - start) * (h + 1) / (hooks_per_op + 1), "PHASE_HOOK", {"hook": {"die": 0, "plane": h % 4}})
+                pushed += 1
+            if pending_end and rng.random() < cancel_ratio:
+                queue.remove(pending_end.pop(rng.randrange(len(pending_end))), kind="OP_END")
+    elapsed = time.perf_counter() - t0
+    return elapsed, popped
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    sizes = [int(x) for x in str(args.events).split(",") if x.strip()]
+    print("events,impl,seconds,popped,us_per_event")
+    for n in sizes:
+        impls = [("heap", EventQueue)]
+        if not args.skip_list:
+            impls.append(("list", ListEventQueue))
+        for name, cls in impls:
+            elapsed, popped = run_workload(cls(), n, args.hooks_per_op, args.cancel_ratio, args.seed)
+            per = (elapsed / max(1, popped)) * 1e6
+            print(f"{n},{name},{elapsed:.4f},{popped},{per:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
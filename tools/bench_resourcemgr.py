@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: ResourceManager.feasible_at latency vs. committed op count.
+
+Committed plane/bus/exclusion windows are loaded straight into the manager's
+interval indexes (bypassing reserve/commit so 1M-op timelines build in
+seconds), then ``feasible_at`` is timed for a fixed set of probe ops. With the
+sorted interval index the per-call latency should stay flat as the timeline
+grows; ``--legacy`` additionally times the former linear window scans over
+the same windows for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from proposer import _OpStub, _StateSeg  # noqa: E402
+from resourcemgr import Address, ExclWindow, ResourceManager, Scope  # noqa: E402
+
+
+PROBE_OP = _OpStub(
+    name="Bench_Read",
+    base="READ",
+    states=(_StateSeg("ISSUE", 0.4, True), _StateSeg("CORE_BUSY", 30.0, False), _StateSeg("DATAOUT", 2.0, True)),
+)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--ops",
+        type=str,
+        default="10000,100000,1000000",
+        help="Comma-separated committed op counts to benchmark.",
+    )
+    parser.add_argument("--dies", type=int, default=2)
+    parser.add_argument("--planes", type=int, default=4)
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=2000,
+        help="feasible_at calls timed per size (default: 2000).",
+    )
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the former linear scans over the same windows.",
+    )
+    return parser.parse_args(argv)
+
+
+def populate(rm: ResourceManager, n_ops: int, rng: random.Random) -> float:
+    """Append *n_ops* back-to-back single-plane ops; return the timeline end."""
+    cursor = {key: 0.0 for key in rm._plane_resv}
+    bus_t = 0.0
+    keys = sorted(cursor)
+    for _ in range(n_ops):
+        die, plane = keys[rng.randrange(len(keys))]
+        start = round(max(cursor[(die, plane)], bus_t), 2)
+        dur = round(rng.uniform(5.0, 60.0), 2)
+        end = round(start + dur, 2)
+        rm._plane_resv[(die, plane)].append((start, end))
+        rm._bus_resv.append((start, round(start + 0.4, 2)))
+        rm._excl_die_index(die).append(ExclWindow(start, end, "DIE", die, {rm._EXCL_TOKEN_SINGLE}))
+        cursor[(die, plane)] = end
+        bus_t = round(start + 0.4, 2)
+        rm._avail[(die, plane)] = end
+    return max(cursor.values()) if cursor else 0.0
+
+
+def time_feasible(rm: ResourceManager, horizon: float, queries: int, rng: random.Random) -> float:
+    probes: List[Tuple[Address, float]] = []
+    for _ in range(queries):
+        addr = Address(die=rng.randrange(rm.dies), plane=rng.randrange(rm.planes), block=0, page=0)
+        probes.append((addr, rng.uniform(0.0, horizon)))
+    t0 = time.perf_counter()
+    for addr, hint in probes:
+        rm.feasible_at(PROBE_OP, [addr], hint, Scope.PLANE_SET)
+    return time.perf_counter() - t0
+
+
+def time_legacy_scan(rm: ResourceManager, horizon: float, queries: int, rng: random.Random) -> float:
+    plane_lists = {k: list(v) for k, v in rm._plane_resv.items()}
+    bus_list = list(rm._bus_resv)
+    excl_lists = {d: list(v) for d, v in rm._excl_die.items()}
+    probes: List[Tuple[int, int, float]] = []
+    for _ in range(queries):
+        probes.append((rng.randrange(rm.dies), rng.randrange(rm.planes), rng.uniform(0.0, horizon)))
+    t0 = time.perf_counter()
+    hits: Any = 0
+    for die, plane, start in probes:
+        end = start + 32.4
+        hits += any(not (end <= s or e <= start) for (s, e) in plane_lists[(die, plane)])
+        hits += any(not (start + 0.4 <= s or e <= start) for (s, e) in bus_list)
+        hits += any(not (end <= w.start or w.end <= start) for w in excl_lists.get(die, []))
+    return time.perf_counter() - t0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    sizes = [int(x) for x in str(args.ops).split(",") if x.strip()]
+    print("ops,impl,build_s,queries,us_per_query")
+    for n in sizes:
+        rng = random.Random(args.seed)
+        rm = ResourceManager(cfg={}, dies=args.dies, planes=args.planes)
+        b0 = time.perf_counter()
+        horizon = populate(rm, n, rng)
+        build = time.perf_counter() - b0
+        elapsed = time_feasible(rm, horizon, args.queries, random.Random(args.seed + 1))
+        print(f"{n},indexed,{build:.2f},{args.queries},{elapsed / max(1, args.queries) * 1e6:.3f}")
+        if args.legacy:
+            elapsed = time_legacy_scan(rm, horizon, args.queries, random.Random(args.seed + 1))
+            print(f"{n},linear,{build:.2f},{args.queries},{elapsed / max(1, args.queries) * 1e6:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -21,6 +21,8 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+import tableio
+
 
 # -----------------------------
 # Utils
@@ -37,9 +39,11 @@ def _ensure_dir(path: str) -> None:
 
 
 def _glob_latest(out_dir: str, prefix: str) -> Optional[str]:
-    """Find latest CSV matching prefix_*.csv by lexicographic order of filename."""
-    pat = os.path.join(out_dir, f"{prefix}_*.csv")
-    files = sorted(glob.glob(pat))
+    """Find latest prefix_*.{csv,parquet,npz} by lexicographic order of filename stem."""
+    files: List[str] = []
+    for fmt in tableio.EXPORT_FORMATS:
+        files.extend(glob.glob(os.path.join(out_dir, f"{prefix}_*{tableio.table_suffix(fmt)}")))
+    files.sort(key=lambda p: (os.path.splitext(os.path.basename(p))[0], p))
     return files[-1] if files else None
 
 
@@ -57,7 +61,7 @@ def plot_operation_gantt(csv_path: str, *, save_path: Optional[str] = None, max_
     """Gantt-like chart of operation timeline.
     CSV fields: start,end,die,plane,block,page,op_name,op_base,source,op_uid,op_state
     """
-    df = pd.read_csv(csv_path)
+    df = tableio.read_table(csv_path)
     if df.empty:
         print("[operation_gantt] empty CSV"); return
     d = df.copy()
@@ -112,7 +116,7 @@ def plot_op_state_gantt(csv_path: str, *, save_path: Optional[str] = None, max_l
     """Gantt-like chart of op_state per (die,plane) lane.
     CSV fields: start,end,die,plane,op_state,lane,op_name,duration
     """
-    df = pd.read_csv(csv_path)
+    df = tableio.read_table(csv_path)
     if df.empty:
         print("[op_state_gantt] empty CSV"); return
     d = df.copy()
@@ -169,7 +173,7 @@ def plot_address_touch_heatmap(csv_path: str, *, save_path: Optional[str] = None
     CSV fields: op_base,cell_type,die,block,page,count
     kinds: filter op_base (e.g., ["PROGRAM","READ"]) if provided
     """
-    df = pd.read_csv(csv_path)
+    df = tableio.read_table(csv_path)
     if df.empty:
         print("[address_heatmap] empty CSV"); return
     d = df.copy()
@@ -206,7 +210,7 @@ def plot_state_name_input_time_hist(csv_path: str, *, save_path: Optional[str] =
     CSV fields: op_state,op_name,input_time,count
     Draw top-k states by total count; within each, top-k ops by total.
     """
-    df = pd.read_csv(csv_path)
+    df = tableio.read_table(csv_path)
     if df.empty:
         print("[state_input_hist] empty CSV"); return
     d = df.copy()